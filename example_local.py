@@ -26,6 +26,23 @@ DATABASES = {
     }
 }
 
+# Shared cache for all workers.  Leave this out to use a per-process memory cache, which is fine for development.
+# CACHES = {
+#     'default': {
+#         'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+#         'LOCATION': '127.0.0.1:11211',
+#     }
+# }
+
+# Requests slower than this many seconds are logged as warnings with the SQL they ran most.
+# SLOW_REQUEST_THRESHOLD = 1.0
+
+# Level every request's timings are logged at.  The default of INFO only shows them in debug mode.
+# REQUEST_LOG_LEVEL = 'INFO'
+
+# Directory that archived past events are written to.  Defaults to an "archives" directory next to manage.py.
+# MARATHON_ARCHIVE_DIR = os.path.join(BASE_DIR, 'archives')
+
 TIME_ZONE = 'America/Toronto'
 
 # set this to your site's prefix, This allows handling multiple deployments from a common url base
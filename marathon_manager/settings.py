@@ -52,6 +52,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First so its timings cover all the other middleware too.
+    'submissions.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -78,6 +80,8 @@ SOCIAL_AUTH_PIPELINE = (
     'social_core.pipeline.user.user_details',
     # Run our custom pipeline function to check if Twitch users logging in are superusers or event admin staff.
     'submissions.pipeline.check_twitch_user_permissions',
+    # Keep a snapshot of the Twitch extra data so it doesn't need to be looked up on every page load.
+    'submissions.pipeline.cache_twitch_data',
 )
 
 ROOT_URLCONF = 'marathon_manager.urls'
@@ -107,6 +111,20 @@ WSGI_APPLICATION = 'marathon_manager.wsgi.application'
 DATABASES = local.DATABASES
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.0/topics/cache/
+# Defaults to a per-process memory cache.  Use a shared cache such as Memcached or Redis in production so that cache
+# invalidation from one worker is seen by all of them.
+
+CACHES = getattr(local, 'CACHES', {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        # Room for a cached fragment per submission row on top of everything else.
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+})
+
+
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 
@@ -155,12 +173,24 @@ LOGGING = {
         'django': {
             'handlers': ['console_debug', 'console_production'],
         },
+        # Slow requests are logged at warning level so they show in production.  Every request's timings are logged at
+        # REQUEST_LOG_LEVEL, so only show in debug mode unless that's raised to warning.
         'submissions': {
             'handlers': ['console_debug', 'console_production'],
+            'level': 'INFO',
         },
     },
 }
 
+# Requests taking longer than this many seconds are logged as slow, along with the SQL they ran most.
+SLOW_REQUEST_THRESHOLD = getattr(local, 'SLOW_REQUEST_THRESHOLD', 1.0)
+
+# Level every request's timings are logged at, e.g. 'DEBUG' to hide them even in debug mode.
+REQUEST_LOG_LEVEL = getattr(local, 'REQUEST_LOG_LEVEL', 'INFO')
+
+# Directory that past events' submissions and availability are moved to by the archive_events command.
+MARATHON_ARCHIVE_DIR = getattr(local, 'MARATHON_ARCHIVE_DIR', os.path.join(BASE_DIR, 'archives'))
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/2.2/topics/i18n/
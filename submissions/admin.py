@@ -1,10 +1,25 @@
 # Admin site models.
 
 from django.contrib import admin
+from django.utils.translation import gettext as _
 
 from submissions import models
 
 
+class SubmissionStatusFilter(admin.SimpleListFilter):
+    """Filter submissions by their rolled up status from SubmissionQuerySet.with_status()."""
+    title = _('Status')
+    parameter_name = 'status'
+
+    def lookups(self, request, model_admin):
+        return models.SubmissionCategory.Statuses.choices
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(rolled_up_status=self.value())
+        return queryset
+
+
 @admin.register(models.Event)
 class EventAdmin(admin.ModelAdmin):
     date_hierarchy = 'start_date'
@@ -19,11 +34,77 @@ class AvailabilityAdmin(admin.ModelAdmin):
     list_display = ['__str__', 'event', 'user']
     list_filter = ['event']
 
+    # Keep availability hour bitmaps in sync when rows are edited here directly.
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        models.AvailabilityHours.rebuild_user_hours(obj.user, obj.event)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        models.AvailabilityHours.rebuild_user_hours(obj.user, obj.event)
+
+    def delete_queryset(self, request, queryset):
+        affected = {(a.user, a.event) for a in queryset.select_related('user', 'event')}
+        super().delete_queryset(request, queryset)
+        for user, event in affected:
+            models.AvailabilityHours.rebuild_user_hours(user, event)
+
 
 @admin.register(models.Submission)
 class SubmissionAdmin(admin.ModelAdmin):
     list_display = ['game', 'event', 'user', 'status']
-    list_filter = ['event', ]
+    list_filter = ['event', SubmissionStatusFilter]
+    list_select_related = ['event', 'user']
+
+    def get_queryset(self, request):
+        """Compute status in the query so the changelist doesn't load categories for every row."""
+        return super().get_queryset(request).with_status()
+
+    def status(self, obj):
+        return models.SubmissionCategory.Statuses(obj.status).label
+    status.admin_order_field = 'status_rank'
+    status.short_description = _('Status')
+
+
+@admin.register(models.AvailabilityHours)
+class AvailabilityHoursAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'event', 'user']
+    list_filter = ['event']
+    readonly_fields = ['user', 'event', 'start_time', 'hours', 'bitmap_data']
+
+
+@admin.register(models.EventStats)
+class EventStatsAdmin(admin.ModelAdmin):
+    list_display = ['event', 'submissions', 'runners', 'pending_categories', 'accepted_categories', 'accepted_estimate',
+                    'available_runners']
+    readonly_fields = ['event', 'submissions', 'runners', 'pending_categories', 'declined_categories',
+                       'accepted_categories', 'accepted_seconds', 'available_runners']
+
+
+@admin.register(models.EventArchive)
+class EventArchiveAdmin(admin.ModelAdmin):
+    list_display = ['event', 'path', 'size', 'availabilities', 'archived_at']
+    readonly_fields = ['event', 'path', 'size', 'availabilities', 'archived_at']
+
+    # Archives are only made and removed by the archive_events and restore_event commands, which move the data too.
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(models.RunnerSummary)
+class RunnerSummaryAdmin(admin.ModelAdmin):
+    list_display = ['user', 'event', 'longest_estimate', 'longest_availability']
+    list_filter = ['event']
+    readonly_fields = ['user', 'event', 'longest_estimate', 'longest_availability']
+
+
+@admin.register(models.Game)
+class GameAdmin(admin.ModelAdmin):
+    list_display = ['name', 'abbreviation', 'platform', 'release_year']
+    search_fields = ['name', 'abbreviation']
 
 
 # Remaining models that don't need a custom admin handler.
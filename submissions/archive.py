@@ -0,0 +1,357 @@
+"""Moving past events' submissions and availability out of the database into compressed JSON lines files, and back.
+
+Each archive file has one JSON object per line, with a "type" of "event" for the first line, then "submission" (with
+its categories), "availability" and "hours" lines.  Durations are stored in seconds.  Archived events keep their Event
+and EventStats rows, so only the rows that grow with every runner are moved out.
+"""
+
+import contextlib
+import datetime
+import gzip
+import itertools
+import json
+import logging
+import os
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, router, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from submissions import models
+from submissions.game_names import game_key
+
+logger = logging.getLogger(__name__)
+
+# Version of the archive file layout, in case it ever needs to change.
+ARCHIVE_VERSION = 1
+
+# Fields stored for each kind of row.  Foreign keys are stored as IDs, along with the runner's username so archives
+# still make sense if the user is deleted later.
+SUBMISSION_FIELDS = ['id', 'user', 'game', 'platform', 'release_year', 'twitch_game', 'description', 'created_at',
+                     'updated_at']
+CATEGORY_FIELDS = ['id', 'game', 'status', 'category', 'race', 'estimate', 'video', 'created_at', 'updated_at']
+AVAILABILITY_FIELDS = ['id', 'user', 'start_time', 'duration', 'created_at', 'updated_at']
+HOURS_FIELDS = ['id', 'user', 'start_time', 'hours', 'bitmap_data']
+
+DATETIME_FIELDS = {'start_date', 'end_date', 'start_time', 'created_at', 'updated_at'}
+DURATION_FIELDS = {'estimate', 'duration'}
+
+# Rows read from the database at a time while writing an archive, and inserted at a time while restoring one.
+CHUNK_SIZE = 500
+
+
+class ArchiveError(Exception):
+    """An event can't be archived or restored."""
+
+
+class ArchiveEncoder(DjangoJSONEncoder):
+    """JSON encoder storing durations as seconds and binary data as hex, which are shorter than the defaults, and
+    times to the microsecond so restored rows match the originals exactly.
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        if isinstance(o, datetime.timedelta):
+            return int(o.total_seconds())
+        if isinstance(o, (bytes, memoryview)):
+            return bytes(o).hex()
+        return super().default(o)
+
+
+def archive_path(event):
+    """
+    Args:
+        event (submissions.models.Event): Event to archive.
+
+    Returns:
+        str: Path of the event's archive file.
+
+    """
+    return os.path.join(settings.MARATHON_ARCHIVE_DIR, 'event-{}.jsonl.gz'.format(event.pk))
+
+
+def archivable_events():
+    """
+    Returns:
+        django.db.models.QuerySet: Closed events that have ended and aren't archived yet, other than the current event.
+
+    """
+    events = models.Event.objects.filter(stage=models.Event.Stages.CLOSED, end_date__lt=timezone.now(),
+                                         archive__isnull=True)
+    current_event = models.Event.get_current_event()
+    if current_event:
+        events = events.exclude(pk=current_event.pk)
+    return events
+
+
+def decode(record):
+    """Turn the dates and durations in an archive record back into Python values.
+
+    Args:
+        record (dict): Record read from an archive line.
+
+    Returns:
+        dict: The same record, changed in place.
+
+    """
+    for field, value in record.items():
+        if value is None:
+            continue
+        if field in DATETIME_FIELDS:
+            record[field] = parse_datetime(value)
+        elif field in DURATION_FIELDS:
+            record[field] = datetime.timedelta(seconds=value)
+    for category in record.get('categories', []):
+        decode(category)
+    return record
+
+
+def read_archive(path):
+    """Read the records in an archive file one at a time.
+
+    Args:
+        path (str): Path of the archive file.
+
+    Yields:
+        dict: Each record in the file, with dates and durations decoded.
+
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            yield decode(json.loads(line))
+
+
+def read_submissions(path, offset, limit):
+    """Read a slice of the submissions in an archive file, without holding the rest in memory.
+
+    Args:
+        path (str): Path of the archive file.
+        offset (int): Number of submissions to skip.
+        limit (int): Maximum number of submissions to read.
+
+    Returns:
+        list[dict]: Submission records in the order they were archived.
+
+    """
+    with contextlib.closing(read_archive(path)) as records:
+        submissions = (record for record in records if record['type'] == 'submission')
+        return list(itertools.islice(submissions, offset, offset + limit))
+
+
+def quote_table(model):
+    """
+    Args:
+        model (type): Model to get the table of.
+
+    Returns:
+        str: Quoted table name of the model, for the database the model is written to.
+
+    """
+    return connections[router.db_for_write(model)].ops.quote_name(model._meta.db_table)
+
+
+def quote_column(model, field_name):
+    """
+    Args:
+        model (type): Model the field belongs to.
+        field_name (str): Name of the field.
+
+    Returns:
+        str: Quoted column name of the field, for the database the model is written to.
+
+    """
+    return connections[router.db_for_write(model)].ops.quote_name(model._meta.get_field(field_name).column)
+
+
+def delete_rows(model, where, params):
+    """Delete rows from a model's table in a single DELETE statement, without loading them or sending signals.
+
+    Args:
+        model (type): Model to delete rows of.
+        where (str): SQL condition for the rows, with %s placeholders.
+        params (list): Parameters for the condition.
+
+    Returns:
+        int: Number of rows deleted.
+
+    """
+    with connections[router.db_for_write(model)].cursor() as cursor:
+        cursor.execute('DELETE FROM {} WHERE {}'.format(quote_table(model), where), params)
+        return cursor.rowcount
+
+
+def iterate_records(event):
+    """Read an event's rows from the database in chunks, as archive records.
+
+    Args:
+        event (submissions.models.Event): Event to read.
+
+    Yields:
+        dict: Each record for the event, starting with the event itself.
+
+    """
+    yield {
+        'type': 'event', 'version': ARCHIVE_VERSION, 'id': event.pk, 'name': event.name,
+        'start_date': event.start_date, 'end_date': event.end_date,
+    }
+
+    # Submissions and categories are both read in submission order and merged, rather than prefetching categories,
+    # so only one chunk of each is in memory at a time.
+    submissions = models.Submission.objects.filter(event=event).order_by('id').values(
+        *SUBMISSION_FIELDS, 'user__username').iterator(chunk_size=CHUNK_SIZE)
+    categories = models.SubmissionCategory.objects.filter(game__event=event).order_by('game', 'id').values(
+        *CATEGORY_FIELDS).iterator(chunk_size=CHUNK_SIZE)
+    category = next(categories, None)
+    for submission in submissions:
+        submission['username'] = submission.pop('user__username')
+        submission['categories'] = []
+        while category is not None and category['game'] == submission['id']:
+            del category['game']
+            submission['categories'].append(category)
+            category = next(categories, None)
+        yield dict(submission, type='submission')
+
+    for availability in models.Availability.objects.filter(event=event).order_by('id').values(
+            *AVAILABILITY_FIELDS, 'user__username').iterator(chunk_size=CHUNK_SIZE):
+        availability['username'] = availability.pop('user__username')
+        yield dict(availability, type='availability')
+
+    for hours in models.AvailabilityHours.objects.filter(event=event).order_by('id').values(
+            *HOURS_FIELDS).iterator(chunk_size=CHUNK_SIZE):
+        yield dict(hours, type='hours')
+
+
+def archive_event(event):
+    """Write an event's submissions, categories and availability to its archive file, then delete them from the
+    database.  The file is written completely before anything is deleted, so a failure part way leaves the event as it
+    was.
+
+    Args:
+        event (submissions.models.Event): Closed event to archive.
+
+    Returns:
+        submissions.models.EventArchive: Record of the archive.
+
+    Raises:
+        ArchiveError: If the event isn't closed and over, is the current event, or is already archived.
+
+    """
+    if not archivable_events().filter(pk=event.pk).exists():
+        raise ArchiveError('{} is not a closed past event, or is already archived'.format(event))
+
+    path = archive_path(event)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    availabilities = 0
+    with gzip.open(path + '.tmp', 'wt', encoding='utf-8') as f:
+        for record in iterate_records(event):
+            availabilities += record['type'] == 'availability'
+            f.write(json.dumps(record, cls=ArchiveEncoder, separators=(',', ':')) + '\n')
+    os.replace(path + '.tmp', path)
+
+    with transaction.atomic(using=router.db_for_write(models.Submission)):
+        # Make sure the totals are complete before the rows they're counted from are gone.  They stay as they are
+        # from now on, since deleting the raw rows below skips the signals that would adjust them.
+        models.EventStats.rebuild(event.pk)
+
+        # Deleted directly in a single query each, since there can be many thousands of rows and cascading deletes
+        # would load every row and send signals for each of them.
+        delete_rows(models.SubmissionCategory, '{} IN (SELECT {} FROM {} WHERE {} = %s)'.format(
+            quote_column(models.SubmissionCategory, 'game'), quote_column(models.Submission, 'id'),
+            quote_table(models.Submission), quote_column(models.Submission, 'event')), [event.pk])
+        for model in [models.Submission, models.Availability, models.AvailabilityHours, models.RunnerSummary]:
+            delete_rows(model, '{} = %s'.format(quote_column(model, 'event')), [event.pk])
+
+        archive = models.EventArchive.objects.create(event=event, path=path, size=os.path.getsize(path),
+                                                     availabilities=availabilities)
+        models.Event.mark_changed(pk=event.pk)
+
+    logger.info('Archived event {!r} to {}'.format(event.name, path))
+    return archive
+
+
+def restore_event(archive, skip_missing_users=False):
+    """Put an archived event's submissions, categories and availability back in the database, with their original IDs
+    and times, and remove the archive.
+
+    Records for runners whose users have since been deleted can't be restored.  By default nothing is restored if there
+    are any, and the archive is left as it is.  If they're skipped, the rest is restored and the archive record removed,
+    but the archive file is kept so the skipped records aren't lost.
+
+    Args:
+        archive (submissions.models.EventArchive): Archive to restore.
+        skip_missing_users (bool): Restore everything else when some records are for deleted users.
+
+    Returns:
+        dict: Number of submissions, categories and availabilities restored, and the number of records skipped.
+
+    Raises:
+        ArchiveError: If the archive file is missing or for a different event, or has records for deleted users and
+            they aren't being skipped.
+
+    """
+    event = archive.event
+    if not os.path.exists(archive.path):
+        raise ArchiveError('Archive file {} for {} does not exist'.format(archive.path, event))
+
+    user_ids = set(get_user_model().objects.values_list('pk', flat=True))
+    rows = {model: [] for model in [models.Submission, models.SubmissionCategory, models.Availability,
+                                    models.AvailabilityHours]}
+    skipped = 0
+
+    for record in read_archive(archive.path):
+        record_type = record.pop('type')
+        if record_type == 'event':
+            if record['id'] != event.pk or record['version'] != ARCHIVE_VERSION:
+                raise ArchiveError('{} is not a version {} archive of {}'.format(archive.path, ARCHIVE_VERSION,
+                                                                                 event))
+            continue
+        if record['user'] not in user_ids:
+            skipped += 1
+            continue
+
+        record['user_id'] = record.pop('user')
+        record.pop('username', None)
+        if record_type == 'submission':
+            for category in record.pop('categories'):
+                rows[models.SubmissionCategory].append(models.SubmissionCategory(game_id=record['id'], **category))
+            rows[models.Submission].append(models.Submission(event=event, game_key=game_key(record['game']),
+                                                             **record))
+        elif record_type == 'availability':
+            rows[models.Availability].append(models.Availability(event=event, **record))
+        elif record_type == 'hours':
+            record['bitmap_data'] = bytes.fromhex(record['bitmap_data'])
+            rows[models.AvailabilityHours].append(models.AvailabilityHours(event=event, **record))
+
+    if skipped and not skip_missing_users:
+        raise ArchiveError('{} has {} records for users that no longer exist'.format(archive.path, skipped))
+
+    with transaction.atomic(using=router.db_for_write(models.Submission)):
+        for model, objects in rows.items():
+            # Inserting sets the created and updated times to now, so put the archived ones back afterwards.
+            times = [(obj.created_at, obj.updated_at) for obj in objects] if hasattr(model, 'created_at') else None
+            model.objects.bulk_create(objects, batch_size=CHUNK_SIZE)
+            if times:
+                for obj, (created_at, updated_at) in zip(objects, times):
+                    obj.created_at, obj.updated_at = created_at, updated_at
+                model.objects.bulk_update(objects, ['created_at', 'updated_at'], batch_size=CHUNK_SIZE)
+
+        models.EventStats.rebuild(event.pk)
+        archive.delete()
+        models.Event.mark_changed(pk=event.pk)
+
+    if skipped:
+        logger.warning('Restored event {!r} from {} without {} records for deleted users, keeping the file'.format(
+            event.name, archive.path, skipped))
+    else:
+        os.remove(archive.path)
+        logger.info('Restored event {!r} from {}'.format(event.name, archive.path))
+    return {
+        'submissions': len(rows[models.Submission]),
+        'categories': len(rows[models.SubmissionCategory]),
+        'availabilities': len(rows[models.Availability]),
+        'skipped': skipped,
+    }
@@ -0,0 +1,244 @@
+"""Compact hour bitmap representation of runner availability for an event."""
+
+import datetime
+import functools
+from collections import namedtuple
+
+from django.utils.timezone import get_current_timezone
+
+ONE_HOUR = datetime.timedelta(hours=1)
+
+# One hour of an event's availability grid: hour number, start time, form field name, checkbox label and the date the
+# hour is grouped under.
+HourSlot = namedtuple('HourSlot', ['index', 'start_time', 'field_name', 'label', 'day'])
+
+
+def event_start_hour(event):
+    """Get the start of the first hour of an event in the current timezone, used as hour 0 for availability.
+
+    Args:
+        event (submissions.models.Event): Event to get the first hour for.
+
+    Returns:
+        datetime.datetime: Start of the first hour of the event.
+
+    """
+    return event.start_date.astimezone(get_current_timezone()).replace(minute=0, second=0, microsecond=0)
+
+
+def event_hour_count(event):
+    """Get the number of hour slots runners can be available for during an event.
+
+    Args:
+        event (submissions.models.Event): Event to count hours for.
+
+    Returns:
+        int: Number of hours from the first hour of the event until it ends, including a partial last hour.
+
+    """
+    seconds = (event.end_date - event_start_hour(event)).total_seconds()
+    return max(0, -int(-seconds // ONE_HOUR.total_seconds()))
+
+
+def event_hour_grid(event):
+    """Get the availability grid of hour slots for an event.  The grid only depends on the event dates and timezone,
+    so it's built once per process and reused until the event dates change.
+
+    Args:
+        event (submissions.models.Event): Event to get hour slots for.
+
+    Returns:
+        tuple[HourSlot]: Hour slots for the event, in order.
+
+    """
+    return _build_hour_grid(event.start_date, event.end_date, get_current_timezone())
+
+
+@functools.lru_cache(maxsize=16)
+def _build_hour_grid(start_date, end_date, tz):
+    slots = []
+    hour = start_date.astimezone(tz).replace(minute=0, second=0, microsecond=0)
+    while hour < end_date:
+        slots.append(HourSlot(len(slots), hour, 'available_{}'.format(hour.strftime('%Y_%m_%d_%H')),
+                              hour.strftime('%I:00 %p'), hour.date()))
+        hour += ONE_HOUR
+    return tuple(slots)
+
+
+class HourBitmap:
+    """Availability as a set of hours stored in an int, where bit N is set if the runner is available for the Nth hour
+    after the start time.  A whole week fits in 168 bits, and queries are a handful of int bit operations.
+    """
+
+    def __init__(self, start_time, hours, bits=0):
+        """
+        Args:
+            start_time (datetime.datetime): Start of hour 0.
+            hours (int): Total number of hours covered by the bitmap.
+            bits (int): Bits for the available hours.
+
+        """
+        self.start_time = start_time
+        self.hours = hours
+        self.bits = bits & ((1 << hours) - 1)
+
+    @classmethod
+    def for_event(cls, event, bits=0):
+        """Create a bitmap covering the hours of an event.
+
+        Args:
+            event (submissions.models.Event): Event the bitmap is for.
+            bits (int): Bits for the available hours.
+
+        Returns:
+            HourBitmap: Bitmap for the event.
+
+        """
+        return cls(event_start_hour(event), event_hour_count(event), bits)
+
+    @classmethod
+    def from_intervals(cls, start_time, hours, intervals):
+        """Create a bitmap from availability intervals.  Partial hours are counted as available.
+
+        Args:
+            start_time (datetime.datetime): Start of hour 0.
+            hours (int): Total number of hours covered by the bitmap.
+            intervals (iterable[tuple[datetime.datetime|datetime.timedelta]]): Tuples (start time, duration).
+
+        Returns:
+            HourBitmap: Bitmap with the hours for the intervals set.
+
+        """
+        bits = 0
+        for interval_start, duration in intervals:
+            first = max(0, int((interval_start - start_time) // ONE_HOUR))
+            last = min(hours, -int(-(interval_start + duration - start_time) // ONE_HOUR))
+            if last > first:
+                bits |= ((1 << (last - first)) - 1) << first
+        return cls(start_time, hours, bits)
+
+    @classmethod
+    def from_bytes(cls, start_time, hours, data):
+        """Create a bitmap from its stored bytes.
+
+        Args:
+            start_time (datetime.datetime): Start of hour 0.
+            hours (int): Total number of hours covered by the bitmap.
+            data (bytes): Little-endian bytes from to_bytes().
+
+        Returns:
+            HourBitmap: Bitmap for the stored bytes.
+
+        """
+        return cls(start_time, hours, int.from_bytes(bytes(data), 'little'))
+
+    def to_bytes(self):
+        """
+        Returns:
+            bytes: Little-endian bytes for the bitmap, one bit per hour.
+
+        """
+        return self.bits.to_bytes((self.hours + 7) // 8, 'little')
+
+    def blocks(self):
+        """Get contiguous runs of available hours.
+
+        Returns:
+            list[tuple[int]]: List of tuples (first hour, number of hours).
+
+        """
+        blocks = []
+        bits = self.bits
+        offset = 0
+        while bits:
+            # Skip to the lowest set bit, then count how many set bits follow it.
+            skip = (bits & -bits).bit_length() - 1
+            bits >>= skip
+            length = (bits ^ (bits + 1)).bit_length() - 1
+            blocks.append((offset + skip, length))
+            bits >>= length
+            offset += skip + length
+        return blocks
+
+    def to_intervals(self):
+        """
+        Returns:
+            list[tuple[datetime.datetime|datetime.timedelta]]: List of tuples (start time, availability duration).
+
+        """
+        return [(self.start_time + first * ONE_HOUR, length * ONE_HOUR) for first, length in self.blocks()]
+
+    def hour_start(self, hour):
+        """
+        Args:
+            hour (int): Hour number in the bitmap.
+
+        Returns:
+            datetime.datetime: Start time of the hour.
+
+        """
+        return self.start_time + hour * ONE_HOUR
+
+    def available_hours(self):
+        """
+        Returns:
+            list[int]: Hour numbers that are available, in order.
+
+        """
+        return [first + i for first, length in self.blocks() for i in range(length)]
+
+    def is_available(self, hour):
+        """
+        Args:
+            hour (int): Hour number in the bitmap.
+
+        Returns:
+            bool: True if the hour is available.
+
+        """
+        return 0 <= hour < self.hours and bool(self.bits >> hour & 1)
+
+    def is_available_for(self, hour, length):
+        """
+        Args:
+            hour (int): First hour number in the bitmap.
+            length (int): Number of hours needed.
+
+        Returns:
+            bool: True if every hour in the range is available.
+
+        """
+        if hour < 0 or hour + length > self.hours:
+            return False
+        mask = ((1 << length) - 1) << hour
+        return self.bits & mask == mask
+
+    def longest_block(self):
+        """Get the length of the longest run of available hours.  Each pass clears the last hour of every run, so this
+        takes as many passes as the longest run is long.
+
+        Returns:
+            int: Number of hours in the longest block, 0 if there is no availability.
+
+        """
+        bits = self.bits
+        longest = 0
+        while bits:
+            bits &= bits >> 1
+            longest += 1
+        return longest
+
+    @property
+    def total_hours(self):
+        """
+        Returns:
+            int: Total number of available hours.
+
+        """
+        return bin(self.bits).count('1')
+
+    def __bool__(self):
+        return bool(self.bits)
+
+    def __repr__(self):
+        return '<HourBitmap {} +{}h {:0{}b}>'.format(self.start_time.isoformat(), self.hours, self.bits, self.hours)
@@ -0,0 +1,393 @@
+"""Generated large events and requests for every view, for benchmarking and auditing queries."""
+
+import contextlib
+import datetime
+import re
+import statistics
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+from social_django.models import UserSocialAuth
+
+from submissions import game_names, models
+from submissions.availability import HourBitmap, event_hour_count, event_start_hour
+
+PLATFORMS = ['NES', 'SNES', 'N64', 'GBA', 'PSX', 'PS2', 'Genesis', 'PC']
+
+# SQLite query plan steps that read every row of a table, e.g. "SCAN submissions_submission" or "SCAN TABLE x" in older
+# versions.  Scans using an index only read the matching part of it, and are fine.
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+
+# Queries that are meant to read whole tables, as (view name, table).
+EXPECTED_SCANS = {
+    # The game catalog is loaded into memory in one go to build the search index.
+    ('game-search', 'submissions_game'),
+}
+
+# Timings and memory use vary between machines and runs, so views may go over their recorded time and peak memory by
+# these factors, plus a little extra for views so quick that noise would otherwise dominate.  Query counts don't vary,
+# and have to stay within their budgets exactly.
+TIME_TOLERANCE = 3.0
+TIME_SLACK = 0.05
+MEMORY_TOLERANCE = 1.5
+MEMORY_SLACK_KB = 256
+
+
+@contextlib.contextmanager
+def test_database():
+    """Run the block against a fresh test database, destroyed afterwards, so real data is never touched."""
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def get_requests(admin, runner):
+    """Get a request for every URL in the submissions app.
+
+    Args:
+        admin (django.contrib.auth.models.User): Event admin user.
+        runner (django.contrib.auth.models.User): Runner with submissions in the event.
+
+    Returns:
+        list[tuple]: Tuples (name, user, method, URL, data).
+
+    """
+    submission = runner.submissions.first()
+    categories = list(models.SubmissionCategory.objects.filter(
+        game__event=submission.event_id, status=models.SubmissionCategory.Statuses.PENDING).values_list(
+        'pk', flat=True)[:100])
+    requests = [
+        ('home', None, 'get', reverse('submissions:home'), {}),
+        ('profile', runner, 'get', reverse('submissions:profile'), {}),
+        ('submit', runner, 'get', reverse('submissions:submit'), {}),
+        ('my-submissions', runner, 'get', reverse('submissions:my-submissions'), {}),
+        ('all-submissions', runner, 'get', reverse('submissions:all-submissions'), {}),
+        ('edit-submission', runner, 'get', reverse('submissions:edit-submission', args=[submission.pk]), {}),
+        ('delete-submission', runner, 'get', reverse('submissions:delete-submission', args=[submission.pk]), {}),
+        ('game-search', runner, 'get', reverse('submissions:game-search'), {'q': 'super'}),
+        ('admin-settings', admin, 'get', reverse('submissions:admin-settings'), {}),
+        ('admin-submissions', admin, 'get', reverse('submissions:admin-submissions'), {}),
+        ('admin-review', admin, 'post', reverse('submissions:admin-review'),
+         {'status': models.SubmissionCategory.Statuses.PENDING, 'categories': categories}),
+        ('admin-games', admin, 'get', reverse('submissions:admin-games'), {'min_submissions': 2, 'similar': 'on'}),
+        ('admin-coverage', admin, 'get', reverse('submissions:admin-coverage'), {}),
+        ('admin-archives', admin, 'get', reverse('submissions:admin-archives'), {}),
+        ('admin-schedule', admin, 'get', reverse('submissions:admin-schedule'),
+         {'setup_buffer': '00:10:00', 'race_setup_buffer': '00:20:00'}),
+    ]
+    for kind in ['submissions', 'categories', 'runners', 'availability']:
+        requests.append(('admin-export-{}'.format(kind), admin, 'get',
+                         reverse('submissions:admin-export', args=[kind, 'csv']), {}))
+    for name in ['event', 'submissions', 'availability', 'schedule']:
+        requests.append(('api-v1-{}'.format(name), admin, 'get', reverse('submissions:api-v1-{}'.format(name)), {}))
+    return requests
+
+
+def measure(user, method, url, data, repeat):
+    """Request a URL with an empty cache to count queries and peak memory, then time repeated requests.
+
+    Args:
+        user (django.contrib.auth.models.User): User to log in as, or None for an anonymous request.
+        method (str): HTTP method, 'get' or 'post'.
+        url (str): URL to request.
+        data (dict): Query or form data.
+        repeat (int): Number of timed requests.
+
+    Returns:
+        dict: Number of queries and peak memory in KiB for the first request, and median time in seconds.
+
+    Raises:
+        RuntimeError: If the request fails.
+
+    """
+    client = Client()
+    if user is not None:
+        client.force_login(user)
+        # Logging in through Twitch stores the display data in the session, which force_login() skips.
+        session = client.session
+        session[models.TWITCH_DATA_SESSION_KEY] = models.twitch_display_data(
+            user.social_auth.get(provider='twitch').extra_data)
+        session.save()
+
+    def request():
+        response = getattr(client, method)(url, data)
+        if response.status_code >= 400:
+            raise RuntimeError('{} {} returned {}'.format(method.upper(), url, response.status_code))
+        # Streaming responses only do their work as they're read.
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+
+    # Start from an empty cache, and an empty query log since it stops growing once it's full in debug mode.
+    cache.clear()
+    reset_queries()
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            request()
+        query_count = len(queries.captured_queries)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        request()
+        timings.append(time.perf_counter() - started)
+
+    return {
+        'queries': query_count,
+        'seconds': round(statistics.median(timings), 4),
+        'peak_kb': peak // 1024,
+    }
+
+
+def check_budgets(results, budgets):
+    """Compare measurements against the recorded budgets, allowing for noise in the time and memory use.
+
+    Args:
+        results (dict): Measurements for each view from measure().
+        budgets (dict): Recorded measurements for each view.
+
+    Returns:
+        list[str]: Descriptions of every budget exceeded.
+
+    """
+    failures = []
+    for name, result in results.items():
+        budget = budgets.get(name)
+        if budget is None:
+            failures.append('{}: no budget recorded'.format(name))
+            continue
+        limits = {
+            'queries': budget['queries'],
+            'seconds': round(budget['seconds'] * TIME_TOLERANCE + TIME_SLACK, 4),
+            'peak_kb': int(budget['peak_kb'] * MEMORY_TOLERANCE + MEMORY_SLACK_KB),
+        }
+        for key, limit in limits.items():
+            if result[key] > limit:
+                failures.append('{}: {} {}, limit {} (budget {})'.format(name, result[key], key, limit, budget[key]))
+    return failures
+
+
+def get_small_tables(min_rows):
+    """
+    Args:
+        min_rows (int): Minimum number of rows for a table not to count as small.
+
+    Returns:
+        set[str]: Names of tables with fewer rows, which are cheaper to scan than to look up in an index.
+
+    """
+    small_tables = set()
+    with connection.cursor() as cursor:
+        for table in connection.introspection.table_names(cursor):
+            cursor.execute('SELECT COUNT(*) FROM {}'.format(connection.ops.quote_name(table)))
+            if cursor.fetchone()[0] < min_rows:
+                small_tables.add(table)
+    return small_tables
+
+
+def capture_queries(user, method, url, data):
+    """Request a URL with an empty cache and capture every distinct SELECT query it runs.
+
+    Args:
+        user (django.contrib.auth.models.User): User to log in as, or None for an anonymous request.
+        method (str): HTTP method, 'get' or 'post'.
+        url (str): URL to request.
+        data (dict): Query or form data.
+
+    Returns:
+        list[tuple[str|tuple]]: Tuples (SQL, parameters) in the order they were first run.
+
+    Raises:
+        RuntimeError: If the request fails.
+
+    """
+    client = Client()
+    if user is not None:
+        client.force_login(user)
+
+    queries = {}
+
+    def capture(execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith('SELECT'):
+            queries.setdefault(sql, tuple(params or ()))
+        return execute(sql, params, many, context)
+
+    cache.clear()
+    with connection.execute_wrapper(capture):
+        response = getattr(client, method)(url, data)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+    if response.status_code >= 400:
+        raise RuntimeError('{} {} returned {}'.format(method.upper(), url, response.status_code))
+    return list(queries.items())
+
+
+def explain(sql, params):
+    """
+    Args:
+        sql (str): SELECT query with placeholders.
+        params (tuple): Query parameters.
+
+    Returns:
+        list[str]: Steps of the SQLite query plan.
+
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def find_full_scans(name, queries, small_tables):
+    """Check the query plans of a view's queries for reads of whole tables, other than small or expected ones.
+
+    Args:
+        name (str): Name of the view from get_requests().
+        queries (list[tuple]): Queries the view ran, from capture_queries().
+        small_tables (set[str]): Tables too small to be worth an index, from get_small_tables().
+
+    Returns:
+        list[tuple]: Tuples (SQL, query plan steps, names of tables read in full) for every query with a full scan.
+
+    """
+    scans = []
+    for sql, params in queries:
+        plan = explain(sql, params)
+        tables = [match.group(1) for match in map(FULL_SCAN.match, plan) if match]
+        unexpected = [table for table in tables if table not in small_tables and (name, table) not in EXPECTED_SCANS]
+        if unexpected:
+            scans.append((sql, plan, unexpected))
+    return scans
+
+
+def generate_event(rnd, runner_count, past_events=0):
+    """Generate a week long open event with runners, their Twitch accounts and profiles, submissions, categories and
+    availability, plus a game catalog.  Everything is bulk inserted so large events don't take forever.
+
+    Args:
+        rnd (random.Random): Random number generator to use.
+        runner_count (int): Number of runners.
+        past_events (int): Number of finished events to generate before it, each with its own runners, so the current
+            event is only part of the data like it would be on a real site.
+
+    Returns:
+        tuple[django.contrib.auth.models.User]: Event admin user, and a runner with submissions in the current event.
+
+    """
+    User = get_user_model()
+    admin = User.objects.create_superuser('admin', 'admin@example.com', None)
+    UserSocialAuth.objects.create(user=admin, provider='twitch', uid='admin', extra_data={
+        'name': 'admin', 'display_name': 'Admin', 'logo': 'https://example.com/admin.png'})
+
+    start_date = (timezone.now() + datetime.timedelta(days=30)).replace(minute=0, second=0, microsecond=0)
+    for age in range(past_events, -1, -1):
+        event_start = start_date - datetime.timedelta(days=365 * age)
+        event = models.Event.objects.create(
+            name='Benchmark Event {}'.format(past_events - age),
+            stage=models.Event.Stages.CLOSED if age else models.Event.Stages.OPEN,
+            start_date=event_start, end_date=event_start + datetime.timedelta(days=7),
+            guidelines='# Guidelines\n\nRun *fast*.')
+        prefix = 'past{}_'.format(age) if age else ''
+        users = generate_runners(rnd, ['{}runner{}'.format(prefix, i) for i in range(runner_count)])
+        generate_submissions(rnd, event, users)
+
+    models.Game.objects.bulk_create([
+        models.Game(src_id=str(i), name='{} {}'.format(rnd.choice(['Super', 'Mega', 'Hyper']), i),
+                    platform=rnd.choice(PLATFORMS), release_year=str(rnd.randint(1985, 2020)))
+        for i in range(runner_count * 4)], batch_size=500)
+
+    runner = models.Submission.objects.filter(event=event).order_by('pk').first().user
+    return admin, runner
+
+
+def generate_runners(rnd, names):
+    """
+    Args:
+        rnd (random.Random): Random number generator to use.
+        names (list[str]): Usernames for the runners.
+
+    Returns:
+        list[django.contrib.auth.models.User]: Runners with profiles and Twitch accounts.
+
+    """
+    User = get_user_model()
+    User.objects.bulk_create([User(username=name) for name in names], batch_size=500)
+    users = list(User.objects.filter(username__in=names).order_by('pk'))
+    models.Profile.objects.bulk_create([
+        models.Profile(user=user, pronouns=rnd.choice(['They/Them', 'She/Her', 'He/Him'])) for user in users
+    ], batch_size=500)
+    UserSocialAuth.objects.bulk_create([
+        UserSocialAuth(user=user, provider='twitch', uid=str(user.pk), extra_data={
+            'name': user.username, 'display_name': user.username.title(),
+            'logo': 'https://example.com/{}.png'.format(user.username)})
+        for user in users], batch_size=500)
+    return users
+
+
+def generate_submissions(rnd, event, users):
+    """Generate submissions, categories and availability for runners in an event.
+
+    Args:
+        rnd (random.Random): Random number generator to use.
+        event (submissions.models.Event): Event to submit to.
+        users (list[django.contrib.auth.models.User]): Runners submitting to the event.
+
+    """
+    # Runners submit up to the maximum number of games, with one to the maximum number of categories each.
+    # Bulk inserts skip save(), so the game keys are set here.
+    submissions = []
+    for user in users:
+        for _ in range(rnd.randint(1, event.max_games)):
+            game = 'Game {}'.format(rnd.randrange(len(users) * 2))
+            submissions.append(models.Submission(
+                user=user, event=event, game=game, game_key=game_names.game_key(game), platform=rnd.choice(PLATFORMS),
+                release_year=str(rnd.randint(1985, 2020)), twitch_game='Game',
+                description='Some **description** of the run.'))
+    models.Submission.objects.bulk_create(submissions, batch_size=500)
+    submission_ids = list(models.Submission.objects.filter(event=event).values_list('pk', flat=True))
+
+    # Accept roughly enough runs to fill the event.
+    categories = [(pk, i) for pk in submission_ids for i in range(rnd.randint(1, event.max_categories))]
+    accept_rate = min(1.0, 7 * 24 / (len(categories) * 0.75))
+    models.SubmissionCategory.objects.bulk_create([
+        models.SubmissionCategory(
+            game_id=pk, category='Category {}'.format(i), race=rnd.random() < 0.1,
+            estimate=datetime.timedelta(minutes=rnd.randint(10, 80)), video='https://example.com/video',
+            status=(models.SubmissionCategory.Statuses.ACCEPTED if rnd.random() < accept_rate else
+                    rnd.choice([models.SubmissionCategory.Statuses.PENDING,
+                                models.SubmissionCategory.Statuses.DECLINED])))
+        for pk, i in categories], batch_size=500)
+
+    # Runners are available in random blocks through the event, stored both as rows and as hour bitmaps.
+    first_hour, hour_count = event_start_hour(event), event_hour_count(event)
+    availabilities, hours = [], []
+    for user in users:
+        blocks = []
+        hour = rnd.randint(0, 12)
+        while hour < hour_count:
+            length = min(rnd.randint(3, 16), hour_count - hour)
+            blocks.append((first_hour + datetime.timedelta(hours=hour), datetime.timedelta(hours=length)))
+            hour += length + rnd.randint(4, 30)
+        availabilities.extend(models.Availability(user=user, event=event, start_time=start_time,
+                                                  duration=duration) for start_time, duration in blocks)
+        bitmap = HourBitmap.from_intervals(first_hour, hour_count, blocks)
+        hours.append(models.AvailabilityHours(user=user, event=event, start_time=first_hour, hours=hour_count,
+                                              bitmap_data=bitmap.to_bytes()))
+    models.Availability.objects.bulk_create(availabilities, batch_size=500)
+    models.AvailabilityHours.objects.bulk_create(hours, batch_size=500)
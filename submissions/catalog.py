@@ -0,0 +1,148 @@
+"""In-memory prefix index over the local game catalog, used for game name autocomplete on the submit page."""
+
+import bisect
+import functools
+import uuid
+
+from django.core.cache import cache
+
+from submissions import models
+from submissions.game_names import normalize
+
+# Map some SR.com platform names to abbreviated names we want to use instead.
+PLATFORM_MAPPING = {
+    '3DO Interactive Multiplayer': '3DO',
+    'Atari Jaguar': 'Jaguar',
+    'Atari Jaguar CD': 'Jaguar CD',
+    'Atari Lynx': 'Lynx',
+    'Game Boy Advance': 'GBA',
+    'Game Boy Color': 'GBC',
+    'Nintendo 64': 'N64',
+    'Nintendo 3DS': '3DS',
+    'New Nintendo 3DS': 'New 3DS',
+    'Nintendo DS': 'DS',
+    'Nintendo Entertainment System': 'NES',
+    'Philips CD-i': 'CD-i',
+    'PlayStation': 'PSX',
+    'PlayStation 2': 'PS2',
+    'PlayStation 3': 'PS3',
+    'PlayStation 4': 'PS4',
+    'PlayStation 4 Pro': 'PS4',
+    'PlayStation Portable': 'PSP',
+    'PlayStation Vita': 'PS Vita',
+    'Sega 32X': '32X',
+    'Sega Game Gear': 'Game Gear',
+    'Sega Genesis': 'Genesis',
+    'Sega Master System': 'Master System',
+    'Sega Saturn': 'Saturn',
+    'Super Nintendo': 'SNES',
+    'TurboGrafx-16 CD-ROM': 'Turbo CD',
+    'TurboGrafx-16/PC Engine': 'TG-16',
+}
+
+# Cache key for the catalog version, bumped whenever the catalog is reloaded so every process rebuilds its index.
+CATALOG_VERSION_CACHE_KEY = 'submissions:game_catalog_version'
+
+
+class GameIndex:
+    """Sorted index of normalized name prefixes for every game.
+
+    Each game is indexed under its full name, every word suffix of its name (so "mario 64" finds "Super Mario 64"), and
+    its abbreviation.  Searching is a binary search for the query followed by a scan of the keys starting with it.
+    """
+
+    def __init__(self, games):
+        """
+        Args:
+            games (iterable[dict]): Games with name, abbreviation, platform, release_year and twitch_name keys.
+
+        """
+        self.games = []
+        entries = []
+        for game in games:
+            position = len(self.games)
+            self.games.append(game)
+
+            words = normalize(game['name']).split()
+            for i in range(len(words)):
+                # Rank matches at the start of the name ahead of matches later on.
+                entries.append((' '.join(words[i:]), 0 if i == 0 else 1, position))
+            if game['abbreviation']:
+                entries.append((normalize(game['abbreviation']), 0, position))
+
+        entries.sort()
+        self.keys = [key for key, _, _ in entries]
+        self.entries = [(rank, position) for _, rank, position in entries]
+
+    def search(self, query, limit=10):
+        """Find games with a name or abbreviation starting with the query.
+
+        Args:
+            query (str): Search text.
+            limit (int): Maximum number of results.
+
+        Returns:
+            list[dict]: Matching games, name and abbreviation matches first, then shorter names first.
+
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        matches = {}
+        i = bisect.bisect_left(self.keys, query)
+        while i < len(self.keys) and self.keys[i].startswith(query):
+            rank, position = self.entries[i]
+            matches[position] = min(rank, matches.get(position, rank))
+            i += 1
+
+        ranked = sorted(matches, key=lambda p: (matches[p], len(self.games[p]['name']), self.games[p]['name']))
+        return [self.games[p] for p in ranked[:limit]]
+
+
+_index = None
+_index_version = None
+
+
+def get_index():
+    """Get the game index for this process, rebuilding it if the catalog has been reloaded since it was built.
+
+    Returns:
+        GameIndex: Index of all games in the catalog.
+
+    """
+    global _index, _index_version
+
+    version = cache.get(CATALOG_VERSION_CACHE_KEY)
+    if _index is None or version != _index_version:
+        _index = GameIndex(models.Game.objects.values(
+            'name', 'abbreviation', 'platform', 'release_year', 'twitch_name').iterator())
+        _index_version = version
+        _search.cache_clear()
+    return _index
+
+
+def catalog_changed():
+    """Mark the catalog as changed so every process rebuilds its index on the next search."""
+    cache.set(CATALOG_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+    _search.cache_clear()
+
+
+@functools.lru_cache(maxsize=1024)
+def _search(query, limit):
+    return tuple(_index.search(query, limit))
+
+
+def search_games(query, limit=10):
+    """Search the game catalog, keeping results for popular queries in an LRU cache.
+
+    Args:
+        query (str): Search text.
+        limit (int): Maximum number of results.
+
+    Returns:
+        tuple[dict]: Matching games.
+
+    """
+    get_index()
+    return _search(normalize(query), limit)
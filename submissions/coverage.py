@@ -0,0 +1,119 @@
+"""Event-wide availability coverage: how many runners and accepted runs could fill each hour of an event."""
+
+import datetime
+from collections import namedtuple
+
+from django.core.cache import cache
+
+from submissions import models
+from submissions.availability import ONE_HOUR, HourBitmap, event_hour_grid, event_start_hour
+
+# Cache key for an event's coverage, which includes when the event settings last changed and the event's data version so
+# it's rebuilt after any change to the event dates, availability or accepted runs.
+COVERAGE_CACHE_KEY = 'submissions:coverage:{}:{}:{}'
+
+# Coverage for one hour of an event: the hour slot, number of runners available, number of accepted runs that could
+# start in the hour with their runner available for the whole estimate, and the total estimate of those runs.
+HourCoverage = namedtuple('HourCoverage', ['slot', 'runners', 'runs', 'run_time'])
+
+
+def fit_mask(bits, length):
+    """Find the hours a run of some length could start at.
+
+    Args:
+        bits (int): Availability bitmap bits.
+        length (int): Number of hours needed.
+
+    Returns:
+        int: Bits set for each hour starting a run of at least that many available hours.
+
+    """
+    # Doubling the span covered each step takes log2(length) shifts instead of one per hour.
+    span = 1
+    while span < length:
+        step = min(span, length - span)
+        bits &= bits >> step
+        span += step
+    return bits
+
+
+def compute_coverage(hour_count, bitmaps, runs):
+    """Count runners and runs for every hour at once.  Each runner and run adds its blocks of hours to difference
+    arrays, which are summed in a single pass at the end, so the work depends on the number of blocks rather than
+    blocks times hours.
+
+    Args:
+        hour_count (int): Number of hours in the event.
+        bitmaps (dict): Availability bits for each runner ID, with bit 0 for the first hour of the event.
+        runs (iterable[tuple[int|datetime.timedelta]]): Tuples (runner ID, estimate) for accepted runs.
+
+    Returns:
+        list[tuple[int|datetime.timedelta]]: Tuples (runners, runs, run time) for each hour.
+
+    """
+    runners = [0] * (hour_count + 1)
+    run_counts = [0] * (hour_count + 1)
+    run_seconds = [0] * (hour_count + 1)
+
+    for bits in bitmaps.values():
+        for first, length in HourBitmap(None, hour_count, bits).blocks():
+            runners[first] += 1
+            runners[first + length] -= 1
+
+    # Runners often submit several runs of similar length, so each runner and length only needs working out once.
+    masks = {}
+    for runner, estimate in runs:
+        length = max(1, -int(-estimate // ONE_HOUR))
+        key = runner, length
+        if key not in masks:
+            masks[key] = HourBitmap(None, hour_count, fit_mask(bitmaps.get(runner, 0), length)).blocks()
+        seconds = int(estimate.total_seconds())
+        for first, count in masks[key]:
+            run_counts[first] += 1
+            run_counts[first + count] -= 1
+            run_seconds[first] += seconds
+            run_seconds[first + count] -= seconds
+
+    coverage = []
+    total_runners = total_runs = total_seconds = 0
+    for hour in range(hour_count):
+        total_runners += runners[hour]
+        total_runs += run_counts[hour]
+        total_seconds += run_seconds[hour]
+        coverage.append((total_runners, total_runs, datetime.timedelta(seconds=total_seconds)))
+    return coverage
+
+
+def get_event_coverage(event):
+    """Get the coverage for every hour of an event, from runners' availability bitmaps and accepted runs.  The result
+    is cached until the event next changes.
+
+    Args:
+        event (submissions.models.Event): Event to get coverage for.
+
+    Returns:
+        list[HourCoverage]: Coverage for each hour of the event, in order.
+
+    """
+    cache_key = COVERAGE_CACHE_KEY.format(event.pk, event.changed_at.timestamp(),
+                                          models.EventStats.get_for_event(event).version)
+    counts = cache.get(cache_key)
+    if counts is None:
+        hour_grid = event_hour_grid(event)
+        start_hour = event_start_hour(event)
+        mask = (1 << len(hour_grid)) - 1
+
+        # Line each bitmap up with the event's current hours, in case the event dates changed since it was stored.
+        bitmaps = {}
+        for user_id, start_time, bitmap_data in models.AvailabilityHours.objects.filter(event=event).values_list(
+                'user', 'start_time', 'bitmap_data'):
+            bits = int.from_bytes(bytes(bitmap_data), 'little')
+            offset = (start_time - start_hour) // ONE_HOUR
+            bitmaps[user_id] = (bits << offset if offset >= 0 else bits >> -offset) & mask
+
+        runs = models.SubmissionCategory.objects.filter(
+            game__event=event, status=models.SubmissionCategory.Statuses.ACCEPTED).values_list('game__user', 'estimate')
+        counts = compute_coverage(len(hour_grid), bitmaps, runs)
+        cache.set(cache_key, counts, models.FRAGMENT_CACHE_TIMEOUT)
+
+    return [HourCoverage(slot, *hour_counts) for slot, hour_counts in zip(event_hour_grid(event), counts)]
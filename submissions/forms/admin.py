@@ -1,9 +1,13 @@
 """Forms for admin views."""
 
 from django import forms
+from django.db.models import Exists, OuterRef, Q
+from django.utils.translation import gettext as _
 from tempus_dominus.widgets import DateTimePicker
 
-from submissions.models import Event
+from submissions.game_names import game_key
+from submissions.models import Event, SubmissionCategory
+from submissions.scheduling import DEFAULT_RACE_SETUP_BUFFER, DEFAULT_SETUP_BUFFER
 
 
 class SettingsForm(forms.ModelForm):
@@ -17,3 +21,110 @@ class SettingsForm(forms.ModelForm):
         # Make start/end dates Tempus Dominus datetime picker widgets.
         self.fields['start_date'].widget = DateTimePicker(attrs={'autocomplete': 'off'})
         self.fields['end_date'].widget = DateTimePicker(attrs={'autocomplete': 'off'})
+
+
+class ScheduleForm(forms.Form):
+    setup_buffer = forms.DurationField(label=_('Setup Buffer'), initial=DEFAULT_SETUP_BUFFER,
+                                       help_text=_('Time between runs.  Format: HH:MM:SS or MM:SS'))
+    race_setup_buffer = forms.DurationField(label=_('Race/Co-op Setup Buffer'), initial=DEFAULT_RACE_SETUP_BUFFER,
+                                            help_text=_('Time before race/co-op runs.  Format: HH:MM:SS or MM:SS'))
+
+
+class GameGroupsForm(forms.Form):
+    """Options for grouping the current event's submissions by game, submitted as GET parameters."""
+    min_submissions = forms.IntegerField(label=_('Min Submissions'), min_value=1, initial=2, required=False,
+                                         help_text=_('Only show games submitted at least this many times.'))
+    similar = forms.BooleanField(label=_('Group Similar Names'), required=False,
+                                 help_text=_('Also group names that are only nearly the same, like typos.'))
+
+
+class SubmissionFilterForm(forms.Form):
+    """Filters and sort order for the admin submissions list, submitted as GET parameters."""
+    SORT_FIELDS = {
+        'game': ['game', 'id'],
+        'runner': ['user__username', 'id'],
+        'rolled_up_status': ['rolled_up_status', 'game', 'id'],
+    }
+
+    game = forms.CharField(label=_('Game'), required=False, help_text=_('Matches any spelling of the name.'))
+    status = forms.ChoiceField(label=_('Status'), required=False,
+                               choices=[('', _('Any'))] + SubmissionCategory.Statuses.choices)
+    platform = forms.CharField(label=_('Platform'), required=False)
+    race = forms.NullBooleanField(label=_('Race/Co-op'), required=False, widget=forms.Select(
+        choices=[('', _('Any')), ('true', _('Yes')), ('false', _('No'))]))
+    min_estimate = forms.DurationField(label=_('Min Estimate'), required=False)
+    max_estimate = forms.DurationField(label=_('Max Estimate'), required=False)
+    runner = forms.CharField(label=_('Runner'), required=False)
+    sort = forms.ChoiceField(label=_('Sort By'), required=False, choices=[
+        ('game', _('Game')), ('runner', _('Runner')), ('rolled_up_status', _('Status'))])
+
+    @property
+    def ordering(self):
+        """
+        Returns:
+            list[str]: Unique sort key fields for the selected sort order.
+
+        """
+        sort = self.cleaned_data.get('sort') if self.is_valid() else None
+        return self.SORT_FIELDS.get(sort or 'game')
+
+    @property
+    def is_filtered(self):
+        """
+        Returns:
+            bool: True if any filters are set.
+
+        """
+        return self.is_valid() and any(v not in (None, '') for k, v in self.cleaned_data.items() if k != 'sort')
+
+    def filter_queryset(self, queryset):
+        """Apply the filters to a submission queryset annotated with SubmissionQuerySet.with_status().
+
+        Category filters match submissions that have at least one category matching all of them.
+
+        Args:
+            queryset (django.db.models.QuerySet): Submissions to filter.
+
+        Returns:
+            django.db.models.QuerySet: Filtered submissions.
+
+        """
+        if not self.is_valid():
+            return queryset
+        data = self.cleaned_data
+
+        if data['game']:
+            queryset = queryset.filter(game_key=game_key(data['game']))
+        if data['status']:
+            queryset = queryset.filter(rolled_up_status=data['status'])
+        if data['platform']:
+            queryset = queryset.filter(platform__icontains=data['platform'])
+        if data['runner']:
+            queryset = queryset.filter(user__username__icontains=data['runner'])
+
+        category_filter = Q()
+        if data['race'] is not None:
+            category_filter &= Q(race=data['race'])
+        if data['min_estimate'] is not None:
+            category_filter &= Q(estimate__gte=data['min_estimate'])
+        if data['max_estimate'] is not None:
+            category_filter &= Q(estimate__lte=data['max_estimate'])
+        if category_filter:
+            queryset = queryset.filter(Exists(SubmissionCategory.objects.filter(category_filter, game=OuterRef('pk'))))
+
+        return queryset
+
+
+class ReviewForm(forms.Form):
+    """Status change for many categories of the current event at once."""
+    status = forms.ChoiceField(label=_('Status'), choices=SubmissionCategory.Statuses.choices)
+    categories = forms.ModelMultipleChoiceField(label=_('Categories'), queryset=SubmissionCategory.objects.none())
+
+    def __init__(self, *args, event=None, **kwargs):
+        """
+        Args:
+            event (submissions.models.Event): Event the categories must belong to.
+
+        """
+        super().__init__(*args, **kwargs)
+        self.fields['categories'].queryset = SubmissionCategory.objects.filter(game__event=event)
@@ -1,13 +1,15 @@
 """Forms for submitting runs and updating your runner profile."""
 
-import datetime
-import itertools
 from collections import OrderedDict
 
 from django import forms
-from django.utils.timezone import get_current_timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext as _
 
+from submissions.availability import HourBitmap, event_hour_grid, event_start_hour
+from submissions.game_names import game_key
+from submissions.models import RunnerSummary, Submission, SubmissionCategory
+
 PRONOUN_CHOICES = (
     'He/Him',
     'She/Her',
@@ -44,15 +46,13 @@ class AvailabilityForm(forms.Form):
         self.user = user
         super().__init__(*args, **kwargs)
 
-        # Generate availability fields for each hour based on the event dates.
+        # Generate availability fields for each hour based on the event's hour grid.
         # Add date object for these fields so we can group them by day in templates later on.
-        hour = self.event.start_date.astimezone(get_current_timezone()).replace(minute=0, second=0, microsecond=0)
-        while hour < self.event.end_date:
-            field_name = 'available_{}'.format(hour.strftime('%Y_%m_%d_%H'))
-            field = forms.BooleanField(label=hour.strftime('%I:00 %p'), required=False)
-            field.day = hour.date()
-            self.fields[field_name] = field
-            hour += datetime.timedelta(hours=1)
+        self.hour_grid = event_hour_grid(self.event)
+        for slot in self.hour_grid:
+            field = forms.BooleanField(label=slot.label, required=False)
+            field.day = slot.day
+            self.fields[slot.field_name] = field
 
     @property
     def fields_by_day(self):
@@ -79,31 +79,30 @@ class AvailabilityForm(forms.Form):
         """
         if self.errors:
             return []
+        return self.selected_hours.to_intervals()
 
-        availabilties = []
-        current_availability = None
-        hour = self.event.start_date.astimezone(get_current_timezone()).replace(minute=0, second=0, microsecond=0)
-        while hour < self.event.end_date:
-            field_name = 'available_{}'.format(hour.strftime('%Y_%m_%d_%H'))
-
-            # Field is selected.
-            if self.cleaned_data.get(field_name):
-                if not current_availability:
-                    current_availability = [hour, datetime.timedelta()]
-                current_availability[1] += datetime.timedelta(hours=1)
-            # Field is not selected, clip the current availability period if any.
-            else:
-                if current_availability:
-                    availabilties.append(current_availability)
-                current_availability = None
+    @cached_property
+    def selected_hours(self):
+        """Get the selected hours as an availability bitmap.  This is only worked out once per bound form.
 
-            hour += datetime.timedelta(hours=1)
+        Returns:
+            submissions.availability.HourBitmap: Bitmap of the selected hours.
 
-        # After we've gone through all selected hours, if the last one was checked, add the final availability.
-        if current_availability:
-            availabilties.append(current_availability)
+        """
+        bits = 0
+        for slot in self.hour_grid:
+            if self.cleaned_data.get(slot.field_name):
+                bits |= 1 << slot.index
+        return HourBitmap(event_start_hour(self.event), len(self.hour_grid), bits)
+
+    @cached_property
+    def summary(self):
+        """
+        Returns:
+            submissions.models.RunnerSummary: Longest estimate and availability of the user, looked up once per form.
 
-        return availabilties
+        """
+        return RunnerSummary.get_for(self.user, self.event)
 
     def clean(self):
         """Extra validation for availability based on submitted runs."""
@@ -115,10 +114,10 @@ class AvailabilityForm(forms.Form):
 
         # Maximum availability interval must be at least as long as the longest submitted run for the user.
         max_availability = max(a[1] for a in self.selected_availabilties)
-        categories = [list(s.categories.all()) for s in self.user.current_event_submissions]
-        categories = list(itertools.chain(*categories))
-        max_run = max(categories, key=lambda c: c.estimate) if categories else None
-        if max_run is not None and max_run.estimate > max_availability:
+        if self.summary.longest_estimate > max_availability:
+            # Only look up which run it is for the error message.
+            max_run = SubmissionCategory.objects.filter(game__user=self.user, game__event=self.event).select_related(
+                'game').order_by('-estimate').first()
             raise forms.ValidationError(
                 _('You must have an availability window for your largest estimate: {} - {} ({})'.format(
                     max_run.game.game, max_run.category, max_run.estimate)))
@@ -153,11 +152,15 @@ class SubmitGameForm(forms.Form):
     def clean(self):
         cleaned_data = super().clean()
 
-        # Make sure user hasn't already submitted this game.
-        submitted = {s.game.lower() for s in self.user.current_event_submissions if s != self.submission}
-        if cleaned_data.get('game') and cleaned_data['game'].lower() in submitted:
-            raise forms.ValidationError(_('You have already submitted this game for the current event.  Please edit '
-                                          'your existing submission if you wish to change it.'))
+        # Make sure user hasn't already submitted this game, under any spelling of its name.
+        if cleaned_data.get('game'):
+            submitted = Submission.objects.filter(event=self.event, game_key=game_key(cleaned_data['game']),
+                                                  user=self.user)
+            if self.submission:
+                submitted = submitted.exclude(pk=self.submission.pk)
+            if submitted.exists():
+                raise forms.ValidationError(_('You have already submitted this game for the current event.  Please '
+                                              'edit your existing submission if you wish to change it.'))
 
         return cleaned_data
 
@@ -180,12 +183,21 @@ class SubmitCategoryForm(forms.Form):
         self.user = user
         super().__init__(*args, **kwargs)
 
+    @cached_property
+    def summary(self):
+        """
+        Returns:
+            submissions.models.RunnerSummary: Longest estimate and availability of the user, looked up once per form.
+
+        """
+        return RunnerSummary.get_for(self.user, self.event)
+
     def clean(self):
         cleaned_data = super().clean()
 
         # Make sure estimate has at least one availability window that is large enough for it.
         if cleaned_data.get('estimate'):
-            if not any(a for a in self.user.current_event_availabilities if a.duration >= cleaned_data['estimate']):
+            if cleaned_data['estimate'] > self.summary.longest_availability:
                 raise forms.ValidationError(_(
                     'Your current availability does not have any blocks long enough for this estimate: {} ({})'.format(
                         cleaned_data['category'], cleaned_data['estimate'])))
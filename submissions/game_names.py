@@ -0,0 +1,107 @@
+"""Normalizing game names, so different spellings of the same game can be matched up."""
+
+import collections
+import re
+import unicodedata
+
+# Roman numerals converted to numbers in game keys, so "Final Fantasy VII" matches "Final Fantasy 7".  "I" and "X" are
+# left alone since they're more often letters, as in "Mega Man X".
+ROMAN_NUMERALS = {
+    'ii': '2', 'iii': '3', 'iv': '4', 'v': '5', 'vi': '6', 'vii': '7', 'viii': '8', 'ix': '9', 'xi': '11', 'xii': '12',
+    'xiii': '13', 'xiv': '14', 'xv': '15', 'xvi': '16', 'xvii': '17', 'xviii': '18', 'xix': '19', 'xx': '20',
+}
+
+# Maximum length of a game key, which is the length of the column it's stored in.  Keys can be longer than the game
+# name they come from, since "&" becomes "and".
+GAME_KEY_LENGTH = 100
+
+# Minimum trigram similarity for two game keys to be treated as the same game when grouping loosely.
+DEFAULT_SIMILARITY = 0.6
+
+
+def normalize(text):
+    """Normalize text for matching: case-folded, accents removed, and punctuation collapsed to single spaces.
+
+    Args:
+        text (str): Text to normalize.
+
+    Returns:
+        str: Normalized text.
+
+    """
+    text = unicodedata.normalize('NFKD', text.casefold())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(re.findall(r'\w+', text))
+
+
+def game_key(name):
+    """Get the key for a game name, which is the same for common differences in spelling.  On top of normalize(), "&"
+    is the same as "and", roman numerals are numbers, and a leading "The" is dropped.
+
+    Args:
+        name (str): Game name.
+
+    Returns:
+        str: Key for the game, cut down to GAME_KEY_LENGTH characters.
+
+    """
+    words = normalize(name.replace('&', ' and ')).split()
+    if len(words) > 1 and words[0] == 'the':
+        words = words[1:]
+    return ' '.join(ROMAN_NUMERALS.get(word, word) for word in words)[:GAME_KEY_LENGTH].rstrip()
+
+
+def trigrams(key):
+    """
+    Args:
+        key (str): Game key.
+
+    Returns:
+        set[str]: Three letter sequences in the key, with each word padded like PostgreSQL's pg_trgm does.
+
+    """
+    grams = set()
+    for word in key.split():
+        word = '  {} '.format(word)
+        grams.update(word[i:i + 3] for i in range(len(word) - 2))
+    return grams
+
+
+def group_similar(keys, threshold=DEFAULT_SIMILARITY):
+    """Group game keys that are similar enough to probably be the same game, e.g. with a typo or a missing word.  Keys
+    with different numbers in them are never grouped, since those are usually sequels.  Keys are only compared with
+    others sharing a trigram, so this stays quick for thousands of keys.
+
+    Args:
+        keys (iterable[str]): Game keys.
+        threshold (float): Minimum share of trigrams two keys need in common, from 0 to 1.
+
+    Returns:
+        dict: Key for the group each key belongs to, which is the first of its keys in sorted order.
+
+    """
+    keys = sorted(set(keys))
+    key_trigrams = [trigrams(key) for key in keys]
+    key_numbers = [[word for word in key.split() if word.isdigit()] for key in keys]
+    index = collections.defaultdict(list)
+    for i, grams in enumerate(key_trigrams):
+        for gram in grams:
+            index[gram].append(i)
+
+    # Union-find over similar pairs, always keeping the lowest position as the root so groups get the first key.
+    parents = list(range(len(keys)))
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    for i, grams in enumerate(key_trigrams):
+        shared = collections.Counter(j for gram in grams for j in index[gram] if j > i)
+        for j, count in shared.items():
+            if key_numbers[i] == key_numbers[j] and count / len(grams | key_trigrams[j]) >= threshold:
+                root_i, root_j = find(i), find(j)
+                parents[max(root_i, root_j)] = min(root_i, root_j)
+
+    return {key: keys[find(i)] for i, key in enumerate(keys)}
@@ -0,0 +1,38 @@
+"""Move closed past events' submissions and availability out of the database into archive files."""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.template.defaultfilters import filesizeformat
+
+from submissions import archive, models
+
+
+class Command(BaseCommand):
+    help = ('Move the submissions, categories and availability of closed events that have ended into compressed '
+            'archive files in MARATHON_ARCHIVE_DIR ({}), keeping the live tables and their indexes small.  Archived '
+            'events can still be browsed from the admin pages, and put back with restore_event.'.format(
+                settings.MARATHON_ARCHIVE_DIR))
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_ids', nargs='*', type=int,
+                            help='IDs of events to archive.  Defaults to every closed past event not archived yet.')
+        parser.add_argument('--dry-run', action='store_true', help='List the events that would be archived.')
+
+    def handle(self, *args, **options):
+        events = archive.archivable_events()
+        if options['event_ids']:
+            events = events.filter(pk__in=options['event_ids'])
+            missing = set(options['event_ids']) - set(events.values_list('pk', flat=True))
+            if missing:
+                raise CommandError('Events {} are not closed past events, or are already archived'.format(
+                    ', '.join(str(pk) for pk in sorted(missing))))
+
+        for event in events:
+            if options['dry_run']:
+                self.stdout.write('Would archive {} ({})'.format(event, event.pk))
+                continue
+            event_archive = archive.archive_event(event)
+            stats = models.EventStats.get_for_event(event)
+            self.stdout.write('Archived {}: {} submissions, {} categories, {} availabilities to {} ({})'.format(
+                event, stats.submissions, stats.categories, event_archive.availabilities, event_archive.path,
+                filesizeformat(event_archive.size)))
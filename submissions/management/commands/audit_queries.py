@@ -0,0 +1,55 @@
+"""Check the query plans of every submissions view for full table scans."""
+
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from submissions import benchmarking
+
+
+class Command(BaseCommand):
+    help = ('Request every submissions view against a generated event in a throwaway SQLite test database, and check '
+            'the query plan of every query it runs.  Fails if any query reads a whole table.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runners', type=int, default=200, help='Number of runners in the generated event.')
+        parser.add_argument('--past-events', type=int, default=5,
+                            help='Number of finished events to generate before the current one.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for generating the event.')
+        parser.add_argument('--min-rows', type=int, default=100,
+                            help='Ignore scans of tables with fewer rows than this, which are cheaper than an index.')
+        parser.add_argument('--show-plans', action='store_true', help='Print the query plan of every query.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Query plans can only be checked on SQLite, not {}'.format(connection.vendor))
+
+        failures = []
+        with benchmarking.test_database():
+            # Query plans depend on table statistics, so gather them once the data is in.
+            admin, runner = benchmarking.generate_event(random.Random(options['seed']), options['runners'],
+                                                        options['past_events'])
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            small_tables = benchmarking.get_small_tables(options['min_rows'])
+
+            for name, user, method, url, data in benchmarking.get_requests(admin, runner):
+                try:
+                    queries = benchmarking.capture_queries(user, method, url, data)
+                except RuntimeError as e:
+                    raise CommandError(e)
+                scans = benchmarking.find_full_scans(name, queries, small_tables)
+                for sql, plan, tables in scans:
+                    failures.append('{}: full scan of {}\n  {}\n  {}'.format(
+                        name, ', '.join(tables), sql, '\n  '.join(plan)))
+                if options['show_plans']:
+                    for sql, params in queries:
+                        self.stdout.write('{}\n  {}\n'.format(sql, '\n  '.join(benchmarking.explain(sql, params))))
+                self.stdout.write('{:<28} {:>5} queries {:>3} with full scans'.format(name, len(queries), len(scans)))
+
+        for failure in failures:
+            self.stderr.write(failure)
+        if failures:
+            raise CommandError('{} queries read whole tables'.format(len(failures)))
+        self.stdout.write('No full table scans')
@@ -0,0 +1,77 @@
+"""Benchmark the schedule builder on generated events."""
+
+import datetime
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from submissions import scheduling
+
+
+class Command(BaseCommand):
+    help = 'Time the schedule builder on randomly generated events.  Does not touch the database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--datasets', type=int, default=10, help='Number of events to generate.')
+        parser.add_argument('--runs', type=int, default=250, help='Number of accepted runs per event.')
+        parser.add_argument('--runners', type=int, default=80, help='Number of runners per event.')
+        parser.add_argument('--days', type=int, default=7, help='Length of each event in days.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for generating events.')
+        parser.add_argument('--max-seconds', type=float, default=None,
+                            help='Fail if building any schedule takes longer than this.')
+
+    def handle(self, *args, **options):
+        timings = []
+        for dataset in range(options['datasets']):
+            rnd = random.Random(options['seed'] + dataset)
+            start_time, end_time, runs, availability = self.generate_event(
+                rnd, options['runs'], options['runners'], options['days'])
+
+            started = time.perf_counter()
+            schedule = scheduling.Scheduler(start_time, end_time, runs, availability).build()
+            elapsed = time.perf_counter() - started
+            timings.append(elapsed)
+
+            self.stdout.write('Dataset {}: {} runs, {} placed, {} unplaced, {} idle, {:.3f}s'.format(
+                dataset, len(runs), len(schedule.entries), len(schedule.unplaced), schedule.idle_time, elapsed))
+
+        self.stdout.write('Average {:.3f}s, max {:.3f}s'.format(sum(timings) / len(timings), max(timings)))
+        if options['max_seconds'] is not None and max(timings) > options['max_seconds']:
+            raise CommandError('Schedule building took longer than {}s'.format(options['max_seconds']))
+
+    @staticmethod
+    def generate_event(rnd, run_count, runner_count, days):
+        """Generate an event with runners available in random blocks and runs with random estimates.
+
+        Args:
+            rnd (random.Random): Random number generator to use.
+            run_count (int): Number of runs.
+            runner_count (int): Number of runners.
+            days (int): Length of the event in days.
+
+        Returns:
+            tuple: Start time, end time, list of runs, and mapping of runner to availability intervals.
+
+        """
+        start_time = datetime.datetime(2020, 1, 1, 12, tzinfo=datetime.timezone.utc)
+        end_time = start_time + datetime.timedelta(days=days)
+
+        availability = {}
+        for runner in range(runner_count):
+            intervals = []
+            hour = rnd.randint(0, 12)
+            while hour < days * 24:
+                length = rnd.randint(3, 16)
+                intervals.append((start_time + datetime.timedelta(hours=hour), datetime.timedelta(hours=length)))
+                hour += length + rnd.randint(4, 30)
+            availability[runner] = intervals
+
+        # Size estimates so the runs roughly fill the event.
+        average_minutes = days * 24 * 60 / run_count
+        runs = []
+        for key in range(run_count):
+            estimate = datetime.timedelta(minutes=rnd.randint(10, max(11, int(average_minutes * 1.6))))
+            runs.append(scheduling.ScheduleRun(key, rnd.randrange(runner_count), estimate, rnd.random() < 0.1,
+                                               'Run {}'.format(key)))
+        return start_time, end_time, runs, availability
@@ -0,0 +1,70 @@
+"""Benchmark every submissions view against a generated large event."""
+
+import json
+import os
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+import submissions
+from submissions import benchmarking, models
+
+DEFAULT_BUDGETS = os.path.join(os.path.dirname(submissions.__file__), 'benchmark_budgets.json')
+
+
+class Command(BaseCommand):
+    help = ('Time every submissions view against a generated event in a throwaway test database, reporting query '
+            'counts, wall time and peak memory.  Fails if any view makes more queries than its recorded budget, or '
+            'goes well over its recorded time or peak memory.  Record the budgets again when a change makes a view '
+            'slower or use more memory on purpose, on a machine close to the one that recorded them.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runners', type=int, default=500, help='Number of runners in the generated event.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for generating the event.')
+        parser.add_argument('--repeat', type=int, default=5, help='Number of timed requests per view.')
+        parser.add_argument('--budgets', default=DEFAULT_BUDGETS, help='Path to the JSON file of view budgets.')
+        parser.add_argument('--record', action='store_true',
+                            help='Save the measurements as the new budgets instead of checking against them.')
+
+    def handle(self, *args, **options):
+        budgets = None
+        if not options['record']:
+            try:
+                with open(options['budgets']) as f:
+                    budgets = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError('Could not read budgets, run with --record first: {}'.format(e))
+            if budgets['runners'] != options['runners']:
+                raise CommandError('Budgets were recorded for {} runners, not {}'.format(
+                    budgets['runners'], options['runners']))
+
+        with benchmarking.test_database():
+            started = time.perf_counter()
+            admin, runner = benchmarking.generate_event(random.Random(options['seed']), options['runners'])
+            self.stdout.write('Generated event with {} runners, {} submissions and {} categories in {:.1f}s'.format(
+                options['runners'], models.Submission.objects.count(), models.SubmissionCategory.objects.count(),
+                time.perf_counter() - started))
+
+            results = {}
+            for name, user, method, url, data in benchmarking.get_requests(admin, runner):
+                try:
+                    results[name] = benchmarking.measure(user, method, url, data, options['repeat'])
+                except RuntimeError as e:
+                    raise CommandError(e)
+                self.stdout.write('{:<28} {queries:>5} queries {seconds:>8.3f}s {peak_kb:>9} KiB'.format(
+                    name, **results[name]))
+
+        if options['record']:
+            with open(options['budgets'], 'w') as f:
+                json.dump({'runners': options['runners'], 'views': results}, f, indent=4, sort_keys=True)
+                f.write('\n')
+            self.stdout.write('Recorded budgets to {}'.format(options['budgets']))
+            return
+
+        failures = benchmarking.check_budgets(results, budgets['views'])
+        for failure in failures:
+            self.stderr.write(failure)
+        if failures:
+            raise CommandError('{} view budgets exceeded'.format(len(failures)))
+        self.stdout.write('All views within budget')
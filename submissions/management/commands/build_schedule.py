@@ -0,0 +1,37 @@
+"""Build a draft schedule for an event and print it."""
+
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from submissions import models, scheduling
+
+
+class Command(BaseCommand):
+    help = 'Build a draft schedule from accepted runs and runner availability for an event.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=int,
+                            help='Event ID to build the schedule for.  Defaults to the current event.')
+        parser.add_argument('--setup-minutes', type=int, default=10, help='Setup buffer between runs in minutes.')
+        parser.add_argument('--race-setup-minutes', type=int, default=20,
+                            help='Setup buffer before race/co-op runs in minutes.')
+
+    def handle(self, *args, **options):
+        if options['event']:
+            event = models.Event.objects.filter(pk=options['event']).first()
+        else:
+            event = models.Event.get_current_event()
+        if not event:
+            raise CommandError('Event not found')
+
+        schedule = scheduling.build_event_schedule(event, datetime.timedelta(minutes=options['setup_minutes']),
+                                                   datetime.timedelta(minutes=options['race_setup_minutes']))
+
+        for entry in schedule.entries:
+            self.stdout.write('{:%Y-%m-%d %H:%M} - {:%H:%M}  {}{}'.format(
+                entry.start_time, entry.end_time, entry.run.label, ' [race]' if entry.run.race else ''))
+        for unplaced in schedule.unplaced:
+            self.stdout.write(self.style.WARNING('Unplaced: {} ({})'.format(unplaced.run.label, unplaced.reason)))
+        self.stdout.write('{} runs scheduled ({} of run time, {} idle), {} unplaced'.format(
+            len(schedule.entries), schedule.scheduled_time, schedule.idle_time, len(schedule.unplaced)))
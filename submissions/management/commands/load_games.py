@@ -0,0 +1,73 @@
+"""Load the local game catalog from a Speedrun.com data dump."""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from submissions import catalog, models
+
+
+class Command(BaseCommand):
+    help = ('Replace the local game catalog used for autocomplete with games from a Speedrun.com JSON dump.  The dump '
+            'is a list of game objects from the /api/v1/games endpoint with platforms embedded, or a response body '
+            'with them under "data".')
+
+    def add_arguments(self, parser):
+        parser.add_argument('dump', help='Path to the JSON dump file.')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['dump'], encoding='utf-8') as f:
+                dump = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError('Could not read game dump: {}'.format(e))
+
+        games = {}
+        skipped = 0
+        for item in dump.get('data', []) if isinstance(dump, dict) else dump:
+            game = self.parse_game(item)
+            if game is None:
+                skipped += 1
+                continue
+            games[game.src_id] = game
+
+        with transaction.atomic():
+            models.Game.objects.all().delete()
+            models.Game.objects.bulk_create(games.values(), batch_size=500)
+        catalog.catalog_changed()
+
+        self.stdout.write('Loaded {} games'.format(len(games)))
+        if skipped:
+            self.stderr.write('Skipped {} games without an ID or name'.format(skipped))
+
+    @staticmethod
+    def parse_game(item):
+        """Build a game from a Speedrun.com game object.
+
+        Args:
+            item (dict): Game object from the Speedrun.com API.
+
+        Returns:
+            submissions.models.Game: Unsaved game, or None if the object doesn't have an ID and name.
+
+        """
+        names = item.get('names') if isinstance(item, dict) else None
+        if not isinstance(names, dict) or not item.get('id') or not names.get('international'):
+            return None
+
+        # Use the first platform the game was released on, with a shorter name if we have one for it.
+        platforms = item.get('platforms')
+        platforms = platforms.get('data', []) if isinstance(platforms, dict) else []
+        platforms = sorted((p for p in platforms if isinstance(p, dict)), key=lambda p: p.get('released') or 0)
+        platform = (platforms[0].get('name') or '') if platforms else ''
+
+        release_date = str(item.get('release-date') or '')
+        return models.Game(
+            src_id=str(item['id']),
+            name=str(names['international']),
+            abbreviation=str(item.get('abbreviation') or ''),
+            platform=catalog.PLATFORM_MAPPING.get(platform, platform),
+            release_year=release_date.split('-')[0] or str(item.get('released') or ''),
+            twitch_name=str(names.get('twitch') or ''),
+        )
@@ -0,0 +1,32 @@
+"""Rebuild the running totals for events from scratch."""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from submissions import models
+
+
+class Command(BaseCommand):
+    help = ('Count the submission, category and availability totals for events from scratch, to repair them if they '
+            'ever drift from the data, e.g. after editing the database by hand.  Archived events are skipped, since '
+            'their totals are all that is left of their data in the database.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_ids', nargs='*', type=int,
+                            help='IDs of events to rebuild.  Defaults to all events not archived.')
+
+    def handle(self, *args, **options):
+        events = models.Event.objects.filter(archive__isnull=True)
+        if options['event_ids']:
+            events = events.filter(pk__in=options['event_ids'])
+
+        for event in events:
+            with transaction.atomic():
+                before = models.EventStats.objects.filter(event=event).values().first()
+                stats = models.EventStats.rebuild(event.pk)
+            after = models.EventStats.objects.filter(event=event).values().first()
+            drift = {field: (before[field], value) for field, value in after.items()
+                     if before is not None and before[field] != value}
+            self.stdout.write('{}: {} submissions, {} runners, {} categories{}'.format(
+                event, stats.submissions, stats.runners, stats.categories,
+                ''.join(', {} was {} now {}'.format(field, *values) for field, values in drift.items())))
@@ -0,0 +1,34 @@
+"""Put an archived event's submissions and availability back in the database."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from submissions import archive, models
+
+
+class Command(BaseCommand):
+    help = ('Load the submissions, categories and availability of an event archived with archive_events back into the '
+            'database and remove its archive file.  Fails without changing anything if the archive has records for '
+            'users that have since been deleted, unless --skip-missing-users is given.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_id', type=int, help='ID of the archived event.')
+        parser.add_argument('--skip-missing-users', action='store_true',
+                            help='Restore everything else, keeping the archive file since it still has the skipped '
+                                 'records.')
+
+    def handle(self, *args, **options):
+        try:
+            event_archive = models.EventArchive.objects.select_related('event').get(event=options['event_id'])
+        except models.EventArchive.DoesNotExist:
+            raise CommandError('Event {} is not archived'.format(options['event_id']))
+
+        event = event_archive.event
+        try:
+            counts = archive.restore_event(event_archive, options['skip_missing_users'])
+        except archive.ArchiveError as e:
+            raise CommandError(str(e))
+        self.stdout.write('Restored {}: {submissions} submissions, {categories} categories, {availabilities} '
+                          'availabilities'.format(event, **counts))
+        if counts['skipped']:
+            self.stderr.write('Skipped {} records for users that no longer exist, kept {}'.format(
+                counts['skipped'], event_archive.path))
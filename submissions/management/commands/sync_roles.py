@@ -0,0 +1,17 @@
+"""Sync roles for every Twitch user from the MARATHON_ADMINS and MARATHON_SUPERUSERS settings."""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from submissions import roles
+
+
+class Command(BaseCommand):
+    help = ('Give every Twitch user the staff, superuser and event admin roles they should have from the '
+            'MARATHON_ADMINS and MARATHON_SUPERUSERS settings.  Run this when deploying changes to the lists.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            counts = roles.sync_roles()
+        self.stdout.write('Updated {updated} users, added {added} and removed {removed} event admin '
+                          'permissions'.format(**counts))
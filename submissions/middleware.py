@@ -0,0 +1,196 @@
+"""Request timing middleware for finding slow pages in production."""
+
+import collections
+import contextlib
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+slow_logger = logging.getLogger(__name__ + '.slow')
+
+# Default number of seconds after which a request is logged as slow, if SLOW_REQUEST_THRESHOLD isn't set.
+DEFAULT_SLOW_REQUEST_THRESHOLD = 1.0
+
+# Default level every request's timings are logged at, if REQUEST_LOG_LEVEL isn't set.
+DEFAULT_REQUEST_LOG_LEVEL = 'INFO'
+
+# Number of the most repeated SQL statements to include when logging a slow request.
+SLOW_REQUEST_TOP_QUERIES = 5
+
+
+class RequestTimings:
+    """Timings collected over a single request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_time = 0.0
+        self.template_started = None
+        self.template_time = 0.0
+        self.db_time = 0.0
+        self.total_time = None
+        self.queries = collections.Counter()
+        self.query_times = collections.Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper that counts and times every query."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.db_time += elapsed
+            # Statements still have their parameter placeholders here, so repeats of the same query group together.
+            self.queries[sql] += 1
+            self.query_times[sql] += elapsed
+
+    @property
+    def query_count(self):
+        return sum(self.queries.values())
+
+    def end_view(self):
+        """Record the end of the view, if it's still running."""
+        if self.view_started is not None:
+            self.view_time = time.perf_counter() - self.view_started
+            self.view_started = None
+
+    def finish(self):
+        """Record the end of the request."""
+        self.end_view()
+        self.total_time = time.perf_counter() - self.started
+
+    @contextlib.contextmanager
+    def capture_queries(self):
+        """Count and time the queries on every database connection while in the block."""
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield
+
+    def server_timing(self):
+        """
+        Returns:
+            str: Timings as a Server-Timing header value.
+
+        """
+        return ', '.join([
+            'db;dur={:.1f};desc="{} queries"'.format(self.db_time * 1000, self.query_count),
+            'view;dur={:.1f}'.format(self.view_time * 1000),
+            'template;dur={:.1f}'.format(self.template_time * 1000),
+            'total;dur={:.1f}'.format(self.total_time * 1000),
+        ])
+
+    def top_queries(self, count):
+        """
+        Args:
+            count (int): Maximum number of statements to get.
+
+        Returns:
+            list[tuple[str|int|float]]: Tuples (SQL, times run, total seconds) for the statements run the most.
+
+        """
+        return [(sql, times, self.query_times[sql]) for sql, times in self.queries.most_common(count)]
+
+
+class RequestTimingMiddleware:
+    """Time each request's queries, database time, view and template rendering.
+
+    The timings are logged at settings.REQUEST_LOG_LEVEL as a single line of key=value pairs through the submissions
+    logger, and requests slower than settings.SLOW_REQUEST_THRESHOLD seconds are logged as warnings along with the SQL
+    statements they ran most.  Staff users, or anyone in debug mode, also get them back in a Server-Timing header where
+    browser dev tools can show them.  The header isn't sent to everyone since it tells how much database work each
+    page does.
+
+    Streaming responses only generate their body as it's sent, after the middleware returns, so they're timed until
+    the body is finished and don't get the header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_threshold = getattr(settings, 'SLOW_REQUEST_THRESHOLD', DEFAULT_SLOW_REQUEST_THRESHOLD)
+        self.log_level = logging.getLevelName(getattr(settings, 'REQUEST_LOG_LEVEL', DEFAULT_REQUEST_LOG_LEVEL))
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        request.timings = timings
+
+        with timings.capture_queries():
+            response = self.get_response(request)
+        timings.end_view()
+
+        if response.streaming:
+            response.streaming_content = self.timed_content(request, response, timings, response.streaming_content)
+            return response
+
+        timings.finish()
+        if settings.DEBUG or getattr(request, 'user', None) and request.user.is_staff:
+            response['Server-Timing'] = timings.server_timing()
+        self.log(request, response, timings)
+        return response
+
+    def timed_content(self, request, response, timings, content):
+        """Keep timing a streaming response while its body is generated, and log it once it's done.
+
+        Args:
+            request (django.http.HttpRequest): Request that was timed.
+            response (django.http.StreamingHttpResponse): Response for the request.
+            timings (RequestTimings): Timings for the request so far.
+            content (iterable[bytes]): Body of the response.
+
+        Yields:
+            bytes: Chunks of the response body.
+
+        """
+        try:
+            with timings.capture_queries():
+                yield from content
+        finally:
+            timings.finish()
+            self.log(request, response, timings)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.timings.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        """Template responses are rendered after the view returns, so time the rendering separately."""
+        timings = request.timings
+        timings.end_view()
+        timings.template_started = time.perf_counter()
+
+        def rendered(response):
+            timings.template_time = time.perf_counter() - timings.template_started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def log(self, request, response, timings):
+        """Log the timings for a request, and the most repeated SQL statements if it was slow.
+
+        Args:
+            request (django.http.HttpRequest): Request that was timed.
+            response (django.http.HttpResponse): Response for the request.
+            timings (RequestTimings): Finished timings for the request.
+
+        """
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'user': request.user.pk if getattr(request, 'user', None) and request.user.is_authenticated else None,
+            'total_ms': round(timings.total_time * 1000, 1),
+            'view_ms': round(timings.view_time * 1000, 1),
+            'template_ms': round(timings.template_time * 1000, 1),
+            'db_ms': round(timings.db_time * 1000, 1),
+            'queries': timings.query_count,
+        }
+        message = ' '.join('{}={}'.format(key, value) for key, value in fields.items())
+        logger.log(self.log_level, 'request %s', message, extra={'timings': fields})
+
+        if timings.total_time > self.slow_threshold:
+            top_queries = timings.top_queries(SLOW_REQUEST_TOP_QUERIES)
+            slow_logger.warning('slow request %s\n%s', message, '\n'.join(
+                '  {}x {:.1f}ms: {}'.format(times, seconds * 1000, sql) for sql, times, seconds in top_queries),
+                extra={'timings': fields, 'top_queries': top_queries})
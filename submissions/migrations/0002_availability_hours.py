@@ -0,0 +1,65 @@
+# Generated by Django 3.0.7 on 2026-10-17 12:07
+
+import datetime
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.timezone import get_current_timezone
+import django.db.models.deletion
+
+ONE_HOUR = datetime.timedelta(hours=1)
+
+
+def build_availability_hours(apps, schema_editor):
+    """Build availability bitmaps from the existing availability rows.  The bitmap code is copied here as it was when
+    this migration was written, so later changes to submissions.availability don't change what this migration does.
+    """
+    Availability = apps.get_model('submissions', 'Availability')
+    AvailabilityHours = apps.get_model('submissions', 'AvailabilityHours')
+
+    intervals = {}
+    for availability in Availability.objects.select_related('event').order_by('user', 'event', 'start_time'):
+        key = (availability.user_id, availability.event)
+        intervals.setdefault(key, []).append((availability.start_time, availability.duration))
+
+    rows = []
+    for (user_id, event), user_intervals in intervals.items():
+        start_time = event.start_date.astimezone(get_current_timezone()).replace(minute=0, second=0, microsecond=0)
+        hours = max(0, -int(-(event.end_date - start_time).total_seconds() // ONE_HOUR.total_seconds()))
+        bits = 0
+        for interval_start, duration in user_intervals:
+            first = max(0, int((interval_start - start_time) // ONE_HOUR))
+            last = min(hours, -int(-(interval_start + duration - start_time) // ONE_HOUR))
+            if last > first:
+                bits |= ((1 << (last - first)) - 1) << first
+        rows.append(AvailabilityHours(user_id=user_id, event=event, start_time=start_time, hours=hours,
+                                      bitmap_data=bits.to_bytes((hours + 7) // 8, 'little')))
+    AvailabilityHours.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('submissions', '0001_squashed_0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AvailabilityHours',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_time', models.DateTimeField(help_text='Start of the first hour in the bitmap')),
+                ('hours', models.PositiveIntegerField(help_text='Number of hours in the bitmap')),
+                ('bitmap_data', models.BinaryField()),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='submissions.Event')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability_hours', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Availability Hours',
+                'verbose_name_plural': 'Availability Hours',
+                'unique_together': {('user', 'event')},
+            },
+        ),
+        migrations.RunPython(build_availability_hours, migrations.RunPython.noop),
+    ]
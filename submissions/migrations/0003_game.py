@@ -0,0 +1,28 @@
+# Generated by Django 3.0.7 on 2026-10-17 12:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0002_availability_hours'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Game',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('src_id', models.CharField(max_length=100, unique=True, verbose_name='Speedrun.com ID')),
+                ('name', models.CharField(max_length=255)),
+                ('abbreviation', models.CharField(blank=True, max_length=100)),
+                ('platform', models.CharField(blank=True, max_length=100)),
+                ('release_year', models.CharField(blank=True, max_length=100, verbose_name='Release Year')),
+                ('twitch_name', models.CharField(blank=True, max_length=255, verbose_name='Twitch Game Name')),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+    ]
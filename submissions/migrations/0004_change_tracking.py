@@ -0,0 +1,52 @@
+# Generated by Django 3.0.7 on 2026-10-17 12:40
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0003_game'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='changed_at',
+            field=models.DateTimeField(auto_now=True, help_text='Last time the event or any submission data for it changed', verbose_name='Last Changed'),
+        ),
+        migrations.AddField(
+            model_name='availability',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='Created'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='availability',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated'),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='Created'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated'),
+        ),
+        migrations.AddField(
+            model_name='submissioncategory',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='Created'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='submissioncategory',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 3.0.7 on 2026-10-17 12:25
+
+from django.db import migrations, models
+
+# Twitch auth lookup for a user.  The social auth table belongs to another app, so the index is added to it directly,
+# through the schema editor so the SQL suits each database.
+SOCIAL_AUTH_INDEX = models.Index(fields=['user', 'provider'], name='social_auth_user_provider_idx')
+
+
+def add_social_auth_index(apps, schema_editor):
+    schema_editor.add_index(apps.get_model('social_django', 'UserSocialAuth'), SOCIAL_AUTH_INDEX)
+
+
+def remove_social_auth_index(apps, schema_editor):
+    schema_editor.remove_index(apps.get_model('social_django', 'UserSocialAuth'), SOCIAL_AUTH_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0004_change_tracking'),
+        ('social_django', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='availability',
+            index=models.Index(fields=['user', 'event', 'start_time'], name='availability_user_event_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['active', 'end_date'], name='event_active_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['event', 'user', 'game'], name='submission_event_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['event', 'game'], name='submission_event_game_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submissioncategory',
+            index=models.Index(fields=['game', 'status'], name='category_game_status_idx'),
+        ),
+        migrations.RunPython(add_social_auth_index, remove_social_auth_index),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 3.0.7 on 2026-10-17 12:52
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# Copy of the game key rules from submissions.game_names when this migration was written, so later changes to them
+# don't change what this migration does.
+ROMAN_NUMERALS = {
+    'ii': '2', 'iii': '3', 'iv': '4', 'v': '5', 'vi': '6', 'vii': '7', 'viii': '8', 'ix': '9', 'xi': '11', 'xii': '12',
+    'xiii': '13', 'xiv': '14', 'xv': '15', 'xvi': '16', 'xvii': '17', 'xviii': '18', 'xix': '19', 'xx': '20',
+}
+
+
+def game_key(name):
+    text = unicodedata.normalize('NFKD', name.replace('&', ' and ').casefold())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    words = re.findall(r'\w+', text)
+    if len(words) > 1 and words[0] == 'the':
+        words = words[1:]
+    return ' '.join(ROMAN_NUMERALS.get(word, word) for word in words)[:100].rstrip()
+
+
+def set_game_keys(apps, schema_editor):
+    """Set the game key for existing submissions."""
+    Submission = apps.get_model('submissions', 'Submission')
+
+    submissions = list(Submission.objects.only('game'))
+    for submission in submissions:
+        submission.game_key = game_key(submission.game)
+    Submission.objects.bulk_update(submissions, ['game_key'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0005_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='game_key',
+            field=models.CharField(default='', editable=False, help_text='Normalized game name for matching different spellings of the same game', max_length=100, verbose_name='Game Key'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(set_game_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['event', 'game_key', 'user'], name='submission_event_key_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.0.7 on 2026-10-17 13:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0006_game_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventStats',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='submissions.Event')),
+                ('submissions', models.PositiveIntegerField(default=0, verbose_name='Submissions')),
+                ('runners', models.PositiveIntegerField(default=0, help_text='Number of runners with at least one submission', verbose_name='Runners')),
+                ('pending_categories', models.PositiveIntegerField(default=0, verbose_name='Pending Categories')),
+                ('declined_categories', models.PositiveIntegerField(default=0, verbose_name='Declined Categories')),
+                ('accepted_categories', models.PositiveIntegerField(default=0, verbose_name='Accepted Categories')),
+                ('accepted_seconds', models.PositiveIntegerField(default=0, help_text='Total estimate of accepted categories in seconds', verbose_name='Accepted Estimate Seconds')),
+                ('available_runners', models.PositiveIntegerField(default=0, help_text='Number of runners with any availability', verbose_name='Available Runners')),
+            ],
+            options={
+                'verbose_name': 'Event Stats',
+                'verbose_name_plural': 'Event Stats',
+            },
+        ),
+    ]
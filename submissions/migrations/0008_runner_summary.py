@@ -0,0 +1,32 @@
+# Generated by Django 3.0.7 on 2026-10-17 13:40
+
+import datetime
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('submissions', '0007_event_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RunnerSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('longest_estimate', models.DurationField(default=datetime.timedelta, help_text='Longest estimate of any category the runner submitted', verbose_name='Longest Estimate')),
+                ('longest_availability', models.DurationField(default=datetime.timedelta, help_text='Longest block of hours the runner is available', verbose_name='Longest Availability')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='submissions.Event')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='runner_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Runner Summary',
+                'verbose_name_plural': 'Runner Summaries',
+                'unique_together': {('user', 'event')},
+            },
+        ),
+    ]
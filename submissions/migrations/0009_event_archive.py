@@ -0,0 +1,29 @@
+# Generated by Django 3.0.7 on 2026-10-17 14:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0008_runner_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventArchive',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archive', serialize=False, to='submissions.Event')),
+                ('path', models.CharField(max_length=255, verbose_name='Archive File')),
+                ('size', models.PositiveIntegerField(default=0, help_text='Size of the file in bytes', verbose_name='Size')),
+                ('availabilities', models.PositiveIntegerField(default=0, help_text='Number of availability windows archived', verbose_name='Availabilities')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Archived')),
+            ],
+            options={
+                'verbose_name': 'Event Archive',
+                'verbose_name_plural': 'Event Archives',
+                'ordering': ['-event__start_date'],
+            },
+        ),
+    ]
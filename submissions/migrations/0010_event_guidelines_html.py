@@ -0,0 +1,31 @@
+# Generated by Django 3.0.7 on 2026-10-17 14:30
+
+from django.db import migrations, models
+import markdown2
+
+
+def render_event_guidelines(apps, schema_editor):
+    """Render the guidelines for existing events, the same way as Event.save() did when this migration was written."""
+    Event = apps.get_model('submissions', 'Event')
+
+    events = list(Event.objects.only('guidelines'))
+    for event in events:
+        event.guidelines_html = markdown2.markdown(event.guidelines, extras=['fenced-code-blocks', 'tables'],
+                                                   safe_mode='escape')
+    Event.objects.bulk_update(events, ['guidelines_html'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0009_event_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='guidelines_html',
+            field=models.TextField(blank=True, editable=False, help_text='Guidelines rendered to HTML when the event is saved', verbose_name='Rendered Guidelines'),
+        ),
+        migrations.RunPython(render_event_guidelines, migrations.RunPython.noop),
+    ]
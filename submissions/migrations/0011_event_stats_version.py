@@ -0,0 +1,23 @@
+# Generated by Django 3.0.7 on 2026-10-17 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0010_event_guidelines_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventstats',
+            name='version',
+            field=models.PositiveIntegerField(default=0, help_text='Bumped every time any submission data for the event changes', verbose_name='Version'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='changed_at',
+            field=models.DateTimeField(auto_now=True, help_text='Last time the event settings changed', verbose_name='Last Changed'),
+        ),
+    ]
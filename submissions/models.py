@@ -1,11 +1,22 @@
+import datetime
+import uuid
+
 from django.conf import settings
+from django.core.cache import cache
 from django.core.validators import MinValueValidator
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import models, router, transaction
+from django.db.models import Case, Count, Max, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.timezone import get_current_timezone
 from django.utils.translation import gettext as _
+import markdown2
+from social_django.models import UserSocialAuth
+
+from submissions.availability import ONE_HOUR, HourBitmap, event_hour_count, event_start_hour
+from submissions.game_names import GAME_KEY_LENGTH, game_key
 
 
 class Event(models.Model):
@@ -37,23 +48,103 @@ class Event(models.Model):
     )
     guidelines = models.TextField(verbose_name=_('Submission Guidelines'),
                                   help_text=_('Supports Markdown text formatting'))
+    guidelines_html = models.TextField(editable=False, blank=True, verbose_name=_('Rendered Guidelines'),
+                                       help_text=_('Guidelines rendered to HTML when the event is saved'))
+    changed_at = models.DateTimeField(auto_now=True, verbose_name=_('Last Changed'),
+                                      help_text=_('Last time the event settings changed'))
 
     class Meta:
         app_label = 'submissions'
         permissions = [('is_event_admin', 'Is event admin')]
         ordering = ['-start_date', '-end_date', 'name']
+        indexes = [
+            # Current event lookup.
+            models.Index(fields=['active', 'end_date'], name='event_active_end_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Render the guidelines once here rather than on every view of the home page.
+        self.guidelines_html = render_guidelines(self.guidelines)
+        if kwargs.get('update_fields') is not None and 'guidelines' in kwargs['update_fields']:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'guidelines_html'}
+        super().save(*args, **kwargs)
+
     @classmethod
     def get_current_event(cls):
-        """Get the next active event that hasn't ended yet.  If there is no such event, use the last finished one."""
-        event = cls.objects.filter(active=True, end_date__gt=timezone.now()).first()
-        if not event:
+        """Get the next active event that hasn't ended yet.  If there is no such event, use the last finished one.
+
+        The result is kept in the cache until the event ends or any event is saved or deleted, since every page view
+        needs it.  "No event" is cached as False so it doesn't get looked up again on every request either.
+        """
+        event = cache.get(CURRENT_EVENT_CACHE_KEY)
+        if event is not None:
+            return event or None
+
+        now = timezone.now()
+        event = cls.objects.filter(active=True, end_date__gt=now).first()
+        if event:
+            # Stop caching once the event is over so the fallback below gets picked up.
+            timeout = min((event.end_date - now).total_seconds(), CURRENT_EVENT_CACHE_TIMEOUT)
+        else:
             event = cls.objects.filter(active=True).last()
+            timeout = CURRENT_EVENT_CACHE_TIMEOUT
+
+        cache.set(CURRENT_EVENT_CACHE_KEY, event or False, timeout)
         return event
 
+    @classmethod
+    def mark_changed(cls, **filters):
+        """Record that submission data for events changed, so pages showing it know to render again.
+
+        This bumps the version in the events' stats rather than touching the events themselves, so the cached current
+        event stays valid and submission changes don't have to lock the event row.
+
+        Args:
+            **filters: Lookups for the events that changed, e.g. pk=1 or submission__user=user.
+
+        """
+        EventStats.objects.filter(event__in=cls.objects.filter(**filters).values('pk')).update(
+            version=models.F('version') + 1)
+
+    @classmethod
+    def clear_current_event_cache(cls):
+        """Clear the cached current event so the next lookup goes back to the database."""
+        cache.delete(CURRENT_EVENT_CACHE_KEY)
+
+
+# Markdown extras for event guidelines, the same as the home page used when it rendered them itself.
+GUIDELINES_MARKDOWN_EXTRAS = ['fenced-code-blocks', 'tables']
+
+
+def render_guidelines(guidelines):
+    """Render event guidelines to HTML that's safe to show as is.  Any raw HTML in the Markdown is escaped rather than
+    passed through, and links to javascript: and other unsafe URLs are dropped.
+
+    Args:
+        guidelines (str): Event guidelines in Markdown.
+
+    Returns:
+        str: Guidelines rendered to HTML.
+
+    """
+    return markdown2.markdown(guidelines, extras=GUIDELINES_MARKDOWN_EXTRAS, safe_mode='escape')
+
+
+# Cache key and maximum cache time in seconds for the current event lookup.  The timeout is capped so that sites using
+# a per-process cache backend don't serve a stale event for long after it's changed in another process.
+CURRENT_EVENT_CACHE_KEY = 'submissions:current_event'
+CURRENT_EVENT_CACHE_TIMEOUT = 60 * 10
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def clear_current_event(sender, **kwargs):
+    """Any event change can affect which event is current, e.g. the settings page or admin list edits."""
+    Event.clear_current_event_cache()
+
 
 class Profile(models.Model):
     """Extra user profile information for our submissions app."""
@@ -66,6 +157,14 @@ class Profile(models.Model):
     def __str__(self):
         return str(self.user)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the pronouns as loaded, since the profile is saved along with the user even when only the last login
+        time changed."""
+        instance = super().from_db(db, field_names, values)
+        instance.saved_pronouns = instance.__dict__.get('pronouns')
+        return instance
+
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -78,6 +177,49 @@ def save_user_profile(sender, instance, **kwargs):
     instance.profile.save()
 
 
+# Parts of a user's Twitch extra data shown on the pages.  Only these are kept in the session, not the access token.
+TWITCH_DISPLAY_FIELDS = ['name', 'display_name', 'logo']
+
+# Session key for a snapshot of the logged in user's Twitch display data.
+TWITCH_DATA_SESSION_KEY = 'submissions_twitch_data'
+
+
+def twitch_display_data(extra_data):
+    """
+    Args:
+        extra_data (dict): Twitch extra data from a user's social auth record.
+
+    Returns:
+        dict: Only the parts of the Twitch data shown on the pages.
+
+    """
+    extra_data = extra_data or {}
+    return {field: extra_data.get(field) for field in TWITCH_DISPLAY_FIELDS}
+
+
+def get_twitch_data(request):
+    """Get the Twitch display data for the logged in user, from their session if possible.
+
+    The snapshot is normally stored by the login pipeline, which is also the only time Twitch data changes.  Sessions
+    from before the pipeline step, or that were flushed when switching users, fall back to the database once.
+
+    Args:
+        request (django.http.HttpRequest): Request from a logged in user.
+
+    Returns:
+        dict: Twitch name, display name and logo for the user, or None if the user doesn't have any Twitch data.
+
+    """
+    twitch_data = request.session.get(TWITCH_DATA_SESSION_KEY)
+    if twitch_data is None:
+        twitch_user = request.user.social_auth.filter(provider='twitch').first()
+        if not twitch_user or not twitch_user.extra_data:
+            return None
+        twitch_data = twitch_display_data(twitch_user.extra_data)
+        request.session[TWITCH_DATA_SESSION_KEY] = twitch_data
+    return twitch_data
+
+
 class Availability(models.Model):
     """Availability time range for an event for a user.  The set of these make up a user's availability schedule."""
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='availabilities')
@@ -85,12 +227,18 @@ class Availability(models.Model):
     start_time = models.DateTimeField()
     duration = models.DurationField(verbose_name='Duration Available',
                                     help_text='How long the runner is available for at this time')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Created'))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_('Updated'))
 
     class Meta:
         app_label = 'submissions'
         verbose_name = 'Availability'
         verbose_name_plural = 'Availabilities'
         ordering = ['start_time', 'duration']
+        indexes = [
+            # A user's availability for an event, in order.
+            models.Index(fields=['user', 'event', 'start_time'], name='availability_user_event_idx'),
+        ]
 
     @property
     def end_time(self):
@@ -102,35 +250,248 @@ class Availability(models.Model):
         """Number of hours in the duration."""
         return int(self.duration.total_seconds() / 60 / 60)
 
+    @classmethod
+    def set_user_availability(cls, user, event, availabilities):
+        """Replace a user's availability for an event, only writing the blocks that actually changed.
+
+        Availability for other events is left alone.  Blocks that no longer exist are removed with a single delete and
+        new ones are added with a single bulk insert.
+
+        Args:
+            user (django.contrib.auth.models.User): User to update availability for.
+            event (Event): Event the availability is for.
+            availabilities (list[tuple[datetime.datetime|datetime.timedelta]]): List of tuples (start time,
+                availability duration) making up the full availability for the event.
+
+        """
+        selected = {(start_time, duration) for start_time, duration in availabilities}
+        existing = {(a.start_time, a.duration): a.pk for a in cls.objects.filter(user=user, event=event)}
+
+        removed = [pk for block, pk in existing.items() if block not in selected]
+        if removed:
+            cls.objects.filter(pk__in=removed).delete()
+
+        added = sorted(selected.difference(existing))
+        if added:
+            cls.objects.bulk_create([cls(user=user, event=event, start_time=start_time, duration=duration)
+                                     for start_time, duration in added])
+
+        # The bulk insert doesn't send save signals, so the user's cached rows have to be cleared here.
+        if added:
+            clear_user_fragments(user.pk)
+            Event.mark_changed(pk=event.pk)
+
+        # Keep the compact hour bitmap in sync with the rows.
+        AvailabilityHours.set_user_hours(user, event, HourBitmap.from_intervals(
+            event_start_hour(event), event_hour_count(event), selected))
+
     def __str__(self):
         return '{} to {}'.format(self.start_time.astimezone(get_current_timezone()).strftime('%A, %B %d %I:%M %p'),
                                  self.end_time.astimezone(get_current_timezone()).strftime('%A, %B %d %I:%M %p'))
 
 
+class AvailabilityHours(models.Model):
+    """Compact copy of a user's availability for an event, with one bit per hour starting from the first hour of the
+    event.  This is kept in sync with the Availability rows by Availability.set_user_availability().
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='availability_hours')
+    event = models.ForeignKey(Event, on_delete=models.CASCADE)
+    start_time = models.DateTimeField(help_text='Start of the first hour in the bitmap')
+    hours = models.PositiveIntegerField(help_text='Number of hours in the bitmap')
+    bitmap_data = models.BinaryField()
+
+    class Meta:
+        app_label = 'submissions'
+        verbose_name = 'Availability Hours'
+        verbose_name_plural = 'Availability Hours'
+        unique_together = ['user', 'event']
+
+    def __str__(self):
+        return '{} - {}'.format(self.user, self.event)
+
+    @property
+    def bitmap(self):
+        """
+        Returns:
+            submissions.availability.HourBitmap: Availability bitmap for the stored bits.
+
+        """
+        return HourBitmap.from_bytes(self.start_time, self.hours, self.bitmap_data)
+
+    @classmethod
+    def set_user_hours(cls, user, event, bitmap):
+        """Store the availability bitmap for a user and event.
+
+        Args:
+            user (django.contrib.auth.models.User): User the availability is for.
+            event (Event): Event the availability is for.
+            bitmap (submissions.availability.HourBitmap): Availability bitmap to store.
+
+        """
+        existing = cls.objects.filter(user=user, event=event).values_list('bitmap_data', flat=True).first()
+        was_available = existing is not None and any(bytes(existing))
+        cls.objects.update_or_create(user=user, event=event, defaults={
+            'start_time': bitmap.start_time,
+            'hours': bitmap.hours,
+            'bitmap_data': bitmap.to_bytes(),
+        })
+        if bool(bitmap) != was_available:
+            EventStats.add(event.pk, available_runners=1 if bitmap else -1)
+        RunnerSummary.objects.filter(user=user, event=event).update(
+            longest_availability=bitmap.longest_block() * ONE_HOUR)
+
+    @classmethod
+    def rebuild_user_hours(cls, user, event):
+        """Rebuild the availability bitmap for a user and event from their Availability rows, for when the rows have
+        been changed directly, e.g. in the Django admin.
+
+        Args:
+            user (django.contrib.auth.models.User): User the availability is for.
+            event (Event): Event the availability is for.
+
+        """
+        intervals = Availability.objects.filter(user=user, event=event).values_list('start_time', 'duration')
+        cls.set_user_hours(user, event, HourBitmap.from_intervals(
+            event_start_hour(event), event_hour_count(event), intervals))
+
+
+class RunnerSummary(models.Model):
+    """Longest estimate and longest availability block for a runner in an event, kept up to date as they change so
+    submit and profile forms can check runs fit the runner's availability without loading all of either.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='runner_summaries')
+    event = models.ForeignKey(Event, on_delete=models.CASCADE)
+    longest_estimate = models.DurationField(default=datetime.timedelta, verbose_name=_('Longest Estimate'),
+                                            help_text=_('Longest estimate of any category the runner submitted'))
+    longest_availability = models.DurationField(default=datetime.timedelta, verbose_name=_('Longest Availability'),
+                                                help_text=_('Longest block of hours the runner is available'))
+
+    class Meta:
+        app_label = 'submissions'
+        verbose_name = 'Runner Summary'
+        verbose_name_plural = 'Runner Summaries'
+        unique_together = ['user', 'event']
+
+    def __str__(self):
+        return '{} - {}'.format(self.user, self.event)
+
+    @staticmethod
+    def longest_estimate_query(user, event):
+        """
+        Args:
+            user (django.contrib.auth.models.User|django.db.models.Expression): Runner, or an expression for them.
+            event (Event|django.db.models.Expression): Event, or an expression for it.
+
+        Returns:
+            django.db.models.Expression: Longest estimate of the runner's categories in the event, or 0 if none.
+
+        """
+        return Coalesce(Subquery(SubmissionCategory.objects.filter(game__user=user, game__event=event).order_by(
+            '-estimate').values('estimate')[:1]), Value(datetime.timedelta(), output_field=models.DurationField()))
+
+    @classmethod
+    def update_longest_estimate(cls, user_id, event_id):
+        """Work out the longest estimate again after a runner's categories change, in a single UPDATE.
+
+        Args:
+            user_id (int): ID of the runner.
+            event_id (int): ID of the event.
+
+        """
+        cls.objects.filter(user=user_id, event=event_id).update(
+            longest_estimate=cls.longest_estimate_query(OuterRef('user'), OuterRef('event')))
+
+    @classmethod
+    def get_for(cls, user, event):
+        """
+        Args:
+            user (django.contrib.auth.models.User): Runner.
+            event (Event): Event.
+
+        Returns:
+            RunnerSummary: Summary for the runner in the event, built now if there wasn't one yet.
+
+        """
+        summary = cls.objects.filter(user=user, event=event).first()
+        if summary is None:
+            availability_hours = AvailabilityHours.objects.filter(user=user, event=event).first()
+            summary, _ = cls.objects.get_or_create(user=user, event=event, defaults={
+                'longest_estimate': SubmissionCategory.objects.filter(game__user=user, game__event=event).aggregate(
+                    longest=Max('estimate'))['longest'] or datetime.timedelta(),
+                'longest_availability': (availability_hours.bitmap.longest_block() * ONE_HOUR if availability_hours
+                                         else datetime.timedelta()),
+            })
+        return summary
+
+
+class SubmissionQuerySet(models.QuerySet):
+    def with_status(self):
+        """Annotate each submission with its rolled up status, computed in the database from its categories.
+
+        Adds ``status_rank`` (2 if any category is accepted, 1 if any is pending, 0 otherwise) for sorting, and
+        ``rolled_up_status`` with the matching status value for filtering.  Submission.status uses the annotation when
+        it's present instead of loading the categories.
+
+        Returns:
+            SubmissionQuerySet: Annotated queryset.
+
+        """
+        statuses = SubmissionCategory.Statuses
+        rank = SubmissionCategory.objects.filter(game=OuterRef('pk')).order_by().values('game').annotate(
+            rank=Max(Case(When(status=statuses.ACCEPTED, then=Value(2)),
+                          When(status=statuses.PENDING, then=Value(1)),
+                          default=Value(0), output_field=models.IntegerField()))).values('rank')
+        return self.annotate(status_rank=Coalesce(Subquery(rank), Value(0))).annotate(rolled_up_status=Case(
+            When(status_rank=2, then=Value(statuses.ACCEPTED)),
+            When(status_rank=1, then=Value(statuses.PENDING)),
+            default=Value(statuses.DECLINED), output_field=models.CharField()))
+
+
 class Submission(models.Model):
     """Base submission info for the game itself."""
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='submissions')
     event = models.ForeignKey(Event, on_delete=models.CASCADE)
     game = models.CharField(max_length=100)
+    game_key = models.CharField(max_length=GAME_KEY_LENGTH, editable=False, verbose_name=_('Game Key'),
+                                help_text=_('Normalized game name for matching different spellings of the same game'))
     platform = models.CharField(max_length=100)
     release_year = models.CharField(max_length=100, verbose_name=_('Release Year'))
     twitch_game = models.CharField(max_length=100, verbose_name=_('Twitch Game Name'),
                                    help_text=_('Game name for the Twitch category setting'))
     description = models.TextField(max_length=1000, blank=True, verbose_name=_('Run Description'))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Created'))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_('Updated'))
+
+    objects = SubmissionQuerySet.as_manager()
 
     class Meta:
         app_label = 'submissions'
         ordering = ['event', 'user', 'game']
+        indexes = [
+            # A user's submissions for an event, and all submissions for an event sorted by game.
+            models.Index(fields=['event', 'user', 'game'], name='submission_event_user_idx'),
+            models.Index(fields=['event', 'game'], name='submission_event_game_idx'),
+            # Submissions of the same game for an event, and whether a user already submitted it.
+            models.Index(fields=['event', 'game_key', 'user'], name='submission_event_key_idx'),
+        ]
 
     def __str__(self):
         return '{} - {} - {}'.format(self.game, self.user, self.event)
 
+    def save(self, *args, **kwargs):
+        self.game_key = game_key(self.game)
+        super().save(*args, **kwargs)
+
     @property
     def status(self):
         """
         Returns:
             str: Status of submission based on status of categories for it.
         """
+        # Use the status computed by the database if this came from SubmissionQuerySet.with_status().
+        if hasattr(self, 'rolled_up_status'):
+            return self.rolled_up_status
+
         categories = self.categories.all()
 
         # If any categories are accepted, the submission is accepted.
@@ -143,6 +504,13 @@ class Submission(models.Model):
         else:
             return SubmissionCategory.Statuses.DECLINED
 
+    def get_status_display(self):
+        """
+        Returns:
+            str: Label of the submission's rolled up status, like the ones Django adds for fields with choices.
+        """
+        return SubmissionCategory.Statuses(self.status).label
+
     @property
     def can_edit(self):
         """
@@ -167,16 +535,31 @@ class SubmissionCategory(models.Model):
     race = models.BooleanField(verbose_name=_('Race/Co-op'), default=False, help_text=_('Is this a race/co-op run?'))
     estimate = models.DurationField()
     video = models.URLField(help_text=_('URL for submission video'))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Created'))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_('Updated'))
 
     class Meta:
         app_label = 'submissions'
         verbose_name = 'Submission Category'
         verbose_name_plural = 'Submission Categories'
         ordering = ['estimate', 'category']
+        indexes = [
+            # Rolled up submission status, which only needs the statuses of a submission's categories.
+            models.Index(fields=['game', 'status'], name='category_game_status_idx'),
+        ]
 
     def __str__(self):
         return '{} - {}'.format(self.category, self.game)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the status and estimate as loaded, so event stats can be adjusted by the difference on save.  If
+        either was deferred the old values aren't known, and the stats are counted again on save instead."""
+        instance = super().from_db(db, field_names, values)
+        if 'status' in field_names and 'estimate' in field_names:
+            instance.stats_values = (instance.status, instance.estimate)
+        return instance
+
     @property
     def can_edit(self):
         """
@@ -185,3 +568,457 @@ class SubmissionCategory(models.Model):
                   event is open for submissions.
         """
         return self.game.event.stage == self.game.event.Stages.OPEN and self.status == self.Statuses.PENDING
+
+    @classmethod
+    def set_statuses(cls, categories, status):
+        """Set the status for many categories with one bulk update.  Bulk updates don't send save signals, so anything
+        that needs to react to status changes has to be done here.
+
+        Args:
+            categories (iterable[SubmissionCategory]): Categories to update.
+            status (str): New status from SubmissionCategory.Statuses.
+
+        Returns:
+            list[SubmissionCategory]: Categories that had their status changed.
+
+        """
+        changed = [category for category in categories if category.status != status]
+        previous = [(category.status, category.estimate) for category in changed]
+        now = timezone.now()
+        for category in changed:
+            category.status = status
+            category.updated_at = now
+            category.stats_values = (category.status, category.estimate)
+        cls.objects.bulk_update(changed, ['status', 'updated_at'])
+
+        if changed:
+            clear_submission_fragments({category.game_id for category in changed})
+            Event.mark_changed(submission__categories__in=changed)
+
+            # Move the categories between status counts, one update per event.
+            event_ids = dict(Submission.objects.filter(pk__in={c.game_id for c in changed}).values_list('pk', 'event'))
+            deltas = {}
+            for category, (old_status, estimate) in zip(changed, previous):
+                event_deltas = deltas.setdefault(event_ids[category.game_id], {})
+                for delta_status, sign in [(old_status, -1), (status, 1)]:
+                    for field, value in EventStats.category_deltas(delta_status, estimate, sign).items():
+                        event_deltas[field] = event_deltas.get(field, 0) + value
+            for event_id, event_deltas in deltas.items():
+                EventStats.add(event_id, **event_deltas)
+        return changed
+
+
+class EventStats(models.Model):
+    """Running totals for an event's submissions, kept up to date as submission data changes so summaries don't have to
+    count everything each time.  The totals are adjusted by signals and by the bulk update methods that skip signals,
+    and can be rebuilt from scratch with the rebuild_event_stats command if they ever drift.
+    """
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    submissions = models.PositiveIntegerField(default=0, verbose_name=_('Submissions'))
+    runners = models.PositiveIntegerField(default=0, verbose_name=_('Runners'),
+                                          help_text=_('Number of runners with at least one submission'))
+    pending_categories = models.PositiveIntegerField(default=0, verbose_name=_('Pending Categories'))
+    declined_categories = models.PositiveIntegerField(default=0, verbose_name=_('Declined Categories'))
+    accepted_categories = models.PositiveIntegerField(default=0, verbose_name=_('Accepted Categories'))
+    # Kept in seconds rather than a DurationField, since not every database can add durations in an update.
+    accepted_seconds = models.PositiveIntegerField(default=0, verbose_name=_('Accepted Estimate Seconds'),
+                                                   help_text=_('Total estimate of accepted categories in seconds'))
+    available_runners = models.PositiveIntegerField(default=0, verbose_name=_('Available Runners'),
+                                                    help_text=_('Number of runners with any availability'))
+    version = models.PositiveIntegerField(default=0, verbose_name=_('Version'),
+                                          help_text=_('Bumped every time any submission data for the event changes'))
+
+    class Meta:
+        app_label = 'submissions'
+        verbose_name = 'Event Stats'
+        verbose_name_plural = 'Event Stats'
+
+    def __str__(self):
+        return str(self.event)
+
+    @property
+    def categories(self):
+        return self.pending_categories + self.declined_categories + self.accepted_categories
+
+    @property
+    def accepted_estimate(self):
+        return datetime.timedelta(seconds=self.accepted_seconds)
+
+    @property
+    def accepted_share(self):
+        """
+        Returns:
+            float: Accepted estimate as a fraction of the event's length.
+
+        """
+        length = self.event.end_date - self.event.start_date
+        return self.accepted_estimate / length if length else 0.0
+
+    @staticmethod
+    def category_deltas(status, estimate, sign):
+        """
+        Args:
+            status (str): Category status from SubmissionCategory.Statuses.
+            estimate (datetime.timedelta): Category estimate.
+            sign (int): 1 to add the category, -1 to remove it.
+
+        Returns:
+            dict: Changes to the totals for adding or removing the category.
+
+        """
+        deltas = {'{}_categories'.format(status.lower()): sign}
+        if status == SubmissionCategory.Statuses.ACCEPTED:
+            deltas['accepted_seconds'] = sign * int(estimate.total_seconds())
+        return deltas
+
+    @classmethod
+    def add(cls, event_id, **deltas):
+        """Adjust the totals for an event in the database.  Events without totals yet are left alone, since
+        get_for_event() counts everything when they're first needed.
+
+        Args:
+            event_id (int): ID of the event.
+            **deltas: Amounts to add to each total, e.g. submissions=1.
+
+        """
+        deltas = {field: value for field, value in deltas.items() if value}
+        if deltas:
+            cls.objects.filter(event_id=event_id).update(**{
+                field: models.F(field) + value for field, value in deltas.items()})
+
+    @classmethod
+    def add_submission(cls, submission):
+        """Count a new submission, and its runner if it's their first one for the event.
+
+        The totals row is locked first, so two first submissions from the same runner at once can't both count the
+        runner: whichever gets the lock second sees the other's submission.  The check only reads the runner's part of
+        the submission index, rather than counting every runner in the event.
+
+        Args:
+            submission (Submission): Newly created submission.
+
+        """
+        with transaction.atomic(using=router.db_for_write(cls)):
+            # Like add(), events without totals yet are counted from scratch when they're first needed.
+            if not cls.objects.select_for_update().filter(event_id=submission.event_id).values_list('pk'):
+                return
+            first = not Submission.objects.filter(event=submission.event_id, user=submission.user_id).exclude(
+                pk=submission.pk).exists()
+            cls.add(submission.event_id, submissions=1, runners=1 if first else 0)
+
+    @classmethod
+    def recount_runners(cls, event_id):
+        """Count runners again after submissions are removed.  Checking whether each one was the runner's last
+        submission can't be done when deleting many at once.  This only reads the event's part of the submission
+        index.
+
+        Args:
+            event_id (int): ID of the event.
+
+        """
+        cls.objects.filter(event_id=event_id).update(runners=Coalesce(Subquery(
+            Submission.objects.filter(event=event_id).order_by().values('event').annotate(
+                count=Count('user', distinct=True)).values('count')[:1]), 0))
+
+    @classmethod
+    def rebuild(cls, event_id):
+        """Count all the totals for an event from scratch.
+
+        Args:
+            event_id (int): ID of the event.
+
+        Returns:
+            EventStats: Rebuilt totals.
+
+        """
+        submissions = Submission.objects.filter(event=event_id)
+        values = submissions.aggregate(submissions=Count('id'), runners=Count('user', distinct=True))
+        for status in SubmissionCategory.Statuses.values:
+            values['{}_categories'.format(status.lower())] = 0
+        for row in SubmissionCategory.objects.filter(game__event=event_id).order_by().values('status').annotate(
+                count=Count('id'), estimate=Sum('estimate')):
+            values['{}_categories'.format(row['status'].lower())] = row['count']
+            if row['status'] == SubmissionCategory.Statuses.ACCEPTED:
+                values['accepted_seconds'] = int(row['estimate'].total_seconds())
+        values.setdefault('accepted_seconds', 0)
+        values['available_runners'] = sum(1 for bitmap_data in AvailabilityHours.objects.filter(
+            event=event_id).values_list('bitmap_data', flat=True) if any(bytes(bitmap_data)))
+
+        stats, _ = cls.objects.update_or_create(event_id=event_id, defaults=values)
+        return stats
+
+    @classmethod
+    def get_for_event(cls, event):
+        """
+        Args:
+            event (Event): Event to get totals for.
+
+        Returns:
+            EventStats: Totals for the event, built now if there weren't any yet.
+
+        """
+        try:
+            return cls.objects.select_related('event').get(event=event)
+        except cls.DoesNotExist:
+            return cls.rebuild(event.pk)
+
+
+class EventArchive(models.Model):
+    """Record of a past event whose submissions and availability were moved out of the database into a compressed
+    archive file by submissions.archive.archive_event().  The event itself and its EventStats totals are kept, so the
+    totals still describe the event after its rows are gone.
+    """
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name='archive')
+    path = models.CharField(max_length=255, verbose_name=_('Archive File'))
+    size = models.PositiveIntegerField(default=0, verbose_name=_('Size'), help_text=_('Size of the file in bytes'))
+    availabilities = models.PositiveIntegerField(default=0, verbose_name=_('Availabilities'),
+                                                 help_text=_('Number of availability windows archived'))
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Archived'))
+
+    class Meta:
+        app_label = 'submissions'
+        verbose_name = 'Event Archive'
+        verbose_name_plural = 'Event Archives'
+        ordering = ['-event__start_date']
+
+    def __str__(self):
+        return str(self.event)
+
+
+class Game(models.Model):
+    """Game in the local catalog used for autocomplete when submitting, loaded from a Speedrun.com data dump."""
+    src_id = models.CharField(max_length=100, unique=True, verbose_name=_('Speedrun.com ID'))
+    name = models.CharField(max_length=255)
+    abbreviation = models.CharField(max_length=100, blank=True)
+    platform = models.CharField(max_length=100, blank=True)
+    release_year = models.CharField(max_length=100, blank=True, verbose_name=_('Release Year'))
+    twitch_name = models.CharField(max_length=255, blank=True, verbose_name=_('Twitch Game Name'))
+
+    class Meta:
+        app_label = 'submissions'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+# Cache keys for the versions of a submission and of a user, formatted with the ID.  Cached template fragments for a
+# submission row include both versions in their key, so clearing a version makes the rows using it render again.
+SUBMISSION_VERSION_CACHE_KEY = 'submissions:submission_version:{}'
+USER_VERSION_CACHE_KEY = 'submissions:user_version:{}'
+
+# How long rendered submission rows are kept in the cache.
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def set_fragment_versions(submissions):
+    """Set a cache_version attribute on each submission to use in the cache key for its rendered row.
+
+    Versions for all submissions and their users are fetched from the cache at once, and new ones are made for any
+    that were cleared since the last time they were rendered.
+
+    Args:
+        submissions (iterable[Submission]): Submissions that are about to be rendered.
+
+    """
+    keys = [(SUBMISSION_VERSION_CACHE_KEY.format(submission.pk), USER_VERSION_CACHE_KEY.format(submission.user_id))
+            for submission in submissions]
+    versions = cache.get_many({key for pair in keys for key in pair})
+
+    missing = {key: uuid.uuid4().hex for pair in keys for key in pair if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+
+    for submission, (submission_key, user_key) in zip(submissions, keys):
+        submission.cache_version = '{}.{}'.format(versions[submission_key], versions[user_key])
+
+
+def clear_submission_fragments(submission_ids):
+    """Clear the versions for submissions so their cached rows render again.
+
+    Args:
+        submission_ids (iterable[int]): IDs of the submissions that changed.
+
+    """
+    cache.delete_many([SUBMISSION_VERSION_CACHE_KEY.format(pk) for pk in submission_ids])
+
+
+def clear_user_fragments(user_id):
+    """Clear the version for a user so the cached rows for all their submissions render again.
+
+    Args:
+        user_id (int): ID of the user that changed.
+
+    """
+    cache.delete(USER_VERSION_CACHE_KEY.format(user_id))
+
+
+@receiver(post_save, sender=Submission)
+@receiver(post_delete, sender=Submission)
+def clear_submission_fragment(sender, instance, **kwargs):
+    clear_submission_fragments([instance.pk])
+
+
+@receiver(post_save, sender=SubmissionCategory)
+@receiver(post_delete, sender=SubmissionCategory)
+def clear_category_fragment(sender, instance, **kwargs):
+    clear_submission_fragments([instance.game_id])
+
+
+@receiver(post_save, sender=Availability)
+@receiver(post_delete, sender=Availability)
+def clear_user_fragment(sender, instance, **kwargs):
+    clear_user_fragments(instance.user_id)
+
+
+@receiver(post_save, sender=Submission)
+@receiver(post_delete, sender=Submission)
+@receiver(post_save, sender=Availability)
+@receiver(post_delete, sender=Availability)
+def mark_event_changed(sender, instance, **kwargs):
+    Event.mark_changed(pk=instance.event_id)
+
+
+@receiver(post_save, sender=SubmissionCategory)
+@receiver(post_delete, sender=SubmissionCategory)
+def mark_category_event_changed(sender, instance, **kwargs):
+    Event.mark_changed(submission=instance.game_id)
+
+
+def twitch_display_values(extra_data):
+    """
+    Args:
+        extra_data (dict): Twitch extra data from a user's social auth record.
+
+    Returns:
+        tuple: The parts of the Twitch data shown next to a runner's submissions.
+
+    """
+    return tuple(twitch_display_data(extra_data).values())
+
+
+@receiver(post_init, sender=UserSocialAuth)
+def remember_twitch_display(sender, instance, **kwargs):
+    """The login pipeline saves the social auth record with a new access token every time, so remember what's shown
+    to tell whether a save changed anything on the pages.
+    """
+    instance.saved_display_values = twitch_display_values(instance.extra_data)
+
+
+@receiver(post_save, sender=Profile)
+def mark_profile_changed(sender, instance, created, **kwargs):
+    if not created and instance.pronouns == getattr(instance, 'saved_pronouns', None):
+        return
+    instance.saved_pronouns = instance.pronouns
+    user_display_changed(instance.user_id)
+
+
+@receiver(post_save, sender=UserSocialAuth)
+def mark_social_auth_changed(sender, instance, created, **kwargs):
+    display_values = twitch_display_values(instance.extra_data)
+    if not created and display_values == instance.saved_display_values:
+        return
+    instance.saved_display_values = display_values
+    user_display_changed(instance.user_id)
+
+
+@receiver(post_delete, sender=Profile)
+@receiver(post_delete, sender=UserSocialAuth)
+def mark_user_deleted(sender, instance, **kwargs):
+    user_display_changed(instance.user_id)
+
+
+def user_display_changed(user_id):
+    """Runner names and pronouns show up next to their submissions, so their cached rows and every event they submitted
+    to have changed.
+
+    Args:
+        user_id (int): ID of the user that changed.
+
+    """
+    clear_user_fragments(user_id)
+    Event.mark_changed(submission__user=user_id)
+
+
+@receiver(post_save, sender=Event)
+def create_event_stats(sender, instance, created, **kwargs):
+    if created:
+        EventStats.objects.get_or_create(event=instance)
+
+
+@receiver(post_save, sender=Submission)
+def add_submission_stats(sender, instance, created, **kwargs):
+    if created:
+        EventStats.add_submission(instance)
+
+
+@receiver(post_delete, sender=Submission)
+def remove_submission_stats(sender, instance, **kwargs):
+    EventStats.add(instance.event_id, submissions=-1)
+    EventStats.recount_runners(instance.event_id)
+
+
+def category_submission_ids(category):
+    """
+    Args:
+        category (SubmissionCategory): Category to get the event and runner for.
+
+    Returns:
+        tuple[int]: IDs of the category's event and runner, or (None, None) if its submission is gone.
+
+    """
+    if SubmissionCategory.game.is_cached(category):
+        return category.game.event_id, category.game.user_id
+    return Submission.objects.filter(pk=category.game_id).values_list('event', 'user').first() or (None, None)
+
+
+@receiver(post_save, sender=SubmissionCategory)
+def update_category_stats(sender, instance, created, **kwargs):
+    new_values = (instance.status, instance.estimate)
+    old_values = None if created else getattr(instance, 'stats_values', None)
+    instance.stats_values = new_values
+    if old_values == new_values:
+        return
+
+    event_id, _ = category_submission_ids(instance)
+    if not created and old_values is None:
+        # Saved from an instance that wasn't loaded from the database, so the old values aren't known.  Count everything
+        # again rather than dropping the totals, which would also lose the event's version.
+        if event_id is not None:
+            EventStats.rebuild(event_id)
+        return
+
+    deltas = EventStats.category_deltas(*new_values, 1)
+    if old_values:
+        for field, value in EventStats.category_deltas(*old_values, -1).items():
+            deltas[field] = deltas.get(field, 0) + value
+    EventStats.add(event_id, **deltas)
+
+
+@receiver(post_delete, sender=SubmissionCategory)
+def remove_category_stats(sender, instance, **kwargs):
+    event_id, _ = category_submission_ids(instance)
+    if event_id is None:
+        return
+    old_values = getattr(instance, 'stats_values', None)
+    if old_values is None and {'status', 'estimate'} & instance.get_deferred_fields():
+        # The row is already gone, so deferred values can't be loaded any more.
+        EventStats.rebuild(event_id)
+    else:
+        old_values = old_values or (instance.status, instance.estimate)
+        EventStats.add(event_id, **EventStats.category_deltas(*old_values, -1))
+
+
+@receiver(post_delete, sender=AvailabilityHours)
+def remove_availability_stats(sender, instance, **kwargs):
+    if any(bytes(instance.bitmap_data)):
+        EventStats.add(instance.event_id, available_runners=-1)
+
+
+@receiver(post_save, sender=SubmissionCategory)
+@receiver(post_delete, sender=SubmissionCategory)
+def update_runner_longest_estimate(sender, instance, **kwargs):
+    event_id, user_id = category_submission_ids(instance)
+    if event_id is not None:
+        RunnerSummary.update_longest_estimate(user_id, event_id)
@@ -0,0 +1,192 @@
+"""Keyset pagination for large querysets.
+
+Offset pagination gets slower the further in you go, since the database has to count past every earlier row.  Keyset
+pagination instead remembers the sort key of the last row shown, and asks for rows after it, which the database can
+answer straight from an index no matter how deep the page is.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """JSON encoder keeping times to the microsecond, since the default rounds them to milliseconds and a cursor for a
+    row with a rounded time would point at the wrong place.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values):
+    """
+    Args:
+        values (list): Sort key values for a row.  Dates and times are stored as ISO 8601 strings, which the database
+            lookups will parse back.
+
+    Returns:
+        str: Opaque URL-safe cursor for the values.
+
+    """
+    data = json.dumps(values, separators=(',', ':'), cls=CursorEncoder)
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, length):
+    """
+    Args:
+        cursor (str): Cursor from encode_cursor().
+        length (int): Number of sort key values expected.
+
+    Returns:
+        list: Sort key values, or None if the cursor is not valid.
+
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(values, list) or len(values) != length:
+        return None
+    return values
+
+
+class KeysetPage:
+    """One page of results from a KeysetPaginator."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        """
+        Args:
+            object_list (list): Objects on this page.
+            next_cursor (str): Cursor for the page after this one, None if this is the last page.
+            previous_cursor (str): Cursor for the page before this one, None if this is the first page.
+
+        """
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """Paginates a queryset in ascending order of a unique sort key, e.g. ('game', 'id')."""
+
+    def __init__(self, queryset, ordering, page_size):
+        """
+        Args:
+            queryset (django.db.models.QuerySet): Queryset to paginate.
+            ordering (list[str]): Field or annotation names making up the sort key.  The last one must be unique,
+                usually 'id'.
+            page_size (int): Number of objects per page.
+
+        """
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.page_size = page_size
+        self.fields = [self._model_field(queryset, field) for field in self.ordering]
+
+    @staticmethod
+    def _model_field(queryset, path):
+        """Get the model field for a sort key field name, following related fields like user__username, or the output
+        field of an annotation on the queryset.
+        """
+        if path in queryset.query.annotations:
+            return queryset.query.annotations[path].output_field
+        model = queryset.model
+        *relations, name = path.split('__')
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.get_field(name)
+
+    def _decode(self, cursor):
+        """Decode a cursor and convert its values to the sort key fields' types, since cursors come from the URL and
+        anything else would fail in the query.
+
+        Returns:
+            list: Sort key values, or None if the cursor is not valid.
+
+        """
+        values = decode_cursor(cursor, len(self.ordering))
+        if values is None:
+            return None
+        try:
+            values = [field.to_python(value) for field, value in zip(self.fields, values)]
+        except (ValidationError, TypeError, ValueError):
+            return None
+        return values if None not in values else None
+
+    def _key(self, obj):
+        """Get the sort key values for an object, following related fields like user__username."""
+        values = []
+        for field in self.ordering:
+            value = obj
+            for attr in field.split('__'):
+                value = getattr(value, attr)
+            values.append(value)
+        return values
+
+    def _filter_after(self, values, reverse=False):
+        """Build a filter for rows that sort after (or before, if reversed) the given key."""
+        lookup = 'lt' if reverse else 'gt'
+        condition = Q()
+        for i, field in enumerate(self.ordering):
+            q = Q(**{'{}__{}'.format(field, lookup): values[i]})
+            for equal_field, equal_value in zip(self.ordering[:i], values[:i]):
+                q &= Q(**{equal_field: equal_value})
+            condition |= q
+        return condition
+
+    def page(self, after=None, before=None):
+        """Get a page of results.
+
+        Args:
+            after (str): Cursor to get the page after, from KeysetPage.next_cursor.
+            before (str): Cursor to get the page before, from KeysetPage.previous_cursor.
+
+        Returns:
+            KeysetPage: Page of results.  Invalid cursors give the first page.
+
+        """
+        after = self._decode(after) if after else None
+        before = self._decode(before) if before else None
+
+        if before is not None:
+            queryset = self.queryset.filter(self._filter_after(before, reverse=True)).order_by(
+                *('-' + field for field in self.ordering))
+            object_list = list(queryset[:self.page_size + 1])
+            has_more = len(object_list) > self.page_size
+            object_list = object_list[:self.page_size][::-1]
+            return KeysetPage(object_list,
+                              next_cursor=encode_cursor(self._key(object_list[-1])) if object_list else None,
+                              previous_cursor=encode_cursor(self._key(object_list[0])) if has_more else None)
+
+        queryset = self.queryset.order_by(*self.ordering)
+        if after is not None:
+            queryset = queryset.filter(self._filter_after(after))
+        object_list = list(queryset[:self.page_size + 1])
+        has_more = len(object_list) > self.page_size
+        object_list = object_list[:self.page_size]
+        return KeysetPage(object_list,
+                          next_cursor=encode_cursor(self._key(object_list[-1])) if has_more else None,
+                          previous_cursor=encode_cursor(self._key(object_list[0])) if after and object_list else None)
@@ -0,0 +1,113 @@
+"""Staff, superuser and event admin roles for Twitch users, from the MARATHON_ADMINS and MARATHON_SUPERUSERS lists."""
+
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Cache key for the ID of the event admin permission.
+PERMISSION_CACHE_KEY = 'submissions:event_admin_permission'
+
+# Cache key for the roles a user was last synced to.  Logins only check the database when this doesn't match.
+USER_ROLES_CACHE_KEY = 'submissions:user_roles:{}'
+USER_ROLES_CACHE_TIMEOUT = 86400
+
+
+def get_roles(username):
+    """
+    Args:
+        username (str): Twitch username.
+
+    Returns:
+        tuple[bool]: Whether the user should be staff with the event admin permission, and whether they should be a
+            superuser.
+
+    """
+    is_superuser = username in settings.MARATHON_SUPERUSERS
+    return is_superuser or username in settings.MARATHON_ADMINS, is_superuser
+
+
+def get_permission_id():
+    """
+    Returns:
+        int: ID of the event admin permission.
+
+    """
+    permission_id = cache.get(PERMISSION_CACHE_KEY)
+    if permission_id is None:
+        permission_id = Permission.objects.get(content_type__app_label='submissions', codename='is_event_admin').pk
+        cache.set(PERMISSION_CACHE_KEY, permission_id, None)
+    return permission_id
+
+
+def check_user_roles(user):
+    """Make sure a Twitch user logging in has the right roles.  Users already synced to the roles they should have are
+    left alone without any queries, so only users whose roles changed pay for updating them.
+
+    Args:
+        user (django.contrib.auth.models.User): User logging in.
+
+    """
+    is_admin, is_superuser = get_roles(user.username)
+    cache_key = USER_ROLES_CACHE_KEY.format(user.pk)
+    if (user.is_staff, user.is_superuser) == (is_admin, is_superuser) and cache.get(cache_key) == (is_admin,
+                                                                                                   is_superuser):
+        return
+
+    if (user.is_staff, user.is_superuser) != (is_admin, is_superuser):
+        logger.debug('Updating user {!r}: staff {!r}, superuser {!r}'.format(user.username, is_admin, is_superuser))
+        user.is_staff = is_admin
+        user.is_superuser = is_superuser
+        user.save(update_fields=['is_staff', 'is_superuser'])
+
+    permission_id = get_permission_id()
+    permissions = get_user_model().user_permissions.through.objects.filter(user=user, permission_id=permission_id)
+    if is_admin and not permissions.exists():
+        logger.debug('Adding admin permission for user {!r}'.format(user.username))
+        user.user_permissions.add(permission_id)
+    elif not is_admin and permissions.exists():
+        logger.debug('Removing admin permission for user {!r}'.format(user.username))
+        user.user_permissions.remove(permission_id)
+
+    cache.set(cache_key, (is_admin, is_superuser), USER_ROLES_CACHE_TIMEOUT)
+
+
+def sync_roles():
+    """Give every Twitch user the roles they should have, in a handful of queries however many users there are.
+
+    Returns:
+        dict: Number of users whose flags were updated, and number of event admin permissions added and removed.
+
+    """
+    User = get_user_model()
+    Through = User.user_permissions.through
+    superusers = set(settings.MARATHON_SUPERUSERS)
+    admins = set(settings.MARATHON_ADMINS) | superusers
+    twitch_users = User.objects.filter(social_auth__provider='twitch')
+
+    updated = twitch_users.filter(username__in=superusers).exclude(is_staff=True, is_superuser=True).update(
+        is_staff=True, is_superuser=True)
+    updated += twitch_users.filter(username__in=admins - superusers).exclude(is_staff=True, is_superuser=False).update(
+        is_staff=True, is_superuser=False)
+    updated += twitch_users.exclude(username__in=admins).exclude(is_staff=False, is_superuser=False).update(
+        is_staff=False, is_superuser=False)
+
+    permission_id = get_permission_id()
+    removed, _ = Through.objects.filter(permission_id=permission_id, user__in=twitch_users.exclude(
+        username__in=admins)).delete()
+    # Users can have more than one Twitch login, so each user is only listed once.
+    missing = twitch_users.filter(username__in=admins).exclude(user_permissions=permission_id).values_list(
+        'pk', flat=True).distinct()
+    added = Through.objects.bulk_create([Through(user_id=user_id, permission_id=permission_id) for user_id in missing])
+
+    # Remember everyone is in sync so logins don't check again.
+    cache.set_many({
+        USER_ROLES_CACHE_KEY.format(user_id): get_roles(username)
+        for user_id, username in twitch_users.values_list('pk', 'username').distinct()
+    }, USER_ROLES_CACHE_TIMEOUT)
+
+    return {'updated': updated, 'added': len(added), 'removed': removed}
@@ -0,0 +1,398 @@
+"""Marathon schedule builder that places accepted runs into the event timeline around runner availability.
+
+The scheduler works on plain data so it can be run and benchmarked without the database.  Times are handled
+internally as whole seconds from the start of the event.  Runs are placed greedily one after another, taking whichever
+run can start soonest and breaking ties by whose last possible start time comes first.  The result is then improved
+with a local search that moves runs earlier, fills gaps with runs that didn't fit, and swaps placed runs for unplaced
+ones when that lets more runs fit overall.
+"""
+
+import bisect
+import datetime
+from collections import namedtuple
+
+from submissions import models
+
+# A run to be scheduled.  Runner is any hashable key for the runner's availability, estimate is a timedelta.
+ScheduleRun = namedtuple('ScheduleRun', ['key', 'runner', 'estimate', 'race', 'label'])
+
+# A run placed in the schedule, with setup time being the buffer before the run starts.
+ScheduledRun = namedtuple('ScheduledRun', ['run', 'setup_time', 'start_time', 'end_time'])
+
+# A run that couldn't be placed and why.
+UnplacedRun = namedtuple('UnplacedRun', ['run', 'reason'])
+
+DEFAULT_SETUP_BUFFER = datetime.timedelta(minutes=10)
+DEFAULT_RACE_SETUP_BUFFER = datetime.timedelta(minutes=20)
+
+
+class AvailabilityIndex:
+    """Sorted, merged availability intervals for one runner, searched with binary search."""
+
+    def __init__(self, intervals):
+        """
+        Args:
+            intervals (iterable[tuple[int]]): Tuples (start, end) in seconds from the event start.
+
+        """
+        merged = []
+        for start, end in sorted(intervals):
+            if end <= start:
+                continue
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+
+    def covers(self, start, end):
+        """
+        Args:
+            start (int): Start of the time range.
+            end (int): End of the time range.
+
+        Returns:
+            bool: True if the runner is available for the whole time range.
+
+        """
+        i = bisect.bisect_right(self.starts, start) - 1
+        return i >= 0 and self.ends[i] >= end
+
+    def earliest_start(self, after, duration, before):
+        """Find the earliest time a run of the given length can start.
+
+        Args:
+            after (int): Earliest allowed start time.
+            duration (int): Length of the run.
+            before (int): Time the run must be finished by.
+
+        Returns:
+            int: Earliest start time, or None if the run can't fit.
+
+        """
+        i = max(0, bisect.bisect_right(self.starts, after) - 1)
+        for start, end in zip(self.starts[i:], self.ends[i:]):
+            start = max(start, after)
+            if start + duration > before:
+                return None
+            if start + duration <= end:
+                return start
+        return None
+
+    def latest_start(self, duration, before):
+        """Find the latest time a run of the given length can start.
+
+        Args:
+            duration (int): Length of the run.
+            before (int): Time the run must be finished by.
+
+        Returns:
+            int: Latest start time, or None if the run can't fit at all.
+
+        """
+        i = bisect.bisect_left(self.starts, before)
+        for start, end in zip(reversed(self.starts[:i]), reversed(self.ends[:i])):
+            latest = min(end, before) - duration
+            if latest >= start:
+                return latest
+        return None
+
+
+class Schedule:
+    """Result of building a schedule."""
+
+    def __init__(self, start_time, end_time, entries, unplaced):
+        """
+        Args:
+            start_time (datetime.datetime): Start of the event.
+            end_time (datetime.datetime): End of the event.
+            entries (list[ScheduledRun]): Placed runs in order.
+            unplaced (list[UnplacedRun]): Runs that couldn't be placed.
+
+        """
+        self.start_time = start_time
+        self.end_time = end_time
+        self.entries = entries
+        self.unplaced = unplaced
+
+    @property
+    def scheduled_time(self):
+        """
+        Returns:
+            datetime.timedelta: Total estimate time of all placed runs.
+
+        """
+        return sum((e.run.estimate for e in self.entries), datetime.timedelta())
+
+    @property
+    def idle_time(self):
+        """
+        Returns:
+            datetime.timedelta: Time between runs that isn't used for setup, up to the end of the last run.
+
+        """
+        idle = datetime.timedelta()
+        previous_end = self.start_time
+        for entry in self.entries:
+            idle += entry.setup_time - previous_end
+            previous_end = entry.end_time
+        return idle
+
+
+class Scheduler:
+    """Builds a single track marathon schedule.
+
+    Every run needs its runner to be available from the start to the end of the run, and needs a setup buffer after the
+    previous run ends.  Race/co-op runs get a longer setup buffer since there's more than one runner to set up.
+    """
+
+    def __init__(self, start_time, end_time, runs, availability, setup_buffer=DEFAULT_SETUP_BUFFER,
+                 race_setup_buffer=DEFAULT_RACE_SETUP_BUFFER, max_passes=10):
+        """
+        Args:
+            start_time (datetime.datetime): Start of the event.
+            end_time (datetime.datetime): End of the event.
+            runs (list[ScheduleRun]): Runs to place.
+            availability (dict): Mapping of runner key to a list of tuples (start time, duration).
+            setup_buffer (datetime.timedelta): Time needed between runs.
+            race_setup_buffer (datetime.timedelta): Time needed before race/co-op runs.
+            max_passes (int): Maximum number of local search passes.
+
+        """
+        self.start_time = start_time
+        self.end_time = end_time
+        self.runs = list(runs)
+        self.setup_buffer = int(setup_buffer.total_seconds())
+        self.race_setup_buffer = int(race_setup_buffer.total_seconds())
+        self.max_passes = max_passes
+        self.horizon = self._seconds(end_time)
+        self.indexes = {
+            runner: AvailabilityIndex((self._seconds(start), self._seconds(start + duration))
+                                      for start, duration in intervals)
+            for runner, intervals in availability.items()
+        }
+        self._empty_index = AvailabilityIndex([])
+
+    def _seconds(self, time):
+        return int((time - self.start_time).total_seconds())
+
+    def _time(self, seconds):
+        return self.start_time + datetime.timedelta(seconds=seconds)
+
+    def _duration(self, run):
+        return int(run.estimate.total_seconds())
+
+    def _setup(self, run):
+        return self.race_setup_buffer if run.race else self.setup_buffer
+
+    def _index(self, run):
+        return self.indexes.get(run.runner, self._empty_index)
+
+    def _earliest(self, run, after, before):
+        """Earliest start for a run after the previous run ended, including its setup buffer."""
+        return self._index(run).earliest_start(after + self._setup(run), self._duration(run), before)
+
+    def build(self):
+        """Build the schedule.
+
+        Returns:
+            Schedule: Placed and unplaced runs.
+
+        """
+        unplaced = []
+        candidates = []
+        deadlines = {}
+        for run in self.runs:
+            if self._index(run).starts:
+                deadline = self._index(run).latest_start(self._duration(run), self.horizon)
+            else:
+                unplaced.append(UnplacedRun(run, 'Runner has no availability'))
+                continue
+            if deadline is None:
+                unplaced.append(UnplacedRun(run, 'No availability block is long enough for the estimate'))
+                continue
+            deadlines[run.key] = deadline
+            candidates.append(run)
+
+        # Place runs as soon as possible in order of their last possible start time, longest first for ties.
+        candidates.sort(key=lambda r: (deadlines[r.key], -self._duration(r)))
+        slots = self._greedy(candidates, deadlines)
+        placed = {run.key for run, _ in slots}
+        remaining = [run for run in candidates if run.key not in placed]
+
+        slots, remaining = self._improve(slots, remaining)
+
+        entries = [ScheduledRun(run, self._time(start - self._setup(run) if i else start), self._time(start),
+                                self._time(start + self._duration(run)))
+                   for i, (run, start) in enumerate(slots)]
+        unplaced.extend(UnplacedRun(run, 'No room in the schedule while the runner is available')
+                        for run in remaining)
+        return Schedule(self.start_time, self.end_time, entries, unplaced)
+
+    def _greedy(self, candidates, deadlines):
+        """Place runs one after another, always taking the most urgent run that can start next."""
+        slots = []
+        now = 0
+        pending = list(candidates)
+        while pending:
+            best = None
+            best_start = None
+            for run in pending:
+                # Skip runs that can't fit any more, they're left for the local search.
+                if deadlines[run.key] < now:
+                    continue
+                start = self._earliest(run, now, self.horizon) if slots else self._index(run).earliest_start(
+                    now, self._duration(run), self.horizon)
+                if start is None:
+                    continue
+                # Pending is sorted by urgency, so only a strictly earlier start beats the current best.
+                if best is None or start < best_start:
+                    best, best_start = run, start
+                    if start == now + (self._setup(run) if slots else 0):
+                        break
+            if best is None:
+                break
+            slots.append((best, best_start))
+            pending.remove(best)
+            now = best_start + self._duration(best)
+        return slots
+
+    def _improve(self, slots, remaining):
+        """Local search: shift runs earlier, fill gaps with unplaced runs, and swap runs to make room for more."""
+        for _ in range(self.max_passes):
+            slots = self._compact(slots)
+            slots, remaining, filled = self._fill_gaps(slots, remaining)
+            swapped = False
+            if remaining:
+                slots, remaining, swapped = self._swap(slots, remaining)
+            if not filled and not swapped:
+                break
+        return self._compact(slots), remaining
+
+    def _compact(self, slots):
+        """Move every run as early as its runner's availability and the previous run allow."""
+        compacted = []
+        previous_end = 0
+        for run, start in slots:
+            if compacted:
+                earliest = self._earliest(run, previous_end, start + self._duration(run))
+            else:
+                earliest = self._index(run).earliest_start(0, self._duration(run), start + self._duration(run))
+            if earliest is not None and earliest < start:
+                start = earliest
+            compacted.append((run, start))
+            previous_end = start + self._duration(run)
+        return compacted
+
+    def _gap_start(self, slots, position):
+        """Time a run inserted at the given position could start from, before its own setup buffer."""
+        if position == 0:
+            return None
+        run, start = slots[position - 1]
+        return start + self._duration(run)
+
+    def _gap_end(self, slots, position):
+        """Time a run inserted at the given position must end by for the following run to keep its start time."""
+        if position == len(slots):
+            return self.horizon
+        run, start = slots[position]
+        return start - self._setup(run)
+
+    def _fit_at(self, slots, position, run):
+        """Get the start time for a run inserted at a position without moving other runs, or None if it won't fit."""
+        after = self._gap_start(slots, position)
+        before = self._gap_end(slots, position)
+        if after is None:
+            return self._index(run).earliest_start(0, self._duration(run), before)
+        return self._earliest(run, after, before)
+
+    def _gap_sizes(self, slots):
+        """Get the free time at each insert position, including setup time."""
+        return [self._gap_end(slots, position) - (self._gap_start(slots, position) or 0)
+                for position in range(len(slots) + 1)]
+
+    def _needed(self, run):
+        """Free time a run needs in a gap, including its setup buffer."""
+        return self._setup(run) + self._duration(run)
+
+    def _fill_gaps(self, slots, remaining):
+        """Insert unplaced runs into any gap they fit in."""
+        filled = False
+        still_remaining = []
+        gaps = self._gap_sizes(slots)
+        for run in remaining:
+            needed = self._needed(run)
+            for position, gap in enumerate(gaps):
+                if gap < needed:
+                    continue
+                start = self._fit_at(slots, position, run)
+                if start is not None:
+                    slots.insert(position, (run, start))
+                    gaps = self._gap_sizes(slots)
+                    filled = True
+                    break
+            else:
+                still_remaining.append(run)
+        return slots, still_remaining, filled
+
+    def _swap(self, slots, remaining):
+        """Replace a placed run with an unplaced one if the replaced run can then be put somewhere else."""
+        gaps = self._gap_sizes(slots)
+        for run in list(remaining):
+            needed = self._needed(run)
+            for position in range(len(slots)):
+                # Cheap check that the run would fit in the space left by the removed run before searching.
+                after = self._gap_start(slots, position)
+                before = self._gap_end(slots, position + 1)
+                if before - (after or 0) < needed:
+                    continue
+
+                # The removed run has to go in an existing gap, or in the space left over next to the new run.
+                removed = slots[position][0]
+                removed_needed = self._needed(removed)
+                targets = [p for p, gap in enumerate(gaps)
+                           if gap >= removed_needed and p not in (position, position + 1)]
+                if not targets and before - (after or 0) < needed + removed_needed:
+                    continue
+
+                if after is None:
+                    start = self._index(run).earliest_start(0, self._duration(run), before)
+                else:
+                    start = self._earliest(run, after, before)
+                if start is None:
+                    continue
+
+                trial = slots[:position] + [(run, start)] + slots[position + 1:]
+                for other in sorted(set(targets + [position, position + 1])):
+                    other_start = self._fit_at(trial, other, removed)
+                    if other_start is not None:
+                        trial.insert(other, (removed, other_start))
+                        remaining.remove(run)
+                        return trial, remaining, True
+        return slots, remaining, False
+
+
+def build_event_schedule(event, setup_buffer=DEFAULT_SETUP_BUFFER, race_setup_buffer=DEFAULT_RACE_SETUP_BUFFER):
+    """Build a schedule for an event from its accepted categories and runner availability.
+
+    Args:
+        event (submissions.models.Event): Event to build the schedule for.
+        setup_buffer (datetime.timedelta): Time needed between runs.
+        race_setup_buffer (datetime.timedelta): Time needed before race/co-op runs.
+
+    Returns:
+        Schedule: Placed and unplaced runs.  Each run's key is the SubmissionCategory.
+
+    """
+    categories = models.SubmissionCategory.objects.filter(
+        game__event=event, status=models.SubmissionCategory.Statuses.ACCEPTED).select_related('game', 'game__user')
+    runs = [ScheduleRun(c, c.game.user_id, c.estimate, c.race,
+                        '{} - {} ({})'.format(c.game.game, c.category, c.game.user)) for c in categories]
+
+    availability = {}
+    for user_id, start_time, duration in models.Availability.objects.filter(
+            event=event, user__in={run.runner for run in runs}).values_list('user', 'start_time', 'duration'):
+        availability.setdefault(user_id, []).append((start_time, duration))
+
+    return Scheduler(event.start_date, event.end_date, runs, availability, setup_buffer, race_setup_buffer).build()
@@ -0,0 +1,47 @@
+"""Helpers for creating test data."""
+
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.utils import timezone
+from social_django.models import UserSocialAuth
+
+from submissions import models
+
+
+def create_event(**kwargs):
+    """Create an open event starting tomorrow and lasting two days, with any fields overridden."""
+    now = timezone.now().replace(microsecond=0)
+    values = {
+        'name': 'Test Marathon',
+        'stage': models.Event.Stages.OPEN,
+        'start_date': now + datetime.timedelta(days=1),
+        'end_date': now + datetime.timedelta(days=3),
+        'guidelines': '# Guidelines',
+    }
+    values.update(kwargs)
+    return models.Event.objects.create(**values)
+
+
+def create_user(username, admin=False):
+    """Create a user logged in through Twitch with their pronouns filled in, optionally as an event admin."""
+    user = get_user_model().objects.create(username=username, is_staff=admin)
+    UserSocialAuth.objects.create(user=user, provider='twitch', uid=username, extra_data={
+        'name': username, 'display_name': username.title(), 'logo': 'https://example.com/logo.png'})
+    user.profile.pronouns = 'They/Them'
+    user.profile.save()
+    if admin:
+        user.user_permissions.add(Permission.objects.get(codename='is_event_admin'))
+    return user
+
+
+def create_submission(user, event, game, categories=((models.SubmissionCategory.Statuses.PENDING, 1),), race=False):
+    """Create a submission with categories given as tuples (status, estimate in hours)."""
+    submission = models.Submission.objects.create(user=user, event=event, game=game, platform='NES',
+                                                  release_year='1990', twitch_game=game)
+    for i, (status, hours) in enumerate(categories):
+        models.SubmissionCategory.objects.create(game=submission, status=status, category='Any% {}'.format(i),
+                                                 race=race, estimate=datetime.timedelta(hours=hours),
+                                                 video='https://example.com/video')
+    return submission
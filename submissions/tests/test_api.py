@@ -0,0 +1,60 @@
+import datetime
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from submissions import models
+from submissions.tests.helpers import create_event, create_submission, create_user
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.event = create_event()
+        cls.admin = create_user('admin', admin=True)
+        cls.runners = [create_user('runner{}'.format(i)) for i in range(3)]
+        for runner in cls.runners:
+            create_submission(runner, cls.event, 'Game {}'.format(runner.username))
+            models.Availability.set_user_availability(runner, cls.event, [
+                (cls.event.start_date + datetime.timedelta(hours=hour), datetime.timedelta(hours=2))
+                for hour in (0, 6)])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.runners[0])
+
+    def test_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('submissions:api-v1-event')).status_code, 401)
+
+    def test_event(self):
+        data = self.client.get(reverse('submissions:api-v1-event')).json()
+        self.assertEqual((data['id'], data['name']), (self.event.pk, 'Test Marathon'))
+
+    def test_submissions_pages_and_fields(self):
+        url = reverse('submissions:api-v1-submissions')
+        first = self.client.get(url, {'limit': 2, 'fields': 'game,runner'}).json()
+        self.assertEqual([item['game'] for item in first['data']], ['Game runner0', 'Game runner1'])
+        self.assertEqual(first['data'][0]['runner'], {'id': self.runners[0].pk, 'username': 'runner0',
+                                                      'display_name': 'Runner0', 'pronouns': 'They/Them'})
+        self.assertEqual(set(first['data'][0]), {'game', 'runner'})
+        self.assertIsNone(first['previous'])
+
+        second = self.client.get(url, {'limit': 2, 'fields': 'game', 'after': first['next']}).json()
+        self.assertEqual(second['data'], [{'game': 'Game runner2'}])
+        self.assertIsNone(second['next'])
+
+    def test_bad_parameters(self):
+        url = reverse('submissions:api-v1-submissions')
+        self.assertEqual(self.client.get(url, {'fields': 'game,secret'}).json(), {'error': 'Unknown fields: secret'})
+        self.assertEqual(self.client.get(url, {'limit': 'lots'}).status_code, 400)
+
+    def test_availability_for_admins_only(self):
+        url = reverse('submissions:api-v1-availability')
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_login(self.admin)
+        data = self.client.get(url, {'runner': 'runner1', 'fields': 'start_time,hours'}).json()['data']
+        self.assertEqual([item['hours'] for item in data], [2, 2])
+        self.assertLess(data[0]['start_time'], data[1]['start_time'])
@@ -0,0 +1,104 @@
+import datetime
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from submissions import archive, models
+from submissions.tests.helpers import create_event, create_submission, create_user
+from submissions.views.admin import ArchiveView
+
+STATUSES = models.SubmissionCategory.Statuses
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.archive_dir)
+        override = override_settings(MARATHON_ARCHIVE_DIR=self.archive_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        # The upcoming event is current, so the past one can be archived.
+        create_event()
+        now = timezone.now()
+        self.event = create_event(name='Past Marathon', stage=models.Event.Stages.CLOSED,
+                                  start_date=now - datetime.timedelta(days=30),
+                                  end_date=now - datetime.timedelta(days=28))
+        self.runners = [create_user('runner{}'.format(i)) for i in range(3)]
+        for i, runner in enumerate(self.runners):
+            create_submission(runner, self.event, 'Game {}'.format(i),
+                              categories=[(STATUSES.ACCEPTED, 1), (STATUSES.DECLINED, 2)])
+            models.Availability.set_user_availability(runner, self.event, [
+                (self.event.start_date + datetime.timedelta(hours=i), datetime.timedelta(hours=3))])
+        # Times to the microsecond have to come back exactly.
+        models.Submission.objects.filter(event=self.event).update(
+            created_at=now - datetime.timedelta(days=40, microseconds=123456))
+
+    def snapshot(self):
+        return {
+            model: list(model.objects.filter(**{lookup: self.event}).order_by('pk').values())
+            for model, lookup in [(models.Submission, 'event'), (models.SubmissionCategory, 'game__event'),
+                                  (models.Availability, 'event'), (models.AvailabilityHours, 'event')]
+        }
+
+    def test_round_trip(self):
+        before = self.snapshot()
+        stats = models.EventStats.rebuild(self.event.pk)
+
+        event_archive = archive.archive_event(self.event)
+        self.assertTrue(os.path.exists(event_archive.path))
+        self.assertEqual(event_archive.availabilities, 3)
+        self.assertTrue(all(rows == [] for rows in self.snapshot().values()))
+        self.assertFalse(models.RunnerSummary.objects.filter(event=self.event).exists())
+        self.assertEqual(models.EventStats.objects.get(event=self.event).submissions, stats.submissions)
+        with self.assertRaises(archive.ArchiveError):
+            archive.archive_event(self.event)
+
+        counts = archive.restore_event(event_archive)
+        self.assertEqual(counts, {'submissions': 3, 'categories': 6, 'availabilities': 3, 'skipped': 0})
+        self.assertEqual(self.snapshot(), before)
+        self.assertFalse(os.path.exists(event_archive.path))
+        self.assertFalse(models.EventArchive.objects.filter(event=self.event).exists())
+
+    def test_restore_with_deleted_user(self):
+        event_archive = archive.archive_event(self.event)
+        self.runners[0].delete()
+
+        with self.assertRaises(archive.ArchiveError):
+            archive.restore_event(event_archive)
+        self.assertTrue(os.path.exists(event_archive.path))
+        self.assertTrue(models.EventArchive.objects.filter(event=self.event).exists())
+        self.assertTrue(all(rows == [] for rows in self.snapshot().values()))
+
+        # Skipping the deleted user's records restores the rest, and keeps the file with their records.
+        counts = archive.restore_event(event_archive, skip_missing_users=True)
+        self.assertEqual(counts, {'submissions': 2, 'categories': 4, 'availabilities': 2, 'skipped': 3})
+        self.assertTrue(os.path.exists(event_archive.path))
+        self.assertEqual(len(list(archive.read_submissions(event_archive.path, 0, 10))), 3)
+
+    def test_read_submissions(self):
+        path = archive.archive_event(self.event).path
+        self.assertEqual([record['game'] for record in archive.read_submissions(path, 1, 5)], ['Game 1', 'Game 2'])
+        self.assertEqual(archive.read_submissions(path, 3, 5), [])
+
+    @mock.patch.object(ArchiveView, 'page_size', 2)
+    def test_archive_view_pages(self):
+        archive.archive_event(self.event)
+        self.client.force_login(create_user('admin', admin=True))
+        url = reverse('submissions:admin-archive', args=[self.event.pk])
+
+        response = self.client.get(url)
+        self.assertEqual([s['game'] for s in response.context['submissions']], ['Game 0', 'Game 1'])
+        self.assertTrue(response.context['has_next'])
+        self.assertContains(response, 'Accepted')
+        self.assertContains(response, '<h4>3</h4>Runners With Availability', html=False)
+
+        response = self.client.get(url, {'page': 2})
+        self.assertEqual([s['game'] for s in response.context['submissions']], ['Game 2'])
+        self.assertFalse(response.context['has_next'])
+        self.assertEqual(self.client.get(url, {'page': 'x'}).context['page'], 1)
@@ -0,0 +1,86 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from submissions.availability import ONE_HOUR, HourBitmap, event_hour_count, event_hour_grid, event_start_hour
+from submissions.models import Availability, AvailabilityHours, Event
+
+START = datetime.datetime(2020, 6, 1, 12, tzinfo=timezone.utc)
+
+
+class HourBitmapTests(SimpleTestCase):
+    def test_from_intervals_counts_partial_hours(self):
+        bitmap = HourBitmap.from_intervals(START, 24, [
+            (START + datetime.timedelta(minutes=30), datetime.timedelta(hours=1)),
+            (START + 5 * ONE_HOUR, 2 * ONE_HOUR),
+        ])
+        self.assertEqual(bitmap.available_hours(), [0, 1, 5, 6])
+
+    def test_from_intervals_clips_to_bitmap(self):
+        bitmap = HourBitmap.from_intervals(START, 4, [(START - 2 * ONE_HOUR, 3 * ONE_HOUR),
+                                                      (START + 3 * ONE_HOUR, 5 * ONE_HOUR)])
+        self.assertEqual(bitmap.blocks(), [(0, 1), (3, 1)])
+
+    def test_blocks_and_intervals(self):
+        bitmap = HourBitmap(START, 16, 0b1110000000111011)
+        self.assertEqual(bitmap.blocks(), [(0, 2), (3, 3), (13, 3)])
+        self.assertEqual(bitmap.to_intervals(), [(START, 2 * ONE_HOUR), (START + 3 * ONE_HOUR, 3 * ONE_HOUR),
+                                                 (START + 13 * ONE_HOUR, 3 * ONE_HOUR)])
+        self.assertEqual(bitmap.total_hours, 8)
+        self.assertEqual(bitmap.longest_block(), 3)
+
+    def test_bits_outside_hours_are_dropped(self):
+        self.assertEqual(HourBitmap(START, 3, 0b11111).bits, 0b111)
+
+    def test_bytes_round_trip(self):
+        bitmap = HourBitmap(START, 168, (1 << 167) | 0b1011)
+        data = bitmap.to_bytes()
+        self.assertEqual(len(data), 21)
+        self.assertEqual(HourBitmap.from_bytes(START, 168, memoryview(data)).bits, bitmap.bits)
+
+    def test_is_available_for(self):
+        bitmap = HourBitmap(START, 8, 0b01111100)
+        self.assertTrue(bitmap.is_available_for(2, 5))
+        self.assertFalse(bitmap.is_available_for(1, 2))
+        self.assertFalse(bitmap.is_available_for(6, 3))
+        self.assertFalse(bitmap.is_available_for(-1, 1))
+        self.assertTrue(bitmap.is_available(6))
+        self.assertFalse(bitmap.is_available(8))
+
+    def test_empty(self):
+        bitmap = HourBitmap(START, 10)
+        self.assertFalse(bitmap)
+        self.assertEqual(bitmap.blocks(), [])
+        self.assertEqual(bitmap.longest_block(), 0)
+
+
+@override_settings(TIME_ZONE='UTC')
+class EventHoursTests(SimpleTestCase):
+    def test_partial_hours(self):
+        event = Event(start_date=START + datetime.timedelta(minutes=20),
+                      end_date=START + datetime.timedelta(hours=2, minutes=10))
+        self.assertEqual(event_start_hour(event), START)
+        self.assertEqual(event_hour_count(event), 3)
+
+        grid = event_hour_grid(event)
+        self.assertEqual([slot.start_time for slot in grid], [START, START + ONE_HOUR, START + 2 * ONE_HOUR])
+        self.assertEqual(grid[0].field_name, 'available_2020_06_01_12')
+        self.assertEqual(len({slot.field_name for slot in grid}), 3)
+
+
+@override_settings(TIME_ZONE='UTC')
+class SetUserAvailabilityTests(TestCase):
+    def test_rows_and_bitmap_stay_in_sync(self):
+        event = Event.objects.create(name='Event', start_date=START, end_date=START + 48 * ONE_HOUR, guidelines='')
+        user = get_user_model().objects.create(username='runner')
+
+        Availability.set_user_availability(user, event, [(START + ONE_HOUR, 3 * ONE_HOUR)])
+        Availability.set_user_availability(user, event, [(START + ONE_HOUR, 3 * ONE_HOUR),
+                                                         (START + 10 * ONE_HOUR, 2 * ONE_HOUR)])
+
+        self.assertEqual(list(Availability.objects.filter(user=user).order_by('start_time').values_list(
+            'start_time', 'duration')), [(START + ONE_HOUR, 3 * ONE_HOUR), (START + 10 * ONE_HOUR, 2 * ONE_HOUR)])
+        bitmap = AvailabilityHours.objects.get(user=user, event=event).bitmap
+        self.assertEqual(bitmap.blocks(), [(1, 3), (10, 2)])
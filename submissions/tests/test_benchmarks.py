@@ -0,0 +1,35 @@
+import json
+import random
+
+from django.test import TransactionTestCase
+
+from submissions import benchmarking
+from submissions.management.commands.benchmark_views import DEFAULT_BUDGETS
+
+
+class ViewBudgetTests(TransactionTestCase):
+    """Runs a small version of the benchmark_views command, so views making more queries than their recorded budgets,
+    or getting far slower or hungrier than a much larger event allows, fail the tests.  Views aren't wrapped in a test
+    transaction, so their own transactions are counted the same way as in the command.
+    """
+
+    def setUp(self):
+        self.admin, self.runner = benchmarking.generate_event(random.Random(0), 60)
+        with open(DEFAULT_BUDGETS) as f:
+            self.budgets = json.load(f)['views']
+
+    def test_views_within_budgets(self):
+        results = {name: benchmarking.measure(user, method, url, data, repeat=1)
+                   for name, user, method, url, data in benchmarking.get_requests(self.admin, self.runner)}
+
+        self.assertEqual(set(results), set(self.budgets))
+        self.assertEqual(benchmarking.check_budgets(results, self.budgets), [])
+
+    def test_check_budgets(self):
+        budgets = {'home': {'queries': 2, 'seconds': 0.01, 'peak_kb': 1000}}
+        self.assertEqual(benchmarking.check_budgets({'home': {'queries': 2, 'seconds': 0.05, 'peak_kb': 1600}},
+                                                    budgets), [])
+        self.assertEqual(len(benchmarking.check_budgets({'home': {'queries': 3, 'seconds': 0.1, 'peak_kb': 2000}},
+                                                        budgets)), 3)
+        self.assertEqual(benchmarking.check_budgets({'about': {'queries': 1, 'seconds': 0.0, 'peak_kb': 0}}, budgets),
+                         ['about: no budget recorded'])
@@ -0,0 +1,91 @@
+import io
+import os
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from submissions import catalog, models
+from submissions.tests.helpers import create_user
+
+GAME_DUMP = os.path.join(os.path.dirname(__file__), 'fixtures', 'speedrun_games.json')
+
+
+def game(name, abbreviation=''):
+    return {'name': name, 'abbreviation': abbreviation, 'platform': '', 'release_year': '', 'twitch_name': ''}
+
+
+class GameIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = catalog.GameIndex([
+            game('Super Mario 64', 'sm64'),
+            game('Super Mario Bros.', 'smb1'),
+            game('Super Mario World', 'smw'),
+            game('Pokémon Red/Blue', 'pkmnredblue'),
+            game('Mario Kart 64', 'mk64'),
+        ])
+
+    def names(self, query, limit=10):
+        return [g['name'] for g in self.index.search(query, limit)]
+
+    def test_prefix_of_name(self):
+        self.assertEqual(self.names('super mario'), ['Super Mario 64', 'Super Mario Bros.', 'Super Mario World'])
+
+    def test_name_starts_ranked_before_later_words(self):
+        self.assertEqual(self.names('mario'), ['Mario Kart 64', 'Super Mario 64', 'Super Mario Bros.',
+                                               'Super Mario World'])
+        self.assertEqual(self.names('mario 64'), ['Super Mario 64'])
+
+    def test_abbreviation(self):
+        self.assertEqual(self.names('SMW'), ['Super Mario World'])
+
+    def test_normalized(self):
+        self.assertEqual(self.names('POKEMON red blue'), ['Pokémon Red/Blue'])
+        self.assertEqual(self.names('  super   MARIO-bros '), ['Super Mario Bros.'])
+
+    def test_limit_and_no_match(self):
+        self.assertEqual(len(self.names('super', limit=2)), 2)
+        self.assertEqual(self.names('zelda'), [])
+        self.assertEqual(self.names('!!!'), [])
+
+
+class LoadGamesTests(TestCase):
+    def load(self):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command('load_games', GAME_DUMP, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_loads_fixture_dump(self):
+        stdout, stderr = self.load()
+        self.assertIn('Loaded 5 games', stdout)
+        self.assertIn('Skipped 3 games', stderr)
+
+        sm64 = models.Game.objects.get(src_id='om1m3625')
+        self.assertEqual((sm64.name, sm64.abbreviation, sm64.platform, sm64.release_year, sm64.twitch_name),
+                         ('Super Mario 64', 'sm64', 'N64', '1996', 'Super Mario 64'))
+        # The first platform released on is used, not the first one listed.
+        self.assertEqual(models.Game.objects.get(src_id='pd0wq31e').platform, 'NES')
+        mmx = models.Game.objects.get(src_id='m1zjpm60')
+        self.assertEqual((mmx.platform, mmx.release_year, mmx.twitch_name), ('', '1993', ''))
+
+    def test_reloading_replaces_catalog(self):
+        models.Game.objects.create(src_id='old', name='Old Game')
+        self.load()
+        self.load()
+        self.assertEqual(models.Game.objects.count(), 5)
+        self.assertFalse(models.Game.objects.filter(src_id='old').exists())
+
+    def test_search_view(self):
+        self.load()
+        self.client.force_login(create_user('runner'))
+        response = self.client.get(reverse('submissions:game-search'), {'q': 'super mario w'})
+        self.assertEqual(response.json()['data'], [{
+            'name': 'Super Mario World', 'abbreviation': 'smw', 'platform': 'SNES', 'release_year': '1990',
+            'twitch_name': 'Super Mario World',
+        }])
+
+        # Reloading the catalog is picked up by the next search.
+        models.Game.objects.filter(src_id='o1y9wo6q').update(name='Super Mario World 2')
+        catalog.catalog_changed()
+        response = self.client.get(reverse('submissions:game-search'), {'q': 'super mario w'})
+        self.assertEqual([g['name'] for g in response.json()['data']], ['Super Mario World 2'])
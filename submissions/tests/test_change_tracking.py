@@ -0,0 +1,81 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from social_django.models import UserSocialAuth
+
+from submissions import models
+from submissions.tests.helpers import create_event, create_submission, create_user
+
+
+class ChangeTrackingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = create_event()
+        self.runner = create_user('runner')
+        self.submission = create_submission(self.runner, self.event, 'Mega Man 2')
+
+    def version(self):
+        return models.EventStats.objects.get(event=self.event).version
+
+    def test_submission_changes_bump_version(self):
+        version = self.version()
+        models.SubmissionCategory.objects.filter(game=self.submission).first().save()
+        self.assertEqual(self.version(), version + 1)
+        models.SubmissionCategory.set_statuses(list(self.submission.categories.all()),
+                                               models.SubmissionCategory.Statuses.ACCEPTED)
+        self.assertEqual(self.version(), version + 2)
+
+    def test_event_row_and_cached_event_left_alone(self):
+        models.Event.get_current_event()
+        changed_at = models.Event.objects.get(pk=self.event.pk).changed_at
+        self.submission.save()
+        self.assertEqual(models.Event.objects.get(pk=self.event.pk).changed_at, changed_at)
+        self.assertIsNotNone(cache.get(models.CURRENT_EVENT_CACHE_KEY))
+
+    def test_login_does_not_bump_version(self):
+        version = self.version()
+        user = models.Profile.objects.select_related('user').get(user=self.runner).user
+        user.last_login = timezone.now()
+        user.save()
+        social = UserSocialAuth.objects.get(user=self.runner)
+        social.extra_data['access_token'] = 'new token'
+        social.save()
+        self.assertEqual(self.version(), version)
+
+    def test_pronouns_and_twitch_name_bump_version(self):
+        version = self.version()
+        user = models.Profile.objects.select_related('user').get(user=self.runner).user
+        user.profile.pronouns = 'She/Her'
+        user.save()
+        self.assertEqual(self.version(), version + 1)
+
+        social = UserSocialAuth.objects.get(user=self.runner)
+        social.extra_data['display_name'] = 'RUNNER'
+        social.save()
+        self.assertEqual(self.version(), version + 2)
+
+    def test_etag_follows_version(self):
+        self.client.force_login(self.runner)
+        url = reverse('submissions:all-submissions')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.submission.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_follows_csrf_cookie(self):
+        # The admin submissions page has a review form, whose CSRF token goes stale when logging in again.
+        admin = create_user('admin', admin=True)
+        self.client.force_login(admin)
+        url = reverse('submissions:admin-submissions')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.logout()
+        self.client.force_login(admin)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
@@ -0,0 +1,67 @@
+import datetime
+import random
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from submissions import coverage, models
+from submissions.availability import ONE_HOUR, event_start_hour
+from submissions.tests.helpers import create_event, create_submission, create_user
+
+
+def brute_force_coverage(hour_count, bitmaps, runs):
+    """Count runners and runs hour by hour, checking every hour of every run."""
+    def available(runner, hour):
+        return hour < hour_count and bool(bitmaps.get(runner, 0) >> hour & 1)
+
+    result = []
+    for hour in range(hour_count):
+        runners = sum(1 for runner in bitmaps if available(runner, hour))
+        fitting = [estimate for runner, estimate in runs
+                   if all(available(runner, hour + i) for i in range(max(1, -int(-estimate // ONE_HOUR))))]
+        result.append((runners, len(fitting), sum(fitting, datetime.timedelta())))
+    return result
+
+
+class ComputeCoverageTests(SimpleTestCase):
+    def test_matches_brute_force(self):
+        rnd = random.Random(0)
+        for hour_count in [1, 7, 64, 100]:
+            bitmaps = {runner: rnd.getrandbits(hour_count) for runner in range(15)}
+            bitmaps[15] = (1 << hour_count) - 1
+            # Runner 20 has runs but no availability.
+            runs = [(rnd.choice([*bitmaps, 20]), datetime.timedelta(minutes=rnd.randint(1, 600))) for _ in range(60)]
+            runs.append((15, hour_count * ONE_HOUR))
+            with self.subTest(hour_count=hour_count):
+                self.assertEqual(coverage.compute_coverage(hour_count, bitmaps, runs),
+                                 brute_force_coverage(hour_count, bitmaps, runs))
+
+    def test_estimates_round_up_to_whole_hours(self):
+        runs = [(1, datetime.timedelta(minutes=61)), (1, datetime.timedelta(minutes=60))]
+        self.assertEqual([runs for _runners, runs, _time in coverage.compute_coverage(4, {1: 0b0111}, runs)],
+                         [2, 2, 1, 0])
+
+
+class EventCoverageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.event = create_event()
+        self.runner = create_user('runner')
+        create_submission(self.runner, self.event, 'Mega Man 2',
+                          categories=[(models.SubmissionCategory.Statuses.ACCEPTED, 1)])
+        self.start = event_start_hour(self.event)
+
+    def runners(self):
+        return [hour.runners for hour in coverage.get_event_coverage(self.event)[:4]]
+
+    def test_cache_follows_availability(self):
+        models.Availability.set_user_availability(self.runner, self.event, [(self.start, 2 * ONE_HOUR)])
+        self.assertEqual(self.runners(), [1, 1, 0, 0])
+
+        models.Availability.set_user_availability(self.runner, self.event, [(self.start, 2 * ONE_HOUR),
+                                                                           (self.start + 3 * ONE_HOUR, ONE_HOUR)])
+        self.assertEqual(self.runners(), [1, 1, 0, 1])
+
+        # Only removing a block still has to show in the coverage.
+        models.Availability.set_user_availability(self.runner, self.event, [(self.start + 3 * ONE_HOUR, ONE_HOUR)])
+        self.assertEqual(self.runners(), [0, 0, 0, 1])
@@ -0,0 +1,43 @@
+import csv
+import io
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+
+from submissions.tests.helpers import create_event, create_submission, create_user
+
+
+class ExportViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.event = create_event(name='Power "Up" 2020')
+        cls.admin = create_user('admin', admin=True)
+        create_submission(create_user('runner'), cls.event, 'Mega Man 2')
+        create_submission(create_user('other'), cls.event, 'Zelda')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_csv(self):
+        response = self.client.get(reverse('submissions:admin-export', args=['submissions', 'csv']))
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="power-up-2020-submissions.csv"')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([(row['game'], row['user__username']) for row in rows],
+                         [('Mega Man 2', 'runner'), ('Zelda', 'other')])
+
+    def test_json_with_filters(self):
+        response = self.client.get(reverse('submissions:admin-export', args=['categories', 'json']),
+                                   {'runner': 'other'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([(row['game__game'], row['estimate']) for row in rows], [('Zelda', 'P0DT01H00M00S')])
+
+    def test_unknown_export(self):
+        self.assertEqual(self.client.get(reverse('submissions:admin-export', args=['games', 'csv'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('submissions:admin-export', args=['runners', 'xml'])).status_code,
+                         404)
+
+    def test_requires_event_admin(self):
+        self.client.force_login(create_user('someone'))
+        response = self.client.get(reverse('submissions:admin-export', args=['submissions', 'csv']))
+        self.assertNotEqual(response.status_code, 200)
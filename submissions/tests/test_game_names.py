@@ -0,0 +1,50 @@
+from django.test import SimpleTestCase
+
+from submissions.game_names import GAME_KEY_LENGTH, game_key, group_similar, normalize
+
+
+class GameKeyTests(SimpleTestCase):
+    def test_normalize(self):
+        self.assertEqual(normalize('  Pokémon: Red/BLUE!  '), 'pokemon red blue')
+
+    def test_spellings_match(self):
+        for a, b in [('Final Fantasy VII', 'final fantasy 7'), ('Banjo & Kazooie', 'Banjo and Kazooie'),
+                     ('The Legend of Zelda', 'Legend of Zelda'), ('Pokémon Red', 'Pokemon  RED')]:
+            self.assertEqual(game_key(a), game_key(b), (a, b))
+
+    def test_left_alone(self):
+        self.assertEqual(game_key('Mega Man X'), 'mega man x')
+        self.assertEqual(game_key('The'), 'the')
+        self.assertEqual(game_key('Ultima I'), 'ultima i')
+
+    def test_fits_the_column(self):
+        key = game_key('A&' * 50)
+        self.assertEqual(len(key), GAME_KEY_LENGTH)
+        self.assertFalse(key.endswith(' '))
+        self.assertEqual(len(game_key('a ' * 50 + '&b')), GAME_KEY_LENGTH - 1)
+
+
+class GroupSimilarTests(SimpleTestCase):
+    def test_typos_grouped_under_first_key(self):
+        keys = [game_key(name) for name in ['Super Mario Bros', 'Super Mario Brothers', 'Super Maria Bros',
+                                            'Donkey Kong Country']]
+        groups = group_similar(keys)
+        self.assertEqual(groups['super mario bros'], 'super maria bros')
+        self.assertEqual(groups['super maria bros'], 'super maria bros')
+        self.assertEqual(groups['donkey kong country'], 'donkey kong country')
+
+    def test_sequels_kept_apart(self):
+        groups = group_similar(['mega man 2', 'mega man 3', 'mega man'])
+        self.assertEqual(len(set(groups.values())), 3)
+
+    def test_threshold(self):
+        self.assertEqual(len(set(group_similar(['zelda', 'zelda ii'], threshold=0.5).values())), 1)
+        self.assertEqual(len(set(group_similar(['zelda', 'zelda ii'], threshold=0.9).values())), 2)
+
+    def test_chains_join_groups(self):
+        groups = group_similar(['castlevania aria of sorrow', 'castlevania aria of sorow',
+                                'castlevania aria of sorrows'])
+        self.assertEqual(set(groups.values()), {'castlevania aria of sorow'})
+
+    def test_empty(self):
+        self.assertEqual(group_similar([]), {})
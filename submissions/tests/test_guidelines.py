@@ -0,0 +1,38 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from submissions import models
+from submissions.tests.helpers import create_event
+
+
+class RenderGuidelinesTests(SimpleTestCase):
+    def test_markdown(self):
+        html = models.render_guidelines('# Rules\n\n**One** run\n\n| Game | Limit |\n|---|---|\n| Any | 2 |')
+        self.assertInHTML('<h1>Rules</h1>', html)
+        self.assertInHTML('<p><strong>One</strong> run</p>', html)
+        self.assertInHTML('<td>Any</td>', html)
+
+    def test_raw_html_escaped(self):
+        html = models.render_guidelines('Hi <script>alert(1)</script>\n\n<img src=x onerror="alert(1)">')
+        self.assertNotIn('<script', html)
+        self.assertNotIn('<img', html)
+        self.assertIn('&lt;script&gt;', html)
+
+    def test_unsafe_links_dropped(self):
+        html = models.render_guidelines('[click](javascript:alert(1)) [ok](https://example.com)')
+        self.assertNotIn('javascript:', html)
+        self.assertIn('href="https://example.com"', html)
+
+
+class EventGuidelinesTests(TestCase):
+    def test_rendered_on_save(self):
+        cache.clear()
+        event = create_event(guidelines='# Old')
+        event.guidelines = '# New <b>rules</b>'
+        event.save(update_fields=['guidelines'])
+
+        event.refresh_from_db()
+        self.assertEqual(event.guidelines_html, models.render_guidelines('# New <b>rules</b>'))
+        response = self.client.get(reverse('submissions:home'))
+        self.assertContains(response, '<h1>New &lt;b&gt;rules&lt;/b&gt;</h1>', html=True)
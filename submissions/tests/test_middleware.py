@@ -0,0 +1,50 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from submissions.tests.helpers import create_event, create_submission, create_user
+
+
+@override_settings(SLOW_REQUEST_THRESHOLD=60)
+class RequestTimingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.event = create_event()
+        cls.admin = create_user('admin', admin=True)
+        cls.runner = create_user('runner')
+        create_submission(cls.runner, cls.event, 'Mega Man 2')
+
+    def test_server_timing_only_for_staff(self):
+        self.client.force_login(self.runner)
+        self.assertNotIn('Server-Timing', self.client.get(reverse('submissions:all-submissions')))
+
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('submissions:all-submissions'))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", view;dur=')
+
+    def test_requests_logged_at_info_level(self):
+        self.client.force_login(self.runner)
+        with self.assertLogs('submissions.middleware', level='INFO') as logs:
+            self.client.get(reverse('submissions:all-submissions'))
+        self.assertEqual([record.levelname for record in logs.records], ['INFO'])
+        self.assertIn('path=/submissions/all status=200', logs.output[0])
+
+    @override_settings(REQUEST_LOG_LEVEL='DEBUG')
+    def test_request_log_level_setting(self):
+        self.client.force_login(self.runner)
+        with self.assertLogs('submissions.middleware', level='DEBUG') as logs:
+            self.client.get(reverse('submissions:all-submissions'))
+        self.assertEqual([record.levelname for record in logs.records], ['DEBUG'])
+
+    def test_streaming_body_is_timed(self):
+        self.client.force_login(self.admin)
+        with self.assertLogs('submissions.middleware', level='DEBUG') as logs:
+            response = self.client.get(reverse('submissions:admin-export', args=['submissions', 'csv']))
+            self.assertNotIn('Server-Timing', response)
+            timings = response.wsgi_request.timings
+            view_queries = timings.query_count
+            self.assertEqual(logs.records, [])
+            b''.join(response.streaming_content)
+
+        # The export's own query only runs while the body is read, and the request is logged after that.
+        self.assertGreater(timings.query_count, view_queries)
+        self.assertEqual(logs.records[0].timings['queries'], timings.query_count)
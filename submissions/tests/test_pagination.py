@@ -0,0 +1,123 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from submissions import models
+from submissions.pagination import KeysetPaginator, decode_cursor, encode_cursor
+from submissions.tests.helpers import create_event, create_submission, create_user
+
+
+class CursorTests(TestCase):
+    def test_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(['Game', 5]), 2), ['Game', 5])
+
+    def test_times_keep_microseconds(self):
+        value = datetime.datetime(2020, 6, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+        self.assertEqual(decode_cursor(encode_cursor([value]), 1), ['2020-06-01T12:00:00.123456+00:00'])
+
+    def test_invalid_cursors(self):
+        for cursor in ['', 'not base64!', encode_cursor(['Game']), encode_cursor({'id': 5})]:
+            self.assertIsNone(decode_cursor(cursor, 2), cursor)
+
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        # Duplicate names make sure the unique id breaks ties.
+        for i in range(25):
+            User.objects.create(username='runner{:02}'.format(i // 2 * 2) + ('' if i % 2 else '_'))
+        cls.expected = list(User.objects.order_by('username', 'id').values_list('pk', flat=True))
+
+    def paginator(self):
+        return KeysetPaginator(get_user_model().objects.all(), ['username', 'id'], 10)
+
+    def test_pages_forwards_and_backwards(self):
+        paginator = self.paginator()
+        pages = [paginator.page()]
+        while pages[-1].has_next:
+            pages.append(paginator.page(after=pages[-1].next_cursor))
+
+        self.assertEqual([[user.pk for user in page] for page in pages],
+                         [self.expected[:10], self.expected[10:20], self.expected[20:]])
+        self.assertFalse(pages[0].has_previous)
+
+        previous = paginator.page(before=pages[2].previous_cursor)
+        self.assertEqual([user.pk for user in previous], self.expected[10:20])
+        self.assertTrue(previous.has_previous)
+        self.assertTrue(previous.has_next)
+
+    def test_tampered_cursors_give_the_first_page(self):
+        paginator = self.paginator()
+        for cursor in [encode_cursor(['runner02', 'x']), encode_cursor(['runner02', None]),
+                       encode_cursor(['runner02', [1]]), encode_cursor(['runner02']), 'garbage']:
+            page = paginator.page(after=cursor)
+            self.assertEqual([user.pk for user in page], self.expected[:10], cursor)
+            self.assertFalse(page.has_previous)
+
+    def test_related_sort_fields(self):
+        paginator = KeysetPaginator(get_user_model().objects.all(), ['profile__pronouns', 'id'], 10)
+        page = paginator.page(after=encode_cursor(['', '3']))
+        self.assertEqual(page.object_list[0].pk, sorted(self.expected)[3])
+
+    def test_times_within_a_millisecond(self):
+        # Rounding the cursor time to the millisecond would show the first row again on the second page.
+        start = timezone.now().replace(microsecond=0)
+        users = list(get_user_model().objects.order_by('pk')[:2])
+        last_login = [start + datetime.timedelta(microseconds=400), start + datetime.timedelta(microseconds=200)]
+        for user, time in zip(users, last_login):
+            user.last_login = time
+            user.save(update_fields=['last_login'])
+
+        paginator = KeysetPaginator(get_user_model().objects.filter(last_login__isnull=False), ['last_login', 'id'], 1)
+        first = paginator.page()
+        second = paginator.page(after=first.next_cursor)
+        self.assertEqual([first.object_list[0].pk, second.object_list[0].pk], [users[1].pk, users[0].pk])
+        self.assertFalse(second.has_next)
+
+
+class SubmissionStatusSortTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        statuses = models.SubmissionCategory.Statuses
+        event = create_event()
+        cls.admin = create_user('admin', admin=True)
+        runner = create_user('runner')
+        for game, status in [('A Game', statuses.PENDING), ('B Game', statuses.ACCEPTED),
+                             ('C Game', statuses.DECLINED), ('D Game', statuses.ACCEPTED)]:
+            create_submission(runner, event, game, categories=[(status, 1)])
+
+    def test_paginate_by_rolled_up_status(self):
+        queryset = models.Submission.objects.with_status()
+        paginator = KeysetPaginator(queryset, ['rolled_up_status', 'game', 'id'], 3)
+        first = paginator.page()
+        second = paginator.page(after=first.next_cursor)
+
+        self.assertEqual([s.game for s in first], ['B Game', 'D Game', 'C Game'])
+        self.assertEqual([s.game for s in second], ['A Game'])
+        self.assertEqual([s.game for s in paginator.page(before=second.previous_cursor)],
+                         ['B Game', 'D Game', 'C Game'])
+
+    def test_admin_sort_shows_status_labels(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('submissions:admin-submissions'), {'sort': 'rolled_up_status'})
+
+        self.assertEqual([s.game for s in response.context['object_list']], ['B Game', 'D Game', 'C Game', 'A Game'])
+        self.assertContains(response, '<td>Accepted</td>', count=2)
+        self.assertNotContains(response, '>ACCEPTED<')
+
+    def test_public_sort_shows_status_labels(self):
+        self.client.force_login(self.admin)
+        url = reverse('submissions:all-submissions')
+
+        response = self.client.get(url, {'sort': 'rolled_up_status'})
+        self.assertEqual([s.game for s in response.context['object_list']], ['B Game', 'D Game', 'C Game', 'A Game'])
+        self.assertContains(response, '<td>Declined</td>', count=1)
+        self.assertNotContains(response, '>DECLINED<')
+
+        # Unknown sorts fall back to the default.
+        response = self.client.get(url, {'sort': 'bogus'})
+        self.assertEqual(response.context['sort'], 'runner')
@@ -0,0 +1,34 @@
+import random
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+
+from submissions import benchmarking
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Query plans are only checked on SQLite')
+class QueryPlanTests(TestCase):
+    """Runs a small version of the audit_queries command, so queries that read whole tables fail the tests."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # With past events the current one is only part of the data, as it would be in production.  Otherwise reading
+        # every row is the best plan for pages showing the whole event.
+        cls.admin, cls.runner = benchmarking.generate_event(random.Random(0), 100, past_events=5)
+        # Query plans depend on table statistics, so gather them once the data is in.
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        cls.small_tables = benchmarking.get_small_tables(100)
+
+    def test_no_full_table_scans(self):
+        for name, user, method, url, data in benchmarking.get_requests(self.admin, self.runner):
+            with self.subTest(name):
+                queries = benchmarking.capture_queries(user, method, url, data)
+                self.assertTrue(queries)
+                self.assertEqual(benchmarking.find_full_scans(name, queries, self.small_tables), [])
+
+    def test_finds_full_scans(self):
+        queries = [('SELECT * FROM submissions_submission WHERE platform = %s', ('NES',))]
+        scans = benchmarking.find_full_scans('test', queries, self.small_tables)
+        self.assertEqual([tables for _sql, _plan, tables in scans], [['submissions_submission']])
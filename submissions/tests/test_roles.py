@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from social_django.models import UserSocialAuth
+
+from submissions import roles
+from submissions.tests.helpers import create_user
+
+
+@override_settings(MARATHON_ADMINS=['admin', 'twice'], MARATHON_SUPERUSERS=['boss'])
+class SyncRolesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_sync_roles(self):
+        admin = create_user('admin')
+        boss = create_user('boss')
+        former = create_user('former', admin=True)
+        runner = create_user('runner')
+
+        self.assertEqual(roles.sync_roles(), {'updated': 3, 'added': 2, 'removed': 1})
+        for user, expected in [(admin, (True, False, True)), (boss, (True, True, True)),
+                               (former, (False, False, False)), (runner, (False, False, False))]:
+            user.refresh_from_db()
+            self.assertEqual((user.is_staff, user.is_superuser,
+                              user.user_permissions.filter(codename='is_event_admin').exists()), expected, user)
+
+        # Nothing left to change the second time.
+        self.assertEqual(roles.sync_roles(), {'updated': 0, 'added': 0, 'removed': 0})
+
+    def test_user_with_two_twitch_accounts(self):
+        user = create_user('twice')
+        UserSocialAuth.objects.create(user=user, provider='twitch', uid='twice-2')
+
+        self.assertEqual(roles.sync_roles(), {'updated': 1, 'added': 1, 'removed': 0})
+        self.assertEqual(user.user_permissions.filter(codename='is_event_admin').count(), 1)
+
+    def test_check_user_roles(self):
+        user = create_user('admin')
+        roles.check_user_roles(user)
+        user.refresh_from_db()
+        self.assertTrue(user.is_staff)
+        self.assertTrue(user.has_perm('submissions.is_event_admin'))
+
+        # Synced users are left alone without any queries.
+        with self.assertNumQueries(0):
+            roles.check_user_roles(user)
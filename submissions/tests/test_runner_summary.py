@@ -0,0 +1,71 @@
+import datetime
+
+from django.test import TestCase
+
+from submissions import forms, models
+from submissions.availability import ONE_HOUR, HourBitmap, event_hour_count, event_start_hour
+from submissions.tests.helpers import create_event, create_submission, create_user
+
+
+class RunnerSummaryTests(TestCase):
+    def setUp(self):
+        self.event = create_event()
+        self.runner = create_user('runner')
+        self.start = event_start_hour(self.event)
+
+    def summary(self):
+        """Get the stored summary, checking it against one built from scratch."""
+        summary = models.RunnerSummary.objects.get(user=self.runner, event=self.event)
+        models.RunnerSummary.objects.filter(pk=summary.pk).delete()
+        rebuilt = models.RunnerSummary.get_for(self.runner, self.event)
+        self.assertEqual((summary.longest_estimate, summary.longest_availability),
+                         (rebuilt.longest_estimate, rebuilt.longest_availability))
+        return summary
+
+    def test_built_lazily_for_existing_runners(self):
+        models.AvailabilityHours.set_user_hours(self.runner, self.event, HourBitmap.from_intervals(
+            self.start, event_hour_count(self.event), [(self.start, 3 * ONE_HOUR)]))
+        create_submission(self.runner, self.event, 'Mega Man 2', categories=[
+            (models.SubmissionCategory.Statuses.PENDING, 1), (models.SubmissionCategory.Statuses.PENDING, 2)])
+        self.assertFalse(models.RunnerSummary.objects.exists())
+
+        summary = models.RunnerSummary.get_for(self.runner, self.event)
+        self.assertEqual((summary.longest_estimate, summary.longest_availability), (2 * ONE_HOUR, 3 * ONE_HOUR))
+        self.assertEqual(models.RunnerSummary.get_for(self.runner, self.event).pk, summary.pk)
+
+    def test_follows_categories(self):
+        models.RunnerSummary.get_for(self.runner, self.event)
+        submission = create_submission(self.runner, self.event, 'Mega Man 2', categories=[
+            (models.SubmissionCategory.Statuses.PENDING, 1), (models.SubmissionCategory.Statuses.PENDING, 2)])
+        self.assertEqual(self.summary().longest_estimate, 2 * ONE_HOUR)
+
+        longest = submission.categories.get(estimate=2 * ONE_HOUR)
+        longest.estimate = datetime.timedelta(minutes=30)
+        longest.save()
+        self.assertEqual(self.summary().longest_estimate, ONE_HOUR)
+
+        submission.categories.get(estimate=ONE_HOUR).delete()
+        self.assertEqual(self.summary().longest_estimate, datetime.timedelta(minutes=30))
+
+        submission.delete()
+        self.assertEqual(self.summary().longest_estimate, datetime.timedelta())
+
+    def test_follows_availability(self):
+        models.RunnerSummary.get_for(self.runner, self.event)
+        models.Availability.set_user_availability(self.runner, self.event, [
+            (self.start, 2 * ONE_HOUR), (self.start + 5 * ONE_HOUR, 4 * ONE_HOUR)])
+        self.assertEqual(self.summary().longest_availability, 4 * ONE_HOUR)
+
+        models.Availability.set_user_availability(self.runner, self.event, [(self.start, 2 * ONE_HOUR)])
+        self.assertEqual(self.summary().longest_availability, 2 * ONE_HOUR)
+
+    def test_category_form_checks_summary(self):
+        models.Availability.set_user_availability(self.runner, self.event, [(self.start, 2 * ONE_HOUR)])
+        models.RunnerSummary.get_for(self.runner, self.event)
+        data = {'category': 'Any%', 'estimate': '03:00:00', 'video': 'https://example.com/video'}
+        form = forms.public.SubmitCategoryForm(self.event, self.runner, data=data)
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+
+        data['estimate'] = '02:00:00'
+        self.assertTrue(forms.public.SubmitCategoryForm(self.event, self.runner, data=data).is_valid())
@@ -0,0 +1,116 @@
+import datetime
+import random
+
+from django.test import SimpleTestCase
+
+from submissions.scheduling import AvailabilityIndex, Scheduler, ScheduleRun
+
+START = datetime.datetime(2020, 6, 1, 12, tzinfo=datetime.timezone.utc)
+END = START + datetime.timedelta(hours=24)
+HOUR = datetime.timedelta(hours=1)
+SETUP = datetime.timedelta(minutes=10)
+RACE_SETUP = datetime.timedelta(minutes=20)
+
+
+def run(key, runner, hours, race=False):
+    return ScheduleRun(key, runner, hours * HOUR, race, key)
+
+
+class AvailabilityIndexTests(SimpleTestCase):
+    def test_merges_overlapping_intervals(self):
+        index = AvailabilityIndex([(50, 80), (0, 10), (5, 20), (20, 30), (40, 40)])
+        self.assertEqual(index.starts, [0, 50])
+        self.assertEqual(index.ends, [30, 80])
+
+    def test_searches(self):
+        index = AvailabilityIndex([(0, 30), (50, 80)])
+        self.assertTrue(index.covers(10, 30))
+        self.assertFalse(index.covers(20, 60))
+        self.assertEqual(index.earliest_start(25, 10, 100), 50)
+        self.assertIsNone(index.earliest_start(25, 40, 100))
+        self.assertEqual(index.latest_start(10, 60), 50)
+        self.assertEqual(index.latest_start(10, 45), 20)
+
+
+class SchedulerTests(SimpleTestCase):
+    def build(self, runs, availability):
+        return Scheduler(START, END, runs, availability, SETUP, RACE_SETUP).build()
+
+    @staticmethod
+    def merge(intervals):
+        """Merge touching and overlapping availability, since a run can span more than one block."""
+        merged = []
+        for start, duration in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], start + duration)
+            else:
+                merged.append([start, start + duration])
+        return merged
+
+    def assertValid(self, schedule, availability):
+        """Check every run is inside its runner's availability and gets its setup buffer after the previous run."""
+        previous_end = START
+        for i, entry in enumerate(schedule.entries):
+            self.assertEqual(entry.end_time - entry.start_time, entry.run.estimate)
+            if i:
+                self.assertEqual(entry.start_time - entry.setup_time, RACE_SETUP if entry.run.race else SETUP)
+            self.assertGreaterEqual(entry.setup_time, previous_end)
+            self.assertLessEqual(entry.end_time, END)
+            self.assertTrue(any(start <= entry.start_time and entry.end_time <= end
+                                for start, end in self.merge(availability[entry.run.runner])), entry)
+            previous_end = entry.end_time
+
+    def test_setup_buffers(self):
+        availability = {'a': [(START, 24 * HOUR)], 'b': [(START, 24 * HOUR)]}
+        schedule = self.build([run('one', 'a', 1), run('two', 'b', 1, race=True), run('three', 'a', 2)],
+                              availability)
+        self.assertValid(schedule, availability)
+        self.assertEqual(len(schedule.entries), 3)
+        self.assertEqual(schedule.entries[0].start_time, START)
+        self.assertEqual(schedule.idle_time, datetime.timedelta())
+        self.assertEqual(schedule.scheduled_time, 4 * HOUR)
+
+    def test_runs_wait_for_availability(self):
+        availability = {'a': [(START + 5 * HOUR, 2 * HOUR)]}
+        schedule = self.build([run('one', 'a', 2)], availability)
+        self.assertEqual(schedule.entries[0].start_time, START + 5 * HOUR)
+        self.assertEqual(schedule.idle_time, 5 * HOUR)
+
+    def test_unplaceable_runs(self):
+        availability = {'a': [(START, 2 * HOUR)], 'b': [(START, HOUR)], 'c': [(START, HOUR)]}
+        schedule = self.build([run('long', 'a', 3), run('nobody', 'x', 1), run('first', 'b', 1),
+                               run('clash', 'c', 1)], availability)
+        reasons = {unplaced.run.key: unplaced.reason for unplaced in schedule.unplaced}
+        self.assertEqual(reasons, {
+            'long': 'No availability block is long enough for the estimate',
+            'nobody': 'Runner has no availability',
+            'clash': 'No room in the schedule while the runner is available',
+        })
+        self.assertEqual([entry.run.key for entry in schedule.entries], ['first'])
+
+    def test_swaps_to_fit_more_runs(self):
+        # Greedily placing the flexible run first would block the run that can only go at the start.
+        availability = {'flexible': [(START, 24 * HOUR)], 'fixed': [(START, 2 * HOUR)]}
+        schedule = self.build([run('flexible', 'flexible', 1), run('fixed', 'fixed', 2)], availability)
+        self.assertValid(schedule, availability)
+        self.assertEqual([entry.run.key for entry in schedule.entries], ['fixed', 'flexible'])
+
+    def test_random_schedules_are_valid(self):
+        rnd = random.Random(1)
+        for _ in range(20):
+            availability = {}
+            runs = []
+            for runner in range(15):
+                blocks = []
+                for _ in range(rnd.randint(1, 3)):
+                    start = START + rnd.randint(0, 22) * HOUR
+                    blocks.append((start, min(rnd.randint(1, 8) * HOUR, END - start)))
+                availability[runner] = blocks
+                for i in range(rnd.randint(1, 3)):
+                    runs.append(ScheduleRun((runner, i), runner, datetime.timedelta(minutes=rnd.randint(10, 180)),
+                                            rnd.random() < 0.2, ''))
+
+            schedule = self.build(runs, availability)
+            self.assertValid(schedule, availability)
+            self.assertEqual(len(schedule.entries) + len(schedule.unplaced), len(runs))
+            self.assertEqual(len({entry.run.key for entry in schedule.entries}), len(schedule.entries))
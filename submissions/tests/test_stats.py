@@ -0,0 +1,107 @@
+import datetime
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from submissions import models
+from submissions.tests.helpers import create_event, create_submission, create_user
+
+STATUSES = models.SubmissionCategory.Statuses
+TOTALS = ['submissions', 'runners', 'pending_categories', 'declined_categories', 'accepted_categories',
+          'accepted_seconds', 'available_runners']
+
+
+class EventStatsTests(TestCase):
+    def setUp(self):
+        self.event = create_event()
+        self.runners = [create_user('runner{}'.format(i)) for i in range(3)]
+
+    def assertStatsMatchRebuild(self):
+        stats = models.EventStats.objects.filter(event=self.event).values(*TOTALS).get()
+        self.assertEqual(stats, models.EventStats.objects.filter(
+            pk=models.EventStats.rebuild(self.event.pk).pk).values(*TOTALS).get())
+        return stats
+
+    def test_submissions_and_runners(self):
+        first = create_submission(self.runners[0], self.event, 'Mega Man 2')
+        create_submission(self.runners[0], self.event, 'Mega Man 3')
+        create_submission(self.runners[1], self.event, 'Zelda')
+        stats = self.assertStatsMatchRebuild()
+        self.assertEqual((stats['submissions'], stats['runners']), (3, 2))
+
+        first.delete()
+        stats = self.assertStatsMatchRebuild()
+        self.assertEqual((stats['submissions'], stats['runners']), (2, 2))
+
+        models.Submission.objects.filter(user=self.runners[0]).delete()
+        stats = self.assertStatsMatchRebuild()
+        self.assertEqual((stats['submissions'], stats['runners']), (1, 1))
+
+    def test_new_submission_checks_only_its_runner(self):
+        create_submission(self.runners[0], self.event, 'Mega Man 2')
+        with CaptureQueriesContext(connection) as queries:
+            create_submission(self.runners[0], self.event, 'Mega Man 3', categories=[])
+        self.assertFalse([query['sql'] for query in queries if 'COUNT(DISTINCT' in query['sql']])
+        stats = self.assertStatsMatchRebuild()
+        self.assertEqual((stats['submissions'], stats['runners']), (2, 1))
+
+    def test_category_deltas(self):
+        submission = create_submission(self.runners[0], self.event, 'Mega Man 2', categories=[
+            (STATUSES.PENDING, 1), (STATUSES.PENDING, 2), (STATUSES.DECLINED, 1)])
+        categories = list(submission.categories.order_by('pk'))
+
+        models.SubmissionCategory.set_statuses(categories[:2], STATUSES.ACCEPTED)
+        stats = self.assertStatsMatchRebuild()
+        self.assertEqual((stats['pending_categories'], stats['accepted_categories'], stats['accepted_seconds']),
+                         (0, 2, 3 * 3600))
+
+        category = models.SubmissionCategory.objects.get(pk=categories[1].pk)
+        category.estimate = datetime.timedelta(minutes=30)
+        category.save()
+        self.assertEqual(self.assertStatsMatchRebuild()['accepted_seconds'], 5400)
+
+        category.delete()
+        categories[2].status = STATUSES.PENDING
+        categories[2].save()
+        stats = self.assertStatsMatchRebuild()
+        self.assertEqual((stats['pending_categories'], stats['declined_categories'], stats['accepted_categories']),
+                         (1, 0, 1))
+
+    def test_unloaded_category_counts_again(self):
+        submission = create_submission(self.runners[0], self.event, 'Mega Man 2')
+        version = models.EventStats.objects.get(event=self.event).version
+        category = submission.categories.get()
+        unloaded = models.SubmissionCategory(**{field.attname: getattr(category, field.attname)
+                                                for field in category._meta.concrete_fields})
+        unloaded.status = STATUSES.ACCEPTED
+        unloaded.save()
+        self.assertEqual(self.assertStatsMatchRebuild()['accepted_categories'], 1)
+        self.assertGreater(models.EventStats.objects.get(event=self.event).version, version)
+
+    def test_deferred_category_counts_again(self):
+        submission = create_submission(self.runners[0], self.event, 'Mega Man 2', categories=[
+            (STATUSES.PENDING, 1), (STATUSES.PENDING, 2)])
+
+        first, second = models.SubmissionCategory.objects.only('id', 'category', 'game').order_by('pk')
+        first.category = 'Any%'
+        first.save()
+        self.assertStatsMatchRebuild()
+
+        second.status = STATUSES.ACCEPTED
+        second.save()
+        self.assertEqual(self.assertStatsMatchRebuild()['accepted_categories'], 1)
+
+        models.SubmissionCategory.objects.only('id', 'game').get(pk=first.pk).delete()
+        stats = self.assertStatsMatchRebuild()
+        self.assertEqual((stats['pending_categories'], stats['accepted_categories']), (0, 1))
+        self.assertEqual(submission.categories.count(), 1)
+
+    def test_available_runners(self):
+        start = self.event.start_date
+        models.Availability.set_user_availability(self.runners[0], self.event, [(start, datetime.timedelta(hours=2))])
+        models.Availability.set_user_availability(self.runners[1], self.event, [(start, datetime.timedelta(hours=1))])
+        self.assertEqual(self.assertStatsMatchRebuild()['available_runners'], 2)
+
+        models.Availability.set_user_availability(self.runners[0], self.event, [])
+        self.assertEqual(self.assertStatsMatchRebuild()['available_runners'], 1)
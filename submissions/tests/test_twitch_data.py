@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+from django.test import TestCase
+from django.urls import reverse
+
+from submissions import models, pipeline
+from submissions.tests.helpers import create_event, create_user
+
+
+class TwitchDataTests(TestCase):
+    def setUp(self):
+        create_event()
+        self.user = create_user('runner')
+        self.user.social_auth.update(extra_data={
+            'name': 'runner', 'display_name': 'Runner', 'logo': 'https://example.com/logo.png',
+            'access_token': 'secret', 'refresh_token': 'also secret'})
+
+    def test_pipeline_stores_display_fields_only(self):
+        strategy = SimpleNamespace(data={})
+        strategy.session_set = strategy.data.__setitem__
+        pipeline.cache_twitch_data(SimpleNamespace(name='twitch'), strategy, social=self.user.social_auth.get())
+
+        self.assertEqual(strategy.data, {models.TWITCH_DATA_SESSION_KEY: {
+            'name': 'runner', 'display_name': 'Runner', 'logo': 'https://example.com/logo.png'}})
+
+    def test_session_falls_back_to_database(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('submissions:my-submissions'))
+
+        self.assertContains(response, 'Runner')
+        self.assertEqual(self.client.session[models.TWITCH_DATA_SESSION_KEY], {
+            'name': 'runner', 'display_name': 'Runner', 'logo': 'https://example.com/logo.png'})
+
+        # Later requests use the session snapshot, which never holds the tokens.
+        self.user.social_auth.update(extra_data={})
+        self.assertContains(self.client.get(reverse('submissions:my-submissions')), 'Runner')
+        self.assertNotIn('secret', str(dict(self.client.session)))
@@ -15,8 +15,22 @@ urlpatterns = [
     path('submissions/all', views.public.AllSubmissionsView.as_view(), name='all-submissions'),
     path('submissions/edit/<int:pk>', views.public.EditSubmissionView.as_view(), name='edit-submission'),
     path('submissions/delete/<int:pk>', views.public.DeleteSubmissionView.as_view(), name='delete-submission'),
+    path('games/search', views.public.GameSearchView.as_view(), name='game-search'),
 
     # Admin views
     path('admin/settings', views.admin.SettingsView.as_view(), name='admin-settings'),
     path('admin/submissions', views.admin.SubmissionsView.as_view(), name='admin-submissions'),
+    path('admin/review', views.admin.ReviewView.as_view(), name='admin-review'),
+    path('admin/games', views.admin.GameGroupsView.as_view(), name='admin-games'),
+    path('admin/coverage', views.admin.CoverageView.as_view(), name='admin-coverage'),
+    path('admin/archives', views.admin.ArchivesView.as_view(), name='admin-archives'),
+    path('admin/archives/<int:pk>', views.admin.ArchiveView.as_view(), name='admin-archive'),
+    path('admin/schedule', views.admin.ScheduleView.as_view(), name='admin-schedule'),
+    path('admin/export/<str:kind>.<str:format>', views.admin.ExportView.as_view(), name='admin-export'),
+
+    # Read-only JSON API, versioned so clients don't break when it changes.
+    path('api/v1/event', views.api.EventApiView.as_view(), name='api-v1-event'),
+    path('api/v1/submissions', views.api.SubmissionsApiView.as_view(), name='api-v1-submissions'),
+    path('api/v1/availability', views.api.AvailabilityApiView.as_view(), name='api-v1-availability'),
+    path('api/v1/schedule', views.api.ScheduleApiView.as_view(), name='api-v1-schedule'),
 ]
@@ -1,3 +1,4 @@
 from . import admin
+from . import api
 from . import common
 from . import public
@@ -1,18 +1,27 @@
 """Admin views for marathon submissions."""
 
+import csv
+import datetime
+import json
 import logging
 
 from django.contrib import messages
+from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.db.models import Prefetch
-from django.http import HttpResponseRedirect
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery, Sum
+from django.http import Http404, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.text import slugify
 from django.utils.translation import gettext as _
-from django.views.generic import UpdateView, ListView
+from django.views.generic import FormView, UpdateView, ListView, TemplateView, View
 from social_django.models import UserSocialAuth
 
-from submissions import forms, models
-from submissions.views.common import SubmissionViewMixIn
+from submissions import archive, coverage, forms, game_names, models, scheduling
+from submissions.pagination import KeysetPaginator
+from submissions.views.common import ConditionalGetMixIn, SubmissionViewMixIn
 
 logger = logging.getLogger(__name__)
 
@@ -45,14 +54,315 @@ class SettingsView(AdminViewMixIn, UpdateView):
         return reverse('submissions:admin-settings')
 
 
-class SubmissionsView(AdminViewMixIn, ListView):
+class SubmissionsView(AdminViewMixIn, ConditionalGetMixIn, ListView):
+    """Filtered list of submissions for the current event, one page at a time using keyset pagination."""
     template_name = 'submissions/admin/submissions.html'
+    page_size = 50
 
     def get_queryset(self):
-        return models.Submission.objects.filter(event=self.event).select_related(
-            'event', 'user', 'user__profile').prefetch_related(
+        self.filter_form = forms.admin.SubmissionFilterForm(self.request.GET)
+        return self.filter_form.filter_queryset(models.Submission.objects.filter(event=self.event).with_status())
+
+    def get_context_data(self, **kwargs):
+        """Get the current page of submissions, only prefetching related data for the submissions on the page."""
+        queryset = self.object_list.select_related('event', 'user', 'user__profile').prefetch_related(
             'categories', Prefetch('user__social_auth',
                                    UserSocialAuth.objects.filter(provider='twitch'), to_attr='twitch_auth'),
             Prefetch('user__availabilities', models.Availability.objects.filter(event=self.event),
                      to_attr='current_event_availabilities')
         )
+        page = KeysetPaginator(queryset, self.filter_form.ordering, self.page_size).page(
+            after=self.request.GET.get('after'), before=self.request.GET.get('before'))
+
+        models.set_fragment_versions(page.object_list)
+
+        # Keep the current filters in the page links.
+        query = self.request.GET.copy()
+        query.pop('after', None)
+        query.pop('before', None)
+
+        kwargs.update({
+            'object_list': page.object_list,
+            'page': page,
+            'filter_form': self.filter_form,
+            'filter_query': query.urlencode(),
+            'stats': models.EventStats.get_for_event(self.event),
+            'export_kinds': ['submissions', 'categories', 'runners', 'availability'],
+            'fragment_cache_timeout': models.FRAGMENT_CACHE_TIMEOUT,
+            'review_statuses': [
+                (models.SubmissionCategory.Statuses.ACCEPTED, _('Accept')),
+                (models.SubmissionCategory.Statuses.DECLINED, _('Decline')),
+                (models.SubmissionCategory.Statuses.PENDING, _('Reset')),
+            ],
+        })
+        return super().get_context_data(**kwargs)
+
+
+class ReviewView(AdminViewMixIn, FormView):
+    """Accept or decline many categories of the current event in one request, returning a JSON summary."""
+    form_class = forms.admin.ReviewForm
+    http_method_names = ['post']
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['event'] = self.event
+        return kwargs
+
+    def form_valid(self, form):
+        status = form.cleaned_data['status']
+        categories = form.cleaned_data['categories']
+        with transaction.atomic():
+            changed = models.SubmissionCategory.set_statuses(categories, status)
+
+        logger.info("User {!r} set {} categories to {}".format(self.request.user.username, len(changed), status))
+        return JsonResponse({
+            'status': status,
+            'updated': sorted(category.pk for category in changed),
+            'unchanged': len(categories) - len(changed),
+        })
+
+    def form_invalid(self, form):
+        return JsonResponse({'errors': form.errors}, status=400)
+
+
+class EchoBuffer:
+    """File-like object that hands back what's written to it, so the CSV writer can produce rows for streaming."""
+
+    def write(self, value):
+        return value
+
+
+class ExportView(AdminViewMixIn, View):
+    """Export submissions, categories, runners or availability for the current event as CSV or newline-delimited JSON.
+
+    Takes the same filter parameters as the submissions admin list, and exports the matching submissions or the data
+    related to them.  Rows are read from the database in chunks as the response is streamed, so memory use stays flat.
+    """
+    chunk_size = 500
+    formats = {
+        'csv': 'text/csv',
+        'json': 'application/x-ndjson',
+    }
+
+    def get(self, request, *args, **kwargs):
+        # This replaces the mix-in's get(), so look up the event and check the user here instead.
+        redirect_view = self._do_extra_data_checks()
+        if redirect_view:
+            return redirect_view
+
+        kind, export_format = kwargs['kind'], kwargs['format']
+        if export_format not in self.formats:
+            raise Http404
+        columns, rows = self.get_export(kind)
+
+        stream = self.stream_csv(columns, rows) if export_format == 'csv' else self.stream_json(rows)
+        response = StreamingHttpResponse(stream, content_type=self.formats[export_format])
+        # Slugified so quotes or other odd characters in the event name can't break the header.
+        response['Content-Disposition'] = 'attachment; filename="{}-{}.{}"'.format(
+            slugify(self.event.name) or 'event', kind, export_format)
+        return response
+
+    def get_export(self, kind):
+        """Get the columns and rows to export.
+
+        Args:
+            kind (str): Kind of data to export from the URL.
+
+        Returns:
+            tuple[list[str]|iterable[dict]]: Column names, and an iterator of row dictionaries keyed by column name.
+
+        """
+        exports = {
+            'submissions': self.export_submissions,
+            'categories': self.export_categories,
+            'runners': self.export_runners,
+            'availability': self.export_availability,
+        }
+        if kind not in exports:
+            raise Http404
+
+        filter_form = forms.admin.SubmissionFilterForm(self.request.GET)
+        submissions = filter_form.filter_queryset(models.Submission.objects.filter(event=self.event).with_status())
+        return exports[kind](submissions)
+
+    @staticmethod
+    def csv_value(value):
+        if isinstance(value, datetime.datetime):
+            return value.isoformat()
+        if isinstance(value, datetime.timedelta):
+            return str(value)
+        return value
+
+    def stream_csv(self, columns, rows):
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow([self.csv_value(row[c]) for c in columns])
+
+    @staticmethod
+    def stream_json(rows):
+        for row in rows:
+            yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+    def iterate(self, queryset, columns):
+        return queryset.values(*columns).iterator(chunk_size=self.chunk_size)
+
+    def export_submissions(self, submissions):
+        columns = ['id', 'user__username', 'game', 'platform', 'release_year', 'twitch_game', 'description',
+                   'rolled_up_status']
+        return columns, self.iterate(submissions.order_by('game', 'id'), columns)
+
+    def export_categories(self, submissions):
+        columns = ['id', 'game_id', 'game__game', 'game__user__username', 'category', 'status', 'race', 'estimate',
+                   'video']
+        categories = models.SubmissionCategory.objects.filter(game__in=submissions.values('pk')).order_by(
+            'game__game', 'game_id', 'id')
+        return columns, self.iterate(categories, columns)
+
+    def export_runners(self, submissions):
+        columns = ['id', 'username', 'profile__pronouns', 'twitch_name', 'twitch_display_name']
+        twitch_data = UserSocialAuth.objects.filter(user=OuterRef('pk'), provider='twitch').values('extra_data')[:1]
+        runners = get_user_model().objects.filter(pk__in=submissions.values('user')).annotate(
+            twitch_data=Subquery(twitch_data)).order_by('username')
+
+        def rows():
+            for row in self.iterate(runners, ['id', 'username', 'profile__pronouns', 'twitch_data']):
+                twitch_data = row.pop('twitch_data') or {}
+                row['twitch_name'] = twitch_data.get('name')
+                row['twitch_display_name'] = twitch_data.get('display_name')
+                yield row
+
+        return columns, rows()
+
+    def export_availability(self, submissions):
+        columns = ['id', 'user__username', 'start_time', 'duration']
+        availability = models.Availability.objects.filter(
+            event=self.event, user__in=submissions.values('user')).order_by('user__username', 'start_time')
+        return columns, self.iterate(availability, columns)
+
+
+class CoverageView(AdminViewMixIn, TemplateView):
+    """Heatmap of how many runners are available and how many accepted runs could start in each hour of the event."""
+    template_name = 'submissions/admin/coverage.html'
+
+    def get_context_data(self, **kwargs):
+        kwargs['coverage'] = coverage.get_event_coverage(self.event)
+        kwargs['max_runners'] = max([hour.runners for hour in kwargs['coverage']], default=0)
+        kwargs['max_runs'] = max([hour.runs for hour in kwargs['coverage']], default=0)
+        return super().get_context_data(**kwargs)
+
+
+class GameGroupsView(AdminViewMixIn, TemplateView):
+    """Submissions for the current event grouped by game, to spot the same game submitted under different spellings."""
+    template_name = 'submissions/admin/games.html'
+
+    def get_context_data(self, **kwargs):
+        form = forms.admin.GameGroupsForm(self.request.GET or {'min_submissions': 2})
+        options = form.cleaned_data if form.is_valid() else {'min_submissions': 2, 'similar': False}
+        groups = self.get_groups(options['similar'])
+        kwargs['groups'] = [group for group in groups if group['submissions'] >= (options['min_submissions'] or 1)]
+        kwargs['form'] = form
+        return super().get_context_data(**kwargs)
+
+    def get_groups(self, similar):
+        """Count submissions, runners and categories for each game.  Totals are added up in the database for each game
+        key, then combined in Python if similar keys are grouped too.
+
+        Args:
+            similar (bool): Whether to group game keys that are only similar as well as identical ones.
+
+        Returns:
+            list[dict]: Groups with the most submissions first.
+
+        """
+        submissions = models.Submission.objects.filter(event=self.event)
+        totals = submissions.values('game_key').annotate(
+            submission_count=Count('id', distinct=True),
+            category_count=Count('categories'),
+            accepted_count=Count('categories', filter=Q(
+                categories__status=models.SubmissionCategory.Statuses.ACCEPTED)),
+            total_estimate=Sum('categories__estimate'),
+        ).order_by()
+
+        # Group keys map to themselves unless similar ones are combined.
+        totals = {row['game_key']: row for row in totals}
+        group_keys = game_names.group_similar(totals) if similar else {key: key for key in totals}
+
+        groups = {}
+        for key, row in totals.items():
+            group = groups.setdefault(group_keys[key], {
+                'key': group_keys[key], 'names': set(), 'runners': set(), 'submissions': 0, 'categories': 0,
+                'accepted': 0, 'total_estimate': datetime.timedelta(),
+            })
+            group['submissions'] += row['submission_count']
+            group['categories'] += row['category_count']
+            group['accepted'] += row['accepted_count']
+            group['total_estimate'] += row['total_estimate'] or datetime.timedelta()
+
+        # A runner can be in more than one key of a similar group, so runners are collected rather than counted.
+        for key, game, username in submissions.values_list('game_key', 'game', 'user__username').distinct():
+            groups[group_keys[key]]['names'].add(game)
+            groups[group_keys[key]]['runners'].add(username)
+
+        for group in groups.values():
+            group['names'] = sorted(group['names'], key=str.casefold)
+            group['runners'] = sorted(group['runners'], key=str.casefold)
+            group['average_estimate'] = (group['total_estimate'] / group['categories'] if group['categories'] else
+                                         None)
+        return sorted(groups.values(), key=lambda g: (-g['submissions'], g['key']))
+
+
+class ArchivesView(AdminViewMixIn, ListView):
+    """List of past events archived with the archive_events command."""
+    template_name = 'submissions/admin/archives.html'
+    context_object_name = 'archives'
+
+    def get_queryset(self):
+        return models.EventArchive.objects.select_related('event__stats')
+
+
+class ArchiveView(AdminViewMixIn, TemplateView):
+    """Read-only view of an archived event's submissions, read straight from its archive file a page at a time."""
+    template_name = 'submissions/admin/archive.html'
+    page_size = 100
+
+    def get_context_data(self, **kwargs):
+        event_archive = get_object_or_404(models.EventArchive.objects.select_related('event__stats'),
+                                          event=self.kwargs['pk'])
+        try:
+            page = max(1, int(self.request.GET.get('page', 1)))
+        except ValueError:
+            page = 1
+
+        # Read one more than a page to tell whether there's a next page.
+        submissions = []
+        try:
+            submissions = archive.read_submissions(event_archive.path, (page - 1) * self.page_size, self.page_size + 1)
+        except OSError as e:
+            logger.error('Could not read archive {}: {}'.format(event_archive.path, e))
+            messages.error(self.request, _('The archive file for this event could not be read.'))
+        for submission in submissions:
+            for category in submission['categories']:
+                category['status_display'] = models.SubmissionCategory.Statuses(category['status']).label
+
+        kwargs.update({
+            'archive': event_archive,
+            'submissions': submissions[:self.page_size],
+            'page': page,
+            'has_next': len(submissions) > self.page_size,
+        })
+        return super().get_context_data(**kwargs)
+
+
+class ScheduleView(AdminViewMixIn, TemplateView):
+    """Build a draft schedule for the current event from accepted runs and runner availability."""
+    template_name = 'submissions/admin/schedule.html'
+
+    def get_context_data(self, **kwargs):
+        # Only build the schedule once the buffer settings have been submitted, since it's not a cheap page.
+        form = forms.admin.ScheduleForm(self.request.GET or None)
+        if form.is_valid():
+            kwargs['schedule'] = scheduling.build_event_schedule(
+                self.event, form.cleaned_data['setup_buffer'], form.cleaned_data['race_setup_buffer'])
+        kwargs['form'] = form
+        return super().get_context_data(**kwargs)
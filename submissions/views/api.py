@@ -0,0 +1,263 @@
+"""Read-only JSON API for the current event, for stream overlays, schedule tools and scripts."""
+
+from django.db.models import Prefetch
+from django.http import JsonResponse
+from django.views.generic import View
+from social_django.models import UserSocialAuth
+
+from submissions import forms, models, scheduling
+from submissions.pagination import KeysetPaginator
+from submissions.views.common import ConditionalGetMixIn
+
+# Default and maximum number of items per page.
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class ApiError(Exception):
+    """Problem with the request parameters, returned to the client as a 400 response."""
+
+
+class ApiView(View):
+    """Base view for read-only API endpoints on the current event.
+
+    Subclasses implement get_data() to return the response body as a dict, raising ApiError for bad parameters.  Unlike
+    the HTML views, problems are returned as JSON errors instead of redirects.
+    """
+    permission_required = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': 'Authentication required'}, status=401)
+        if self.permission_required and not request.user.has_perm(self.permission_required):
+            return JsonResponse({'error': 'Permission denied'}, status=403)
+
+        self.event = models.Event.get_current_event()
+        if not self.event:
+            return JsonResponse({'error': 'No current event'}, status=404)
+        return super().dispatch(request, *args, **kwargs)
+
+    def get(self, request, *args, **kwargs):
+        try:
+            return JsonResponse(self.get_data())
+        except ApiError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+
+class ListApiView(ApiView):
+    """Base view for API endpoints listing objects a page at a time.
+
+    Pages are requested with ?after= or ?before= cursors from the previous response, and ?limit= items.  Fields can be
+    picked with ?fields=a,b,c to keep responses small.
+    """
+    # Model listed, filtered to the current event.
+    model = None
+    # Unique sort key fields to paginate by.
+    ordering = ['id']
+    # Field names mapped to functions getting the value of the field for an object.
+    fields = {}
+
+    def get_queryset(self, fields):
+        """
+        Args:
+            fields (list[str]): Fields selected for the response, to only fetch related data that's needed.
+
+        Returns:
+            django.db.models.QuerySet: Objects to list.
+
+        """
+        return self.model.objects.filter(event=self.event)
+
+    def get_ordering(self):
+        """
+        Returns:
+            list[str]: Unique sort key fields to paginate by.
+
+        """
+        return self.ordering
+
+    def get_fields(self):
+        """
+        Returns:
+            list[str]: Fields selected with ?fields=, or all fields if not given.
+
+        """
+        if not self.request.GET.get('fields'):
+            return list(self.fields)
+
+        selected = [field for field in self.request.GET['fields'].split(',') if field]
+        unknown = [field for field in selected if field not in self.fields]
+        if unknown:
+            raise ApiError('Unknown fields: {}'.format(', '.join(unknown)))
+        return selected
+
+    def get_page_size(self):
+        try:
+            limit = int(self.request.GET.get('limit', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise ApiError('limit must be a number')
+        return max(1, min(limit, MAX_PAGE_SIZE))
+
+    def get_data(self):
+        fields = self.get_fields()
+        page = KeysetPaginator(self.get_queryset(fields), self.get_ordering(), self.get_page_size()).page(
+            after=self.request.GET.get('after'), before=self.request.GET.get('before'))
+        return {
+            'data': [{field: self.fields[field](obj) for field in fields} for obj in page],
+            'next': page.next_cursor,
+            'previous': page.previous_cursor,
+        }
+
+
+def twitch_data(user):
+    """Get Twitch data for a user prefetched into a twitch_auth attribute."""
+    return user.twitch_auth[0].extra_data if user.twitch_auth else {}
+
+
+def runner_data(user):
+    """
+    Args:
+        user (django.contrib.auth.models.User): Runner with twitch_auth and profile loaded.
+
+    Returns:
+        dict: Public details for the runner.
+
+    """
+    return {
+        'id': user.pk,
+        'username': user.username,
+        'display_name': twitch_data(user).get('display_name'),
+        'pronouns': user.profile.pronouns,
+    }
+
+
+def category_data(category):
+    return {
+        'id': category.pk,
+        'category': category.category,
+        'status': category.status,
+        'race': category.race,
+        'estimate': category.estimate,
+        'video': category.video,
+    }
+
+
+class EventApiView(ConditionalGetMixIn, ApiView):
+    """Details of the current event."""
+
+    def get_data(self):
+        return {
+            'id': self.event.pk,
+            'name': self.event.name,
+            'stage': self.event.stage,
+            'start_date': self.event.start_date,
+            'end_date': self.event.end_date,
+            'max_games': self.event.max_games,
+            'max_categories': self.event.max_categories,
+        }
+
+
+class SubmissionsApiView(ConditionalGetMixIn, ListApiView):
+    """Submissions for the current event with their categories and runners.
+
+    Takes the same filter parameters as the submissions admin list, e.g. ?status=ACCEPTED or ?sort=runner.
+    """
+    model = models.Submission
+    fields = {
+        'id': lambda s: s.pk,
+        'game': lambda s: s.game,
+        'platform': lambda s: s.platform,
+        'release_year': lambda s: s.release_year,
+        'twitch_game': lambda s: s.twitch_game,
+        'description': lambda s: s.description,
+        'status': lambda s: s.status,
+        'runner': lambda s: runner_data(s.user),
+        'categories': lambda s: [category_data(c) for c in s.categories.all()],
+    }
+
+    def get_queryset(self, fields):
+        self.filter_form = forms.admin.SubmissionFilterForm(self.request.GET)
+        if self.filter_form.errors:
+            raise ApiError(self.filter_form.errors.as_text())
+
+        # The runner is always joined since the sort key can include their username.
+        queryset = self.filter_form.filter_queryset(
+            super().get_queryset(fields).with_status().select_related('user', 'user__profile'))
+        if 'runner' in fields:
+            queryset = queryset.prefetch_related(
+                Prefetch('user__social_auth', UserSocialAuth.objects.filter(provider='twitch'),
+                         to_attr='twitch_auth'))
+        if 'categories' in fields:
+            queryset = queryset.prefetch_related('categories')
+        return queryset
+
+    def get_ordering(self):
+        return self.filter_form.ordering
+
+
+class AvailabilityApiView(ConditionalGetMixIn, ListApiView):
+    """Availability windows for runners in the current event.  Only for event admins, like the admin submissions
+    list.
+    """
+    permission_required = 'submissions.is_event_admin'
+    model = models.Availability
+    ordering = ['user_id', 'start_time', 'id']
+    fields = {
+        'id': lambda a: a.pk,
+        'runner': lambda a: runner_data(a.user),
+        'start_time': lambda a: a.start_time,
+        'end_time': lambda a: a.end_time,
+        'hours': lambda a: a.hours,
+    }
+
+    def get_queryset(self, fields):
+        queryset = super().get_queryset(fields)
+        if self.request.GET.get('runner'):
+            queryset = queryset.filter(user__username=self.request.GET['runner'])
+        if 'runner' in fields:
+            queryset = queryset.select_related('user', 'user__profile').prefetch_related(
+                Prefetch('user__social_auth', UserSocialAuth.objects.filter(provider='twitch'),
+                         to_attr='twitch_auth'))
+        return queryset
+
+
+class ScheduleApiView(ConditionalGetMixIn, ApiView):
+    """Draft schedule for the current event from the schedule builder.  Only for event admins.
+
+    Buffers can be set with ?setup_buffer= and ?race_setup_buffer= like the schedule builder page.
+    """
+    permission_required = 'submissions.is_event_admin'
+
+    def get_data(self):
+        form = forms.admin.ScheduleForm({
+            'setup_buffer': self.request.GET.get('setup_buffer', scheduling.DEFAULT_SETUP_BUFFER),
+            'race_setup_buffer': self.request.GET.get('race_setup_buffer', scheduling.DEFAULT_RACE_SETUP_BUFFER),
+        })
+        if not form.is_valid():
+            raise ApiError(form.errors.as_text())
+
+        schedule = scheduling.build_event_schedule(
+            self.event, form.cleaned_data['setup_buffer'], form.cleaned_data['race_setup_buffer'])
+        return {
+            'start_time': schedule.start_time,
+            'end_time': schedule.end_time,
+            'scheduled_time': schedule.scheduled_time,
+            'idle_time': schedule.idle_time,
+            'entries': [{
+                'submission': entry.run.key.game_id,
+                'category': entry.run.key.pk,
+                'runner': entry.run.key.game.user.username,
+                'game': entry.run.key.game.game,
+                'category_name': entry.run.key.category,
+                'race': entry.run.race,
+                'estimate': entry.run.estimate,
+                'setup_time': entry.setup_time,
+                'start_time': entry.start_time,
+                'end_time': entry.end_time,
+            } for entry in schedule.entries],
+            'unplaced': [{
+                'submission': unplaced.run.key.game_id,
+                'category': unplaced.run.key.pk,
+                'reason': unplaced.reason,
+            } for unplaced in schedule.unplaced],
+        }
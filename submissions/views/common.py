@@ -1,9 +1,13 @@
 """Common code for submission views."""
 
+import hashlib
 import logging
 
+from django.contrib import messages
 from django.contrib.auth import logout
+from django.middleware.csrf import get_token
 from django.shortcuts import redirect
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
 from django.views.generic.detail import SingleObjectMixin
 from multi_form_view import MultiFormView
 
@@ -46,12 +50,12 @@ class SubmissionViewMixIn:
 
         # If user is logged in, make sure they have Twitch auth extra data.
         if self.request.user.is_authenticated:
-            twitch_user = self.request.user.social_auth.get(provider='twitch')
-            if not twitch_user or not twitch_user.extra_data:
+            twitch_data = models.get_twitch_data(self.request)
+            if not twitch_data:
                 logger.error("User {!r} does not have Twitch social auth data".format(self.request.user.username))
                 logout(self.request)
                 return redirect('submissions:home')
-            self.request.user.twitch_data = twitch_user.extra_data
+            self.request.user.twitch_data = twitch_data
 
             # Cache QuerySet for user submissions and availabilities for the current event.  We use these often enough
             # that it makes sense to cache them on the user object for repeated access.
@@ -93,3 +97,45 @@ class SubmissionViewSingleObjectMixIn(SubmissionViewMixIn, SingleObjectMixin):
             return redirect_view
 
         self.object = self.get_object()
+
+
+class ConditionalGetMixIn:
+    """Mix-in for pages showing submission data for the current event, to answer repeat requests with 304 Not Modified
+    when nothing in the event has changed since the browser last got the page.  Must come after SubmissionViewMixIn so
+    the event has been looked up.
+    """
+
+    def get_etag(self):
+        """
+        Returns:
+            str: ETag for the page, which changes with the event settings and data, the user viewing it, their CSRF
+            cookie and the query string.
+
+        """
+        version = models.EventStats.get_for_event(self.event).version
+        # Forms on a reused page carry the CSRF token it was rendered with, which stops working once the cookie
+        # changes, e.g. when logging in again.  get_token() salts the token differently every call, so the cookie
+        # value it makes sure is set is used instead.
+        get_token(self.request)
+        key = '{}:{}:{}:{}:{}:{}'.format(self.event.pk, self.event.changed_at.isoformat(), version,
+                                         self.request.user.pk, self.request.META['CSRF_COOKIE'],
+                                         self.request.GET.urlencode())
+        return '"{}"'.format(hashlib.md5(key.encode()).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        # Pages showing one-time messages can't be reused, or the browser would show the messages again.
+        if messages.get_messages(request):
+            response = super().get(request, *args, **kwargs)
+            patch_cache_control(response, no_store=True)
+            return response
+
+        etag = self.get_etag()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            response['ETag'] = etag
+
+        # Always check back with the server before reusing the page, and never share it between users.
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Cookie'])
+        return response
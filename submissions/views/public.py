@@ -1,6 +1,5 @@
 """Public views for marathon submissions."""
 
-import datetime
 import logging
 
 from django.contrib import messages
@@ -8,15 +7,17 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db import transaction
 from django.db.models import Prefetch
 from django.forms import formset_factory
+from django.http import JsonResponse
 from django.shortcuts import redirect
 from django.urls import reverse
-from django.utils.timezone import get_current_timezone
 from django.utils.translation import gettext as _
-from django.views.generic import TemplateView, ListView, DeleteView
+from django.views.generic import TemplateView, ListView, DeleteView, View
 from social_django.models import UserSocialAuth
 
-from submissions import forms, models
-from submissions.views.common import SubmissionViewMixIn, FixedMultiFormView, SubmissionViewSingleObjectMixIn
+from submissions import catalog, forms, models
+from submissions.availability import ONE_HOUR, event_hour_grid, event_start_hour
+from submissions.views.common import (ConditionalGetMixIn, SubmissionViewMixIn, FixedMultiFormView,
+                                      SubmissionViewSingleObjectMixIn)
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,11 @@ class HomeView(SubmissionViewMixIn, TemplateView):
     require_current_event = False  # Homepage is okay without a current event.
     template_name = 'submissions/public/home.html'
 
+    def get_context_data(self, **kwargs):
+        if self.event:
+            kwargs['stats'] = models.EventStats.get_for_event(self.event)
+        return super().get_context_data(**kwargs)
+
 
 class ProfileView(LoginRequiredMixin, SubmissionViewMixIn, FixedMultiFormView):
     """User profile and availability."""
@@ -60,13 +66,14 @@ class ProfileView(LoginRequiredMixin, SubmissionViewMixIn, FixedMultiFormView):
             'pronouns': [p.strip() for p in self.request.user.profile.pronouns.split(',')],
         })
 
-        # Get availability initial fields based on current availability intervals.
-        for availability in self.request.user.current_event_availabilities:
-            hour = availability.start_time.astimezone(get_current_timezone()).replace(minute=0, second=0, microsecond=0)
-            while hour < availability.end_time:
-                field_name = 'available_{}'.format(hour.strftime('%Y_%m_%d_%H'))
-                initial['availability'][field_name] = True
-                hour += datetime.timedelta(hours=1)
+        # Get availability initial fields from the availability hour bitmap, lined up with the event's current hours.
+        availability_hours = self.request.user.availability_hours.filter(event=self.event).first()
+        if availability_hours:
+            hour_grid = event_hour_grid(self.event)
+            offset = (availability_hours.start_time - event_start_hour(self.event)) // ONE_HOUR
+            for hour in availability_hours.bitmap.available_hours():
+                if 0 <= offset + hour < len(hour_grid):
+                    initial['availability'][hour_grid[offset + hour].field_name] = True
 
         return initial
 
@@ -77,34 +84,58 @@ class ProfileView(LoginRequiredMixin, SubmissionViewMixIn, FixedMultiFormView):
             self.request.user.profile.pronouns = ', '.join(forms['profile'].cleaned_data['pronouns'])
             self.request.user.profile.save()
 
-            # Build availability records based on selected hours.  Delete existing records and make fresh ones.
-            self.request.user.availabilities.all().delete()
-            for availability in forms['availability'].selected_availabilties:
-                a = models.Availability(user=self.request.user, event=self.event, start_time=availability[0],
-                                        duration=availability[1])
-                a.save()
+            # Sync availability records for the current event with the selected hours.
+            models.Availability.set_user_availability(self.request.user, self.event,
+                                                      forms['availability'].selected_availabilties)
 
         # Add success message before returning.
         messages.add_message(self.request, messages.SUCCESS, _('Profile updated successfully.'))
         return super().forms_valid(forms)
 
 
-class MySubmissionsView(LoginRequiredMixin, SubmissionViewMixIn, ListView):
+class MySubmissionsView(LoginRequiredMixin, SubmissionViewMixIn, ConditionalGetMixIn, ListView):
     template_name = 'submissions/public/my_submissions.html'
 
     def get_queryset(self):
         return self.request.user.current_event_submissions
 
 
-class AllSubmissionsView(LoginRequiredMixin, SubmissionViewMixIn, ListView):
+class AllSubmissionsView(LoginRequiredMixin, SubmissionViewMixIn, ConditionalGetMixIn, ListView):
     template_name = 'submissions/public/all_submissions.html'
+    # Sort orders selectable with the sort GET parameter, the first one being the default.
+    sorts = {
+        'runner': (_('Runner'), ['user__username', 'game', 'id']),
+        'game': (_('Game'), ['game', 'user__username', 'id']),
+        'rolled_up_status': (_('Status'), ['rolled_up_status', 'user__username', 'game', 'id']),
+    }
 
     def get_queryset(self):
-        return models.Submission.objects.filter(event=self.event).select_related(
+        queryset = models.Submission.objects.filter(event=self.event).with_status().select_related(
             'event', 'user', 'user__profile').prefetch_related(
             'categories', Prefetch('user__social_auth',
                                    UserSocialAuth.objects.filter(provider='twitch'), to_attr='twitch_auth'))
 
+        # Optionally filter by rolled up submission status.
+        self.status_filter = self.request.GET.get('status')
+        if self.status_filter in models.SubmissionCategory.Statuses.values:
+            queryset = queryset.filter(rolled_up_status=self.status_filter)
+
+        self.sort = self.request.GET.get('sort')
+        if self.sort not in self.sorts:
+            self.sort = next(iter(self.sorts))
+        return queryset.order_by(*self.sorts[self.sort][1])
+
+    def get_context_data(self, **kwargs):
+        models.set_fragment_versions(self.object_list)
+        kwargs.update({
+            'statuses': models.SubmissionCategory.Statuses,
+            'status_filter': self.status_filter,
+            'sorts': [(value, label) for value, (label, _ordering) in self.sorts.items()],
+            'sort': self.sort,
+            'fragment_cache_timeout': models.FRAGMENT_CACHE_TIMEOUT,
+        })
+        return super().get_context_data(**kwargs)
+
 
 class SubmitView(LoginRequiredMixin, SubmissionViewMixIn, FixedMultiFormView):
     """Submit a run view."""
@@ -286,3 +317,10 @@ class DeleteSubmissionView(LoginRequiredMixin, SubmissionViewMixIn, DeleteView):
 
     def get_success_url(self):
         return reverse('submissions:my-submissions')
+
+
+class GameSearchView(LoginRequiredMixin, View):
+    """Game autocomplete for the submit page, searching the local game catalog."""
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({'data': list(catalog.search_games(request.GET.get('q', '')))})